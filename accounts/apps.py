@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        from . import metrics, partitions, search, signals  # noqa: F401
+
+        metrics.install()
+        # migrate 할 때마다 앞으로 쓸 거래 월 파티션을 채움
+        post_migrate.connect(partitions.on_post_migrate, sender=self)
+        # SQLite 는 테이블을 다시 만드는 마이그레이션 뒤 FTS 동기화 트리거를 복구
+        post_migrate.connect(search.on_post_migrate, sender=self)
@@ -0,0 +1,279 @@
+import heapq
+import json
+import os
+import re
+import struct
+import uuid
+import zlib
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from functools import cmp_to_key
+from operator import attrgetter
+
+from django.conf import settings
+
+from . import search
+from .filters import TransactionFilter
+from .models import Account, Transaction
+from .pagination import compare_keys_for
+from .partitions import bounds
+
+# 떼어 낸 월 파티션을 보관하는 컬럼형 압축 파일 (transactions-YYYY-MM.txa). 모든 웹 서버가 같은 경로를 봐야 한다.
+#
+#   MAGIC | 행 그룹 1 | 행 그룹 2 | ... | footer(JSON) | footer 길이(8바이트) | MAGIC
+#
+# 행 그룹은 GROUP_ROWS 행씩 컬럼별 값 배열을 JSON 으로 묶어 zlib 압축한 것.
+# 행은 (계좌, 최신순) 으로 정렬돼 있고 footer 에 그룹마다 위치와 계좌/일시 최소·최대값을 적어 두므로,
+# 읽을 때는 요청한 계좌/기간과 겹치는 그룹만 풀면 된다.
+ARCHIVE_DIR = getattr(settings, "TRANSACTION_ARCHIVE_DIR", "archive")
+MAGIC = b"TXARCH01"
+GROUP_ROWS = 50000
+COLUMNS = [
+    "id",
+    "account_id",
+    "transaction_amount",
+    "amount_after_transaction",
+    "account_factor_history",
+    "deposit_and_withdrawal_type",
+    "transaction_type",
+    "transaction_timestamp",
+    "reverses",
+    "transfer",
+]
+_TIMESTAMP = COLUMNS.index("transaction_timestamp")
+_DECIMALS = [COLUMNS.index("transaction_amount"), COLUMNS.index("amount_after_transaction")]
+_TRANSFER = COLUMNS.index("transfer")
+_FILE = re.compile(r"^transactions-(\d{4})-(\d{2})\.txa$")
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def path_for(month):
+    return os.path.join(ARCHIVE_DIR, f"transactions-{month:%Y-%m}.txa")
+
+
+def archived_months():
+    try:
+        names = os.listdir(ARCHIVE_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(date(int(match[1]), int(match[2]), 1) for match in map(_FILE.match, names) if match)
+
+
+def archive_key(row):
+    """파일 안 행 순서: 계좌, 최신순, id 역순."""
+    return row[1], -_micros(row[_TIMESTAMP]), -row[0]
+
+
+def write(month, rows):
+    """
+    rows(COLUMNS 순서 튜플, archive_key 순 정렬)를 그 달 임시 파일에 쓰고 (임시 경로, 행 수)를 돌려준다.
+
+    DB 에서 파티션을 지운 뒤 publish() 로 공개한다.
+    """
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    temp_path = f"{path_for(month)}.tmp"
+    groups, buffer, total = [], [], 0
+    with open(temp_path, "wb") as file:
+        file.write(MAGIC)
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == GROUP_ROWS:
+                groups.append(_write_group(file, buffer))
+                total, buffer = total + len(buffer), []
+        if buffer:
+            groups.append(_write_group(file, buffer))
+            total += len(buffer)
+        footer = json.dumps(
+            {"version": 1, "month": f"{month:%Y-%m}", "columns": COLUMNS, "rows": total, "groups": groups}
+        ).encode()
+        file.write(footer)
+        file.write(struct.pack("<Q", len(footer)))
+        file.write(MAGIC)
+        file.flush()
+        os.fsync(file.fileno())
+    return temp_path, total
+
+
+def publish(temp_path):
+    os.replace(temp_path, temp_path.removesuffix(".tmp"))
+
+
+def _write_group(file, rows):
+    columns = [list(column) for column in zip(*rows)]
+    columns[_TIMESTAMP] = [_micros(value) for value in columns[_TIMESTAMP]]
+    for index in _DECIMALS:
+        columns[index] = [str(value) for value in columns[index]]
+    columns[_TRANSFER] = [value and value.hex for value in columns[_TRANSFER]]
+    payload = zlib.compress(json.dumps(columns, ensure_ascii=False, separators=(",", ":")).encode(), 6)
+    group = {
+        "offset": file.tell(),
+        "length": len(payload),
+        "rows": len(rows),
+        "min_account": min(columns[1]),
+        "max_account": max(columns[1]),
+        "min_ts": min(columns[_TIMESTAMP]),
+        "max_ts": max(columns[_TIMESTAMP]),
+    }
+    file.write(payload)
+    return group
+
+
+def read(month, account_ids=None, start=None, end=None):
+    """
+    그 달 아카이브에서 account_ids 계좌, [start, end] 기간의 행을 COLUMNS 순서 튜플로 돌려준다 (archive_key 순).
+
+    조건과 겹치지 않는 행 그룹은 압축을 풀지 않는다.
+    """
+    with open(path_for(month), "rb") as file:
+        footer = _footer(file)
+        accounts = set(account_ids) if account_ids is not None else None
+        low, high = (min(accounts), max(accounts)) if accounts else (None, None)
+        start_us = _micros(start) if start else None
+        end_us = _micros(end) if end else None
+        for group in footer["groups"]:
+            if accounts is not None and (not accounts or group["max_account"] < low or group["min_account"] > high):
+                continue
+            if (start_us and group["max_ts"] < start_us) or (end_us and group["min_ts"] > end_us):
+                continue
+            file.seek(group["offset"])
+            columns = _align(footer["columns"], json.loads(zlib.decompress(file.read(group["length"]))))
+            for row in zip(*columns):
+                if accounts is not None and row[1] not in accounts:
+                    continue
+                if (start_us and row[_TIMESTAMP] < start_us) or (end_us and row[_TIMESTAMP] > end_us):
+                    continue
+                yield _decode(row)
+
+
+def row_count(month):
+    with open(path_for(month), "rb") as file:
+        return _footer(file)["rows"]
+
+
+def pending_files():
+    """write() 후 publish() 되지 못한 임시 파일 [(달, 경로)] (아카이브 작업이 중간에 끊긴 경우)."""
+    try:
+        names = os.listdir(ARCHIVE_DIR)
+    except FileNotFoundError:
+        return []
+    pending = []
+    for name in names:
+        match = _FILE.match(name.removesuffix(".tmp")) if name.endswith(".tmp") else None
+        if match:
+            pending.append((date(int(match[1]), int(match[2]), 1), os.path.join(ARCHIVE_DIR, name)))
+    return sorted(pending)
+
+
+def _footer(file):
+    file.seek(-16, os.SEEK_END)
+    length, magic = struct.unpack("<Q8s", file.read(16))
+    if magic != MAGIC:
+        raise ValueError(f"아카이브 파일이 아닙니다: {file.name}")
+    file.seek(-16 - length, os.SEEK_END)
+    return json.loads(file.read(length))
+
+
+def _align(names, columns):
+    # 컬럼이 추가되기 전에 쓴 파일이면 없는 컬럼은 None 으로 채워 COLUMNS 순서로 맞춤
+    if names == COLUMNS:
+        return columns
+    by_name = dict(zip(names, columns))
+    rows = len(columns[0]) if columns else 0
+    return [by_name.get(name, [None] * rows) for name in COLUMNS]
+
+
+def _decode(row):
+    row = list(row)
+    row[_TIMESTAMP] = _EPOCH + timedelta(microseconds=row[_TIMESTAMP])
+    for index in _DECIMALS:
+        row[index] = Decimal(row[index])
+    row[_TRANSFER] = row[_TRANSFER] and uuid.UUID(row[_TRANSFER])
+    return tuple(row)
+
+
+def _micros(value):
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _overlaps(month, start, stop):
+    month_begin, month_end = bounds(month)
+    return (stop is None or month_begin <= stop) and (start is None or month_end > start)
+
+
+class ArchivedMonthsMixin:
+    """
+    TransactionViewSet 용. 기간 필터(transaction_timestamp_after / _before)가 아카이브된 달에 걸치면
+    목록/내보내기 결과에 아카이브 행을 같은 필터·검색·정렬 기준으로 섞는다.
+
+    기간 필터가 없거나 아카이브와 겹치지 않으면 추가 비용 없음. 상세 조회/수정/삭제는 DB 에 있는 행만 대상.
+    """
+
+    def requested_archive_months(self):
+        """(읽어야 할 아카이브 달 목록, 필터 값). DB 접근 없음."""
+        request = self.request
+        filterset = TransactionFilter(request.query_params, queryset=Transaction.objects.none(), request=request)
+        if not filterset.is_valid():
+            # 잘못된 필터는 DB 쪽 filter_queryset 에서 400 으로 처리됨
+            return [], None
+        params = filterset.form.cleaned_data
+        period = params.get("transaction_timestamp")
+        if not period or (period.start is None and period.stop is None):
+            return [], None
+        return [month for month in archived_months() if _overlaps(month, period.start, period.stop)], params
+
+    def get_archived_transactions(self, months=None, params=None):
+        """아카이브에서 읽은 본인 계좌의 거래 (저장되지 않은 Transaction 인스턴스, account/user 연결됨)."""
+        if months is None:
+            months, params = self.requested_archive_months()
+        if not months:
+            return []
+        request = self.request
+        # 삭제된 계좌의 거래는 DB 에서처럼 보이지 않게 현재 계좌만
+        accounts = {account.pk: account for account in Account.objects.filter(user=request.user).select_related("user")}
+        period = params["transaction_timestamp"]
+        terms = search.TransactionSearchFilter().get_search_terms(request)
+
+        rows = []
+        for month in months:
+            for values in read(month, accounts, period.start, period.stop):
+                txn = Transaction(**dict(zip(COLUMNS, values)))
+                if _matches(txn, params, terms):
+                    txn.account = accounts[txn.account_id]
+                    rows.append(txn)
+        return rows
+
+    def paginate_queryset(self, queryset):
+        archived = self.get_archived_transactions() if self.paginator is not None else None
+        if not archived:
+            return super().paginate_queryset(queryset)
+        rows = list(self.paginator.get_page_queryset(queryset, self.request, view=self))
+        return self.paginator.merge_page(rows, archived)
+
+    def merge_archived_values(self, queryset, fields, rows):
+        """values_list(*fields) 행 스트림 rows 에 아카이브 행을 queryset 의 정렬 순서대로 끼워 넣는다 (export 용)."""
+        archived = self.get_archived_transactions()
+        if not archived:
+            return rows
+        getters = [attrgetter(field.replace("__", ".")) for field in fields]
+        extra = [tuple(getter(txn) for getter in getters) for txn in archived]
+
+        ordering = [field for field in queryset.query.order_by if field.lstrip("-") in fields]
+        positions = [fields.index(field.lstrip("-")) for field in ordering]
+        to_key = cmp_to_key(compare_keys_for(ordering))
+        key = lambda row: to_key([row[position] for position in positions])  # noqa: E731
+        extra.sort(key=key)
+        return heapq.merge(rows, extra, key=key)
+
+
+def _matches(txn, params, terms):
+    # TransactionFilter / TransactionSearchFilter 와 같은 조건 (기간은 read() 에서 이미 적용)
+    for name in ("transaction_type", "deposit_and_withdrawal_type"):
+        if params.get(name) and getattr(txn, name) != params[name]:
+            return False
+    if params.get("min_amount") is not None and txn.transaction_amount < params["min_amount"]:
+        return False
+    if params.get("max_amount") is not None and txn.transaction_amount > params["max_amount"]:
+        return False
+    return all(search.term_matches(txn, term) for term in terms)
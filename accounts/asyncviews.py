@@ -0,0 +1,105 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.response import Response
+
+from . import replicas
+
+
+class AsyncReadView:
+    """
+    기존 DRF 뷰(view_class)를 그대로 재사용하는 GET 전용 async 뷰.
+
+    인증/권한/필터/정렬/페이지네이션/시리얼라이저 설정은 view_class 의 것을 쓰고,
+    DB 읽기만 Django async ORM 으로 한다. DRF 는 async 뷰를 지원하지 않으므로
+    요청 초기화(인증 포함)만 sync 스레드에서 실행한다.
+
+        class AsyncTransactionListView(AsyncReadView):
+            view_class = TransactionViewSet
+            action = "list"
+    """
+
+    view_class = None
+    action = "retrieve"  # "list" 또는 "retrieve"
+
+    @classmethod
+    def as_view(cls):
+        async def view(request, *args, **kwargs):
+            return await cls().dispatch(request, *args, **kwargs)
+
+        view.view_class = cls
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        # view_class 의 dispatch 를 거치지 않으므로 복제본 선택(ReplicaReadMixin)도 여기서 요청 단위로 되돌림
+        with replicas.request_scope():
+            return await self._dispatch(request, *args, **kwargs)
+
+    async def _dispatch(self, request, *args, **kwargs):
+        view = self.view_class()
+        # ViewSet 은 action_map 으로 self.action 을 정함
+        view.action_map = {"get": self.action, "head": self.action}
+        view.args, view.kwargs = args, kwargs
+        request = view.initialize_request(request, *args, **kwargs)
+        view.request = request
+        view.headers = view.default_response_headers
+
+        try:
+            if request.method not in ("GET", "HEAD"):
+                raise MethodNotAllowed(request.method)
+            await sync_to_async(view.initial)(request, *args, **kwargs)
+            if self.action == "list":
+                response = await self.list(view, request)
+            else:
+                response = await self.retrieve(view, request)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+
+        response = view.finalize_response(request, response, *args, **kwargs)
+        # 응답 캐시 적중 / 304 는 이미 렌더링된 HttpResponse
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    async def list(self, view, request):
+        # VersionedListCacheMixin 을 쓰는 뷰면 304 / 캐시된 응답을 먼저 확인 (DB 접근 없음)
+        get_cached = getattr(view, "get_cached_list_response", None)
+        if get_cached is not None:
+            response = get_cached(request)
+            if response is not None:
+                return response
+
+        queryset = view.filter_queryset(view.get_queryset())
+        paginator = view.paginator
+        if paginator is None:
+            rows = [row async for row in queryset]
+            return Response(view.get_serializer(rows, many=True).data)
+
+        # KeysetPagination 의 쿼리 생성/페이지 구성 로직을 그대로 쓰고, 평가만 async 로
+        page_queryset = paginator.get_page_queryset(queryset, request, view)
+        rows = [row async for row in page_queryset]
+        # 기간 필터가 아카이브된 달에 걸칠 때만 (ArchivedMonthsMixin) 파일을 읽어 섞음
+        months, params = view.requested_archive_months() if hasattr(view, "requested_archive_months") else ([], None)
+        if months:
+            archived = await sync_to_async(view.get_archived_transactions)(months, params)
+            rows = paginator.merge_page(rows, archived)
+        else:
+            rows = paginator.build_page(rows)
+        return paginator.get_paginated_response(view.get_serializer(rows, many=True).data)
+
+    async def retrieve(self, view, request):
+        instance = await self.get_object(view)
+        view.check_object_permissions(request, instance)
+        return Response(view.get_serializer(instance).data)
+
+    async def get_object(self, view):
+        # GenericAPIView.get_object 와 같은 조회를 async ORM 으로
+        queryset = view.filter_queryset(view.get_queryset())
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            return await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        except (TypeError, ValueError):
+            raise Http404
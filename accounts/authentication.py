@@ -0,0 +1,36 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import usercache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication 과 같지만 토큰의 유저를 매 요청 DB 에서 읽지 않고
+    프로세스 로컬 LRU + 공유 캐시(usercache, SHARED_CACHE 일 때)에서 먼저 찾는다.
+    유저가 저장/삭제되면 signals 에서 캐시를 지운다.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = usercache.get(user_id)
+        if user is None:
+            # DB 조회 + 활성/비밀번호 변경 검사는 기본 구현 그대로
+            user = super().get_user(validated_token)
+            usercache.store(user)
+            return user
+
+        # 캐시에서 찾은 경우에도 같은 검사를 거침
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+from django.db import connections, router
+from django.db.models import Case, F, Q, Sum, When
+
+from .models import Transaction
+
+# 계좌 거래의 amount_after_transaction(거래 후 잔액)은 (거래 일시, id) 순 누적 합계.
+# 과거 거래를 수정/삭제하면 그 이후 행이 전부 바뀌므로, 행마다 UPDATE 하지 않고
+# 윈도 함수(SUM() OVER)로 구한 누적 잔액을 UPDATE ... FROM 한 문장으로 덮어쓴다.
+# 아주 큰 계좌는 CHUNK_SIZE 행씩 나눠 (문장 하나가 정렬/갱신하는 양 제한) 같은 트랜잭션 안에서 이어 간다.
+CHUNK_SIZE = 50000
+
+_TABLE = Transaction._meta.db_table
+_EFFECT = "CASE WHEN deposit_and_withdrawal_type = 'DEPOSIT' THEN transaction_amount ELSE -transaction_amount END"
+
+
+def effects():
+    """입금 +, 출금 - 로 부호를 붙인 거래 금액 (ORM 식)."""
+    return Case(
+        When(deposit_and_withdrawal_type="DEPOSIT", then=F("transaction_amount")), default=-F("transaction_amount")
+    )
+
+
+def opening_balance(account):
+    """DB 에 남은 첫 거래 직전 잔액 = 현재 잔액 - 남은 거래 변화량 합계 (아카이브된 달이 있어도 맞음)."""
+    total = Transaction.objects.filter(account_id=account.pk).aggregate(total=Sum(effects()))["total"]
+    return account.balance - (total or Decimal("0"))
+
+
+def recompute(account_id, since, opening, chunk_size=CHUNK_SIZE):
+    """
+    계좌의 (일시, id) >= since 인 거래들의 거래 후 잔액을 opening 부터 다시 계산해 저장하고, 바뀐 행 수를 돌려준다.
+
+    since 가 None 이면 모든 거래. opening 은 since 직전까지의 잔액.
+    posting 의 atomic 블록 안, 계좌 행 락을 잡은 상태에서 호출해야 한다 (그 사이 새 거래가 끼어들지 않음).
+    """
+    using = router.db_for_write(Transaction)
+    connection = connections[using]
+    rows = Transaction.objects.using(using).filter(account_id=account_id).order_by("transaction_timestamp", "id")
+
+    changed = 0
+    start = since
+    while True:
+        # 이번 청크 끝(다음 청크 시작) 행
+        end = rows.filter(_from(start)).values_list("transaction_timestamp", "id")[chunk_size : chunk_size + 1]
+        end = end[0] if end else None
+
+        window, params = _window(connection, start, end)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {_TABLE} AS t SET amount_after_transaction = o.running "
+                "FROM ("
+                f"SELECT id, transaction_timestamp AS ts, ROUND(%s + SUM({_EFFECT}) OVER ("
+                "ORDER BY transaction_timestamp, id ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW), 2) AS running "
+                f"FROM {_TABLE} WHERE account_id = %s{window.format(prefix='')}"
+                ") AS o "
+                f"WHERE t.account_id = %s{window.format(prefix='t.')} "
+                "AND t.id = o.id AND t.transaction_timestamp = o.ts AND t.amount_after_transaction <> o.running",
+                [connection.ops.adapt_decimalfield_value(opening), account_id, *params, account_id, *params],
+            )
+            changed += cursor.rowcount
+        if end is None:
+            return changed
+
+        # 다음 청크는 이번 청크 마지막 행의 (방금 쓴) 잔액에서 이어 감
+        opening = rows.filter(~_from(end)).values_list("amount_after_transaction", flat=True).last()
+        start = end
+
+
+def _from(position):
+    if position is None:
+        return Q()
+    timestamp, pk = position
+    return Q(transaction_timestamp__gt=timestamp) | Q(transaction_timestamp=timestamp, id__gte=pk)
+
+
+def _window(connection, start, end):
+    # [start, end) 조건 SQL 조각 ({prefix} 자리에 테이블 별칭)과 파라미터
+    adapt = connection.ops.adapt_datetimefield_value
+    sql, params = "", []
+    if start is not None:
+        sql += " AND ({prefix}transaction_timestamp > %s OR ({prefix}transaction_timestamp = %s AND {prefix}id >= %s))"
+        params += [adapt(start[0]), adapt(start[0]), start[1]]
+    if end is not None:
+        sql += " AND ({prefix}transaction_timestamp < %s OR ({prefix}transaction_timestamp = %s AND {prefix}id < %s))"
+        params += [adapt(end[0]), adapt(end[0]), end[1]]
+    return sql, params
@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+
+def percentile(samples, pct):
+    # 최근접 순위(nearest-rank) 방식의 백분위수
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class BenchResult:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.errors = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency, ok=True):
+        with self._lock:
+            self.latencies.append(latency)
+            if not ok:
+                self.errors += 1
+
+    @property
+    def count(self):
+        return len(self.latencies)
+
+    @property
+    def throughput(self):
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "requests": self.count,
+            "errors": self.errors,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(self.throughput, 1),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 2),
+        }
+
+    def summary(self):
+        data = self.as_dict()
+        return (
+            f"{data['name']}: {data['requests']} req, {data['errors']} err, {data['throughput_rps']} req/s, "
+            f"p50 {data['p50_ms']}ms / p95 {data['p95_ms']}ms / p99 {data['p99_ms']}ms"
+        )
+
+
+def run_concurrently(name, workers, iterations, operation):
+    """
+    operation(worker_index, iteration) 을 workers 개 스레드에서 iterations 번씩 실행한다.
+
+    operation 이 False 를 돌려주거나 예외를 던지면 에러로 센다.
+    스레드마다 Django DB 커넥션이 따로 열리므로 끝날 때 (모든 별칭의) 커넥션을 닫아준다.
+    """
+    result = BenchResult(name)
+
+    def worker(index):
+        try:
+            for i in range(iterations):
+                started = time.perf_counter()
+                try:
+                    ok = operation(index, i) is not False
+                except Exception:
+                    ok = False
+                result.record(time.perf_counter() - started, ok)
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(worker, range(workers)))
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,28 @@
+import os
+
+from django.db import connections
+
+
+def stats():
+    """
+    이 프로세스의 DB 커넥션 상태 (별칭별).
+
+    커넥션 풀이면 psycopg_pool 의 통계를 그대로 담는다. 주요 항목:
+    pool_size(열린 커넥션 수), pool_available(빈 커넥션 수), requests_waiting(지금 기다리는 요청 수),
+    requests_num / requests_queued / requests_wait_ms(누적 요청 수 / 기다려야 했던 수 / 누적 대기 시간),
+    requests_errors(타임아웃 등), connections_num / connections_ms(새로 연 커넥션 수 / 누적 접속 시간).
+    """
+    result = {"pid": os.getpid()}
+    for connection in connections.all():
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            result[connection.alias] = {"mode": "pool", **pool.get_stats()}
+        else:
+            max_age = connection.settings_dict["CONN_MAX_AGE"]
+            result[connection.alias] = {
+                "mode": "persistent" if max_age != 0 else "per-request",
+                "conn_max_age": max_age,
+                "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+                "connected": connection.connection is not None,
+            }
+    return result
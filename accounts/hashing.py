@@ -0,0 +1,68 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from rest_framework.exceptions import APIException
+
+# 비밀번호 해시(PBKDF2 등)는 GIL 을 놓고 돌아가므로 스레드로도 코어를 나눠 쓸 수 있다.
+# 다른 요청이 쓸 코어를 남겨 두도록 기본은 코어 수의 절반
+HASHER_WORKERS = getattr(settings, "LOGIN_HASHER_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+# 실행 중 + 대기 중인 해시 작업이 이 수를 넘으면 바로 503 으로 거절 (로그인 폭주 시 대기열이 무한정 늘지 않게)
+HASHER_MAX_PENDING = getattr(settings, "LOGIN_HASHER_MAX_PENDING", HASHER_WORKERS * 16)
+
+
+class HasherBusy(APIException):
+    status_code = 503
+    default_detail = "로그인 요청이 많습니다. 잠시 후 다시 시도해 주세요."
+    default_code = "login_busy"
+
+
+class BoundedExecutor:
+    """동시 실행 수(max_workers)와 대기열 길이(max_pending)가 제한된 스레드 풀. 이벤트 루프에서 await 로 사용."""
+
+    def __init__(self, max_workers, max_pending, name):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HasherBusy()
+            self._pending += 1
+        try:
+            return await asyncio.wrap_future(self._executor.submit(self._call, fn, args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+
+    def _call(self, fn, args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+hasher_pool = BoundedExecutor(HASHER_WORKERS, HASHER_MAX_PENDING, "password-hasher")
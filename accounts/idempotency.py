@@ -0,0 +1,136 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+# 게이트웨이가 타임아웃 후 같은 POST 를 다시 보내도 쓰기는 한 번만 일어나게 한다.
+#
+#   1. (유저, 키) 행을 먼저 "처리 중" 으로 만든다 (유니크 제약 → 동시에 온 같은 키 요청 중 하나만 성공)
+#   2. 성공한 요청만 생성 로직을 실행하고, 같은 트랜잭션 안에서 응답(상태 코드 + 본문)을 그 행에 저장한다
+#      → 쓰기가 커밋됐으면 응답도 저장돼 있음. 실패하면 둘 다 롤백되고 행을 지워 재시도가 다시 실행되게 함
+#   3. 나중에 온 같은 키 요청은 저장된 응답을 그대로 돌려주고, 아직 처리 중이면 409
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+KEY_TTL = getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 3600)
+CLAIM_TIMEOUT = getattr(settings, "IDEMPOTENCY_CLAIM_TIMEOUT", 60)
+
+
+class KeyInProgress(APIException):
+    status_code = 409
+    default_detail = "같은 Idempotency-Key 요청을 처리하고 있습니다. 잠시 후 다시 시도해 주세요."
+    default_code = "idempotency_key_in_progress"
+    # DRF 예외 핸들러가 Retry-After 헤더로 내려줌
+    wait = 1
+
+
+class KeyReused(APIException):
+    status_code = 422
+    default_detail = "이 Idempotency-Key 는 다른 요청에 이미 사용되었습니다."
+    default_code = "idempotency_key_reused"
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode()).digest()
+
+
+def fingerprint(request):
+    """같은 키로 다른 요청을 보낸 경우를 가려내기 위한 요청 해시 (메서드, 경로, 파싱된 본문)."""
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return _digest(f"{request.method} {request.path}\n{body}")
+
+
+def claim(user_id, key, request_fingerprint):
+    """
+    (유저, 키)를 점유한다. (점유한 행, None) 또는 이미 끝난 요청이면 (None, 저장된 응답).
+
+    다른 요청이 처리 중이면 KeyInProgress, 같은 키에 다른 요청이면 KeyReused.
+    """
+    digest = _digest(key)
+    while True:
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(user_id=user_id, key=digest, fingerprint=request_fingerprint)
+            return record, None
+        except IntegrityError:
+            pass
+
+        record = IdempotencyKey.objects.filter(user_id=user_id, key=digest).first()
+        if record is None:
+            # 그 사이 먼저 점유한 요청이 실패해 행을 지웠음 → 다시 점유 시도
+            continue
+        now = timezone.now()
+        if record.created_at < now - timedelta(seconds=KEY_TTL):
+            # 만료됐지만 아직 청소되지 않은 키는 없는 것으로 봄
+            IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).delete()
+            continue
+        if bytes(record.fingerprint) != request_fingerprint:
+            raise KeyReused()
+        if record.status_code is not None:
+            return None, Response(record.response, status=record.status_code, headers={"Idempotent-Replayed": "true"})
+        if record.created_at < now - timedelta(seconds=CLAIM_TIMEOUT):
+            # 처리하던 요청이 끝내지 못함 (워커 종료 등). 조건부 UPDATE 로 이어받을 요청도 하나만 고름
+            taken = IdempotencyKey.objects.filter(
+                pk=record.pk, created_at=record.created_at, status_code__isnull=True
+            ).update(created_at=now)
+            if taken:
+                record.created_at = now
+                return record, None
+        raise KeyInProgress()
+
+
+def complete(record, response):
+    """
+    점유한 행에 응답을 저장한다. 생성 로직과 같은 트랜잭션 안에서 호출해야 한다.
+
+    그 사이 다른 요청이 (CLAIM_TIMEOUT 이 지나) 이어받았으면 KeyInProgress 를 던져 이번 쓰기를 롤백한다.
+    """
+    saved = IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at, status_code__isnull=True).update(
+        status_code=response.status_code, response=response.data
+    )
+    if not saved:
+        raise KeyInProgress()
+
+
+def release(record):
+    """생성 로직이 실패했을 때 점유를 풀어 재시도가 처음부터 실행되게 한다."""
+    IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at, status_code__isnull=True).delete()
+
+
+class IdempotentCreateMixin:
+    """
+    DRF 생성 뷰용 (CreateModelMixin.create). Idempotency-Key 헤더가 있는 요청은 유저별 키당 한 번만 실행하고,
+    같은 키로 다시 오면 저장된 응답(Idempotent-Replayed: true)을 돌려준다. 헤더가 없으면 기존과 같음.
+
+    성공(2xx) 응답만 저장한다. 검증 오류/잔액 부족 등으로 실패한 요청은 아무것도 쓰지 않았으므로 재시도 시 다시 실행.
+    """
+
+    def create(self, request, *args, **kwargs):
+        return self.run_idempotent(request, super().create, *args, **kwargs)
+
+    def run_idempotent(self, request, handler, *args, **kwargs):
+        """handler(request, ...) 를 Idempotency-Key 기준으로 한 번만 실행 (create 외의 쓰기 action 에서도 사용)."""
+        key = request.headers.get(HEADER)
+        if key is None:
+            return handler(request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError({HEADER: f"1~{MAX_KEY_LENGTH}자여야 합니다."})
+
+        record, stored = claim(request.user.pk, key, fingerprint(request))
+        if stored is not None:
+            return stored
+        try:
+            with transaction.atomic():
+                response = handler(request, *args, **kwargs)
+                complete(record, response)
+        except BaseException:
+            release(record)
+            raise
+        return response
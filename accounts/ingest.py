@@ -0,0 +1,180 @@
+import codecs
+import json
+
+from rest_framework.exceptions import ParseError
+
+from . import posting
+from .serializers import BulkTransactionSerializer
+
+READ_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 1024 * 1024
+CHUNK_SIZE = 500
+
+_decoder = json.JSONDecoder()
+
+
+def _read_chunks(stream):
+    # 멀티바이트 문자가 청크 경계에서 잘려도 깨지지 않도록 점진적으로 디코딩
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        chunk = stream.read(READ_SIZE)
+        if not chunk:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if text:
+            yield text
+
+
+def iter_records(stream):
+    """
+    요청 본문을 조금씩 읽으며 레코드를 하나씩 돌려준다.
+
+    본문이 '[' 로 시작하면 JSON 배열, 아니면 NDJSON(한 줄에 JSON 하나)으로 본다.
+    버퍼에는 아직 처리하지 않은 레코드 하나 분량만 남기 때문에 본문 크기와 무관하게 메모리가 일정하다.
+    """
+    chunks = _read_chunks(stream)
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        buffer = buffer.lstrip()
+        if buffer:
+            break
+    if not buffer:
+        return
+
+    if buffer[0] == "[":
+        yield from _iter_array(buffer[1:], chunks)
+    else:
+        yield from _iter_lines(buffer, chunks)
+
+
+def _iter_lines(buffer, chunks):
+    line_number = 0
+    exhausted = False
+    while True:
+        newline = buffer.find("\n")
+        if newline == -1 and not exhausted:
+            if len(buffer) > MAX_RECORD_SIZE:
+                raise ParseError(f"{line_number + 1}번째 줄이 너무 깁니다.")
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+            else:
+                buffer += chunk
+            continue
+
+        if newline == -1:
+            line, buffer = buffer, ""
+        else:
+            line, buffer = buffer[:newline], buffer[newline + 1 :]
+        line_number += 1
+
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                raise ParseError(f"{line_number}번째 줄이 올바른 JSON 이 아닙니다.")
+        if exhausted and not buffer:
+            return
+
+
+def _iter_array(buffer, chunks):
+    expect_value = True
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer:
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ParseError("JSON 배열이 닫히지 않았습니다.")
+            buffer = chunk
+            continue
+
+        if buffer[0] == "]":
+            return
+        if not expect_value:
+            if buffer[0] != ",":
+                raise ParseError("JSON 배열 요소 사이에는 ',' 가 필요합니다.")
+            buffer = buffer[1:]
+            expect_value = True
+            continue
+
+        try:
+            record, end = _decoder.raw_decode(buffer)
+        except ValueError:
+            # 레코드가 청크 경계에 걸친 경우 더 읽어서 다시 시도
+            chunk = next(chunks, None)
+            if chunk is None or len(buffer) > MAX_RECORD_SIZE:
+                raise ParseError("올바른 JSON 배열이 아닙니다.")
+            buffer += chunk
+            continue
+
+        yield record
+        buffer = buffer[end:]
+        expect_value = False
+
+
+def _chunked(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _until_error(records, errors):
+    # 파싱 오류가 나도 그 전까지 읽은 레코드는 마저 처리하도록 오류를 따로 모아 둔다
+    try:
+        yield from records
+    except ParseError as exc:
+        errors.append(exc)
+
+
+def ingest(stream, accounts, chunk_size=CHUNK_SIZE):
+    """
+    본문의 거래를 chunk_size 개씩 검증/반영하며 행별 결과 dict 를 순서대로 돌려준다.
+
+    accounts 는 {pk: Account} 형태의 본인 계좌 목록. 청크마다 별도 트랜잭션으로 커밋한다.
+    """
+    counts = {"created": 0, "invalid": 0, "rejected": 0}
+    index = 0
+    context = {"accounts": accounts}
+    errors = []
+
+    for chunk in _chunked(_until_error(iter_records(stream), errors), chunk_size):
+        results = {}
+        valid = []
+        for record in chunk:
+            serializer = BulkTransactionSerializer(data=record, context=context)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {"index": index, "status": "invalid", "errors": serializer.errors}
+            index += 1
+
+        posted = posting.post_many([data for _, data in valid])
+        for (row_index, _), outcome in zip(valid, posted):
+            if isinstance(outcome, posting.InsufficientBalance):
+                results[row_index] = {"index": row_index, "status": "rejected", "detail": outcome.detail}
+            else:
+                results[row_index] = {
+                    "index": row_index,
+                    "status": "created",
+                    "id": outcome.pk,
+                    "amount_after_transaction": str(outcome.amount_after_transaction),
+                }
+
+        for row_index in sorted(results):
+            counts[results[row_index]["status"]] += 1
+            yield results[row_index]
+
+    if errors:
+        # 형식 오류 이후의 본문은 처리하지 않음
+        yield {"index": index, "status": "error", "detail": errors[0].detail}
+
+    yield {"summary": counts}
@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+
+from .balances import effects
+from .models import BalanceCheckpoint, Transaction
+
+# 원장 모드 (TRANSACTION_LEDGER_MODE)
+#   - 거래 행은 한 번 쓰면 바뀌지 않는다. 수정/삭제는 원래 거래를 상쇄하는 거래(reverses=원래 id)를 덧붙이는 것으로 처리
+#     (posting.amend / posting.cancel). 거래 행에 락을 잡거나 과거 거래 후 잔액을 다시 계산하는 일이 없다.
+#   - 잔액은 마지막 체크포인트 + 그 이후 거래 변화량 합계. Account.balance 컬럼은 그 값을 담아 두는 읽기용 사본
+#   - 체크포인트 이후 거래가 CHECKPOINT_INTERVAL 건 이상이면 다음 쓰기 때 새 체크포인트를 남기므로 합계 범위가 일정
+LEDGER_MODE = getattr(settings, "TRANSACTION_LEDGER_MODE", False)
+CHECKPOINT_INTERVAL = getattr(settings, "LEDGER_CHECKPOINT_INTERVAL", 500)
+# 원장 모드의 거래 상세 응답 Cache-Control max-age
+ENTRY_CACHE_SECONDS = 24 * 3600
+
+
+def latest_checkpoint(account_id):
+    return BalanceCheckpoint.objects.filter(account_id=account_id).order_by("-id").first()
+
+
+def derive(account_id, stored):
+    """
+    (잔액, 마지막 체크포인트 이후 거래 수).
+
+    체크포인트가 없으면 (원장 모드로 처음 쓰는 계좌) stored(계좌 잔액 컬럼)를 현재 위치의 첫 체크포인트로 남긴다.
+    posting 의 atomic 블록 안, 계좌 행 락을 잡은 상태에서 호출해야 한다.
+    """
+    checkpoint = latest_checkpoint(account_id)
+    if checkpoint is None:
+        create_checkpoint(account_id, stored)
+        return stored, 0
+
+    tail = Transaction.objects.filter(account_id=account_id)
+    if checkpoint.transaction_id is not None:
+        timestamp, pk = checkpoint.transaction_timestamp, checkpoint.transaction_id
+        tail = tail.filter(Q(transaction_timestamp__gt=timestamp) | Q(transaction_timestamp=timestamp, id__gt=pk))
+    totals = tail.aggregate(total=Sum(effects()), count=Count("id"))
+    return checkpoint.balance + (totals["total"] or Decimal("0")), totals["count"]
+
+
+def current_balance(account_id, stored):
+    """derive() 의 잔액. 체크포인트 이후 거래가 CHECKPOINT_INTERVAL 건 이상이면 지금 위치에 새 체크포인트를 남긴다."""
+    balance, tail = derive(account_id, stored)
+    if tail >= CHECKPOINT_INTERVAL:
+        create_checkpoint(account_id, balance)
+    return balance
+
+
+def create_checkpoint(account_id, balance):
+    """계좌의 마지막 거래 위치에 balance 체크포인트를 남긴다 (계좌 행 락을 잡은 상태에서)."""
+    position = (
+        Transaction.objects.filter(account_id=account_id)
+        .order_by("-transaction_timestamp", "-id")
+        .values_list("transaction_timestamp", "id")
+        .first()
+    )
+    timestamp, pk = position or (None, None)
+    return BalanceCheckpoint.objects.create(
+        account_id=account_id, transaction_timestamp=timestamp, transaction_id=pk, balance=balance
+    )
+
+
+def invalidate(account_id):
+    """거래 행을 제자리에서 고치거나 지운 경우 (원장 모드가 아닐 때) 그 계좌의 체크포인트는 더 이상 맞지 않음."""
+    BalanceCheckpoint.objects.filter(account_id=account_id).delete()
+
+
+def forget_before(timestamp, using="default"):
+    """
+    timestamp 이전 위치의 체크포인트를 지운다 (그 이전 거래를 DB 에서 떼어 낸 뒤, archive_transactions).
+
+    이후 거래 합계에 빠진 거래가 섞이지 않도록. 더 최근 체크포인트가 없는 계좌는 다음 쓰기 때 잔액 컬럼에서 다시 시작.
+    """
+    stale = Q(transaction_timestamp__lt=timestamp) | Q(transaction_timestamp__isnull=True)
+    return BalanceCheckpoint.objects.using(using).filter(stale).delete()[0]
@@ -0,0 +1,101 @@
+import heapq
+import os
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from accounts import archive, ledger, partitions
+from accounts.models import Transaction
+
+CHUNK_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "오래된 거래 월 파티션을 떼어 내 압축 컬럼형 파일(TRANSACTION_ARCHIVE_DIR)로 옮깁니다. "
+        "옮긴 달도 거래 목록/내보내기에서 기간 필터로 조회됩니다. (PostgreSQL 파티션 테이블 전용)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-months", type=int, default=24, help="이번 달 기준 이 개월 수보다 오래된 달을 옮김"
+        )
+        parser.add_argument("--month", help="이 달만 옮김 (YYYY-MM)")
+        parser.add_argument("--dry-run", action="store_true", help="옮길 달과 행 수만 출력")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="대상 DB")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if not partitions.is_partitioned(using):
+            raise CommandError("거래 테이블이 파티션 테이블이 아닙니다. (PostgreSQL 에서 migrate 필요)")
+        live = partitions.live_months(using)
+        self._finish_interrupted(live)
+
+        if options["month"]:
+            try:
+                month = datetime.strptime(options["month"], "%Y-%m").date()
+            except ValueError:
+                raise CommandError("--month 는 YYYY-MM 형식이어야 합니다.")
+            if month not in live:
+                raise CommandError(f"{month:%Y-%m} 파티션이 없습니다.")
+            months = [month]
+        else:
+            cutoff = partitions.add_months(partitions.month_start(timezone.localdate()), -options["older_than_months"])
+            months = [month for month in live if month < cutoff]
+
+        if not months:
+            self.stdout.write("옮길 달이 없습니다.")
+            return
+        for month in months:
+            if options["dry_run"]:
+                self.stdout.write(f"{month:%Y-%m}: {self._queryset(month, using).count()}행")
+                continue
+            total = self._archive(month, using)
+            self.stdout.write(self.style.SUCCESS(f"{month:%Y-%m}: {total}행 → {archive.path_for(month)}"))
+
+    def _finish_interrupted(self, live):
+        # 파티션 삭제가 커밋됐으면 임시 파일이 유일한 사본이므로 공개, 아니면(롤백) 버림
+        for month, temp_path in archive.pending_files():
+            if month in live:
+                os.remove(temp_path)
+            else:
+                archive.publish(temp_path)
+                self.stdout.write(f"{month:%Y-%m}: 중단됐던 아카이브 파일 공개")
+
+    @staticmethod
+    def _queryset(month, using):
+        start, end = partitions.bounds(month)
+        return Transaction.objects.using(using).filter(transaction_timestamp__gte=start, transaction_timestamp__lt=end)
+
+    def _archive(self, month, using):
+        quote = connections[using].ops.quote_name
+        with transaction.atomic(using=using):
+            # 읽는 동안 그 달 거래가 바뀌지 않게 (조회는 계속 가능)
+            with connections[using].cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {quote(partitions.partition_name(month))} IN SHARE MODE")
+            queryset = self._queryset(month, using)
+            expected = queryset.count()
+            rows = (
+                queryset.order_by("account_id", "-transaction_timestamp", "-id")
+                .values_list(*archive.COLUMNS)
+                .iterator(chunk_size=CHUNK_SIZE)
+            )
+            if month in archive.archived_months():
+                # 같은 달을 다시 옮기는 경우 (DEFAULT 파티션에서 늦게 옮겨진 행 등) 기존 파일과 합침
+                expected += archive.row_count(month)
+                rows = heapq.merge(rows, archive.read(month), key=archive.archive_key)
+
+            temp_path, total = archive.write(month, rows)
+            try:
+                if total != expected:
+                    raise CommandError(f"{month:%Y-%m}: 파일 {total}행, DB {expected}행으로 일치하지 않습니다.")
+                partitions.drop_partition(month, using)
+                # 떼어 낸 달 이전 위치의 잔액 체크포인트는 이후 거래 합계가 더 이상 맞지 않음
+                ledger.forget_before(partitions.bounds(month)[1], using)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        archive.publish(temp_path)
+        return total
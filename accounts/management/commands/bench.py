@@ -0,0 +1,227 @@
+import json
+import os
+import random
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.benchmarks import run_concurrently
+from accounts.constants import TRANSACTION_METHOD
+from accounts.models import Account, User
+from accounts.serializers import CustomTokenObtainPairSerializer
+
+SCENARIOS = ["login", "create", "list", "accounts"]
+# 다른 실행과 비교할 때 이 비율 이상 나빠지면 표시
+REGRESSION_THRESHOLD = 0.10
+
+
+class Command(BaseCommand):
+    help = (
+        "seed 로 만든 유저로 실행 중인 서버의 실제 엔드포인트(로그인, 거래 생성, 필터 목록, 계좌 목록)를 "
+        "동시 요청 수별로 호출해 처리량과 p50/p95/p99 를 재고, 결과를 커밋별 JSON 으로 저장해 이전 실행과 비교합니다. "
+        "(서버와 같은 DB 설정으로 실행)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://localhost:8000", help="서버 주소")
+        parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=SCENARIOS, help="실행할 시나리오")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="동시 요청 수 (여러 개)")
+        parser.add_argument("--iterations", type=int, default=50, help="스레드당 요청 수")
+        parser.add_argument("--users", type=int, default=100, help="요청에 쓸 시드 유저 수")
+        parser.add_argument("--prefix", default="seed", help="seed 명령의 --prefix")
+        parser.add_argument("--password", default="seed-password", help="seed 명령의 --password")
+        parser.add_argument("--seed", type=int, default=42, help="필터 조합 등을 고르는 난수 시드")
+        parser.add_argument(
+            "--cold", action="store_true", help="목록 요청마다 다른 쿼리 문자열을 붙여 응답 캐시를 우회"
+        )
+        parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃(초)")
+        parser.add_argument("--label", default="", help="결과에 남길 메모 (예: pool-on)")
+        parser.add_argument(
+            "--output-dir", default=str(Path(settings.BASE_DIR) / "bench_results"), help="결과 JSON 저장 위치"
+        )
+        parser.add_argument(
+            "--compare", nargs="?", const="latest", help="비교할 이전 결과 파일 (값 없이 주면 가장 최근 결과)"
+        )
+
+    def handle(self, *args, **options):
+        self.base_url = options["base_url"].rstrip("/")
+        self.timeout = options["timeout"]
+        self.cold = options["cold"]
+
+        users = list(
+            User.objects.filter(
+                email__startswith=f"{options['prefix'].lower()}-", is_active=True, account__isnull=False
+            )
+            .distinct()
+            .order_by("pk")[: options["users"]]
+        )
+        if not users:
+            raise CommandError(f"시드 유저가 없습니다. 먼저 manage.py seed --prefix {options['prefix']} 를 실행하세요.")
+        first_accounts = {}
+        for account_id, user_id in (
+            Account.objects.filter(user__in=users).order_by("user_id", "pk").values_list("pk", "user_id")
+        ):
+            first_accounts.setdefault(user_id, account_id)
+
+        # 로그인 이외 시나리오는 실제 로그인과 같은 클레임의 토큰을 바로 발급해 사용
+        self.clients = [
+            {
+                "email": user.email,
+                "password": options["password"],
+                "account": first_accounts[user.pk],
+                "headers": {"Authorization": f"Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}"},
+            }
+            for user in users
+        ]
+        rng = random.Random(options["seed"])
+        self.list_queries = [self._list_query(rng) for _ in range(64)]
+
+        status, body = self._request("POST", "/login/", {"email": users[0].email, "password": options["password"]})
+        if status != 200:
+            raise CommandError(f"로그인 실패 ({status}): {body[:200]!r} (--password 확인)")
+
+        results = []
+        for scenario in options["scenario"]:
+            for workers in options["concurrency"]:
+                result = run_concurrently(
+                    f"{scenario} x{workers}", workers, options["iterations"], getattr(self, f"_{scenario}")
+                )
+                self.stdout.write(result.summary())
+                results.append({"scenario": scenario, "concurrency": workers, **result.as_dict()})
+
+        report = {
+            "commit": _git_commit(),
+            "label": options["label"],
+            "created_at": timezone.now().isoformat(),
+            "base_url": self.base_url,
+            "options": {
+                key: options[key] for key in ("scenario", "concurrency", "iterations", "users", "seed", "cold")
+            },
+            "results": results,
+        }
+        output_dir = Path(options["output_dir"])
+        previous = self._previous_report(output_dir, options["compare"]) if options["compare"] else None
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / f"{timezone.now():%Y%m%d-%H%M%S}-{report['commit']}.json"
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"결과 저장: {path}"))
+
+        if previous:
+            self._compare(*previous, report)
+
+    # 시나리오: (worker, i) → 성공 여부
+    def _client(self, worker, i):
+        return self.clients[(worker * 7919 + i) % len(self.clients)]
+
+    def _login(self, worker, i):
+        client = self._client(worker, i)
+        return self._request("POST", "/login/", {"email": client["email"], "password": client["password"]})[0] == 200
+
+    def _create(self, worker, i):
+        # 같은 스레드가 같은 계좌에 입금 → 출금을 번갈아 해 잔액이 모자라지 않게 함
+        client = self.clients[worker % len(self.clients)]
+        data = {
+            "account": client["account"],
+            "transaction_amount": "1000.00",
+            "deposit_and_withdrawal_type": "DEPOSIT" if i % 2 == 0 else "WITHDRAW",
+            "transaction_type": "TRANSFER",
+        }
+        return self._request("POST", "/api/transactions/", data, client["headers"])[0] == 201
+
+    def _list(self, worker, i):
+        client = self._client(worker, i)
+        query = self.list_queries[(worker + i) % len(self.list_queries)]
+        return self._get(f"/api/transactions/?{query}", client["headers"])
+
+    def _accounts(self, worker, i):
+        return self._get("/api/accounts/", self._client(worker, i)["headers"])
+
+    def _get(self, path, headers):
+        if self.cold:
+            path += ("&" if "?" in path else "?") + f"_={uuid.uuid4().hex[:8]}"
+        return self._request("GET", path, headers=headers)[0] == 200
+
+    @staticmethod
+    def _list_query(rng):
+        """필터 목록 요청 한 가지 (거래 방식 / 입출금 / 금액 범위 / 정렬 조합)."""
+        params = {"page_size": rng.choice([20, 50])}
+        if rng.random() < 0.6:
+            params["transaction_type"] = rng.choice(TRANSACTION_METHOD)[0]
+        if rng.random() < 0.4:
+            params["deposit_and_withdrawal_type"] = rng.choice(["DEPOSIT", "WITHDRAW"])
+        if rng.random() < 0.3:
+            params["min_amount"] = rng.choice([1000, 10000, 50000])
+        if rng.random() < 0.2:
+            params["ordering"] = "-transaction_amount"
+        return urllib.parse.urlencode(params)
+
+    def _request(self, method, path, data=None, headers=None):
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(data).encode() if data is not None else None,
+            headers={"Content-Type": "application/json", **(headers or {})},
+            method=method,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+    # 결과 비교
+    def _previous_report(self, output_dir, compare):
+        if compare == "latest":
+            paths = sorted(output_dir.glob("*.json"))
+            if not paths:
+                self.stdout.write("비교할 이전 결과가 없습니다.")
+                return None
+            path = paths[-1]
+        else:
+            path = Path(compare)
+        try:
+            return path, json.loads(path.read_text())
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"이전 결과를 읽을 수 없습니다: {path} ({exc})")
+
+    def _compare(self, path, previous, current):
+        self.stdout.write(f"\n비교 대상: {path.name} (commit {previous['commit']}) → commit {current['commit']}")
+        before = {(row["scenario"], row["concurrency"]): row for row in previous["results"]}
+        for row in current["results"]:
+            old = before.get((row["scenario"], row["concurrency"]))
+            if old is None:
+                continue
+            throughput = _change(old["throughput_rps"], row["throughput_rps"])
+            p95 = _change(old["p95_ms"], row["p95_ms"])
+            p99 = _change(old["p99_ms"], row["p99_ms"])
+            line = (
+                f"{row['name']}: {old['throughput_rps']} → {row['throughput_rps']} req/s ({throughput:+.1%}), "
+                f"p95 {old['p95_ms']} → {row['p95_ms']}ms ({p95:+.1%}), "
+                f"p99 {old['p99_ms']} → {row['p99_ms']}ms ({p99:+.1%})"
+            )
+            regressed = throughput < -REGRESSION_THRESHOLD or p95 > REGRESSION_THRESHOLD
+            self.stdout.write(self.style.WARNING(line + "  ← 느려짐") if regressed else line)
+
+
+def _change(old, new):
+    return (new - old) / old if old else 0.0
+
+
+def _git_commit():
+    """결과 파일에 남길 커밋. 이미지 안처럼 .git 이 없으면 GIT_COMMIT 환경 변수."""
+    if os.getenv("GIT_COMMIT"):
+        return os.environ["GIT_COMMIT"][:12]
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return result.stdout.strip() or "unknown"
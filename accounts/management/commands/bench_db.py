@@ -0,0 +1,76 @@
+import copy
+import importlib.util
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from accounts.benchmarks import run_concurrently
+from accounts.models import Account
+
+MODES = {
+    # 요청마다 새로 접속 (기존 운영 설정)
+    "per-request": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    # 요청 사이에도 커넥션 유지 + 재사용 전 확인
+    "persistent": {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+    # psycopg 3 커넥션 풀
+    "pool": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "작은 쿼리 하나를 실행하는 요청의 지연 시간을 DB 커넥션 방식별로 비교합니다. "
+        "(요청 시작/종료 시그널까지 실제 요청과 같은 순서로 실행)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES), help="비교할 방식")
+        parser.add_argument("--workers", type=int, default=4, help="동시 요청 수 (워커 스레드)")
+        parser.add_argument("--iterations", type=int, default=200, help="스레드당 요청 수")
+        parser.add_argument("--pool-size", type=int, default=4, help="pool 방식의 최대 커넥션 수")
+
+    def handle(self, *args, **options):
+        base = connections.settings[DEFAULT_DB_ALIAS]
+        for mode in options["modes"]:
+            if mode == "pool" and not self._pool_supported(base):
+                self.stdout.write("pool: 건너뜀 (PostgreSQL + psycopg 3 + psycopg-pool 필요)")
+                continue
+
+            alias = f"bench_{mode.replace('-', '_')}"
+            config = copy.deepcopy(base)
+            config.update(MODES[mode])
+            config["OPTIONS"] = {key: value for key, value in config.get("OPTIONS", {}).items() if key != "pool"}
+            if mode == "pool":
+                config["OPTIONS"]["pool"] = {"min_size": 1, "max_size": options["pool_size"]}
+            connections.settings[alias] = config
+
+            try:
+                result = run_concurrently(mode, options["workers"], options["iterations"], self._request(alias))
+                self.stdout.write(result.summary())
+            finally:
+                if mode == "pool":
+                    connections[alias].close_pool()
+                del connections.settings[alias]
+
+    @staticmethod
+    def _request(alias):
+        def operation(worker, i):
+            # 실제 요청처럼 시작/종료 시그널을 보내 CONN_MAX_AGE/풀 반환 로직이 그대로 동작하게 함
+            request_started.send(sender=Command)
+            try:
+                Account.objects.using(alias).order_by("pk").values_list("pk", flat=True).first()
+            finally:
+                request_finished.send(sender=Command)
+
+        return operation
+
+    @staticmethod
+    def _pool_supported(config):
+        if "postgresql" not in config["ENGINE"]:
+            return False
+        try:
+            from django.db.backends.postgresql.psycopg_any import is_psycopg3
+        except ImportError as exc:
+            raise CommandError(str(exc))
+        return is_psycopg3 and importlib.util.find_spec("psycopg_pool") is not None
@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.benchmarks import BenchResult, run_concurrently
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "실행 중인 서버에 로그인 폭주를 일으키고, 그동안 다른 엔드포인트의 응답 시간이 얼마나 늘어나는지 측정합니다. "
+        "(sync /login/ 과 async /async/login/ 비교용, 서버와 같은 DB 설정으로 실행)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://localhost:8000", help="서버 주소")
+        parser.add_argument(
+            "--login-path", nargs="+", default=["/login/", "/async/login/"], help="비교할 로그인 경로 (여러 개)"
+        )
+        parser.add_argument("--probe-path", default="/profile/", help="로그인 폭주 중 응답 시간을 잴 엔드포인트")
+        parser.add_argument("--workers", type=int, default=16, help="로그인 동시 요청 수")
+        parser.add_argument("--iterations", type=int, default=20, help="스레드당 로그인 횟수")
+        parser.add_argument("--probe-workers", type=int, default=2, help="probe 동시 요청 수")
+        parser.add_argument("--probe-requests", type=int, default=100, help="기준 측정 시 probe 요청 수 (스레드당)")
+        parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃(초)")
+
+    def handle(self, *args, **options):
+        self.base_url = options["base_url"].rstrip("/")
+        self.timeout = options["timeout"]
+
+        suffix = uuid.uuid4().hex[:12]
+        email, password = f"login-{suffix}@bench.local", uuid.uuid4().hex
+        user = User.objects.create_user(email=email, password=password, nickname="bench", name="bench", is_active=True)
+        credentials = {"email": email, "password": password}
+
+        try:
+            status, body = self._request("POST", options["login_path"][0], credentials)
+            if status != 200:
+                raise CommandError(f"로그인 실패 ({status}): {body}")
+            probe_headers = {"Authorization": f"Bearer {json.loads(body)['access']}"}
+
+            def probe(worker, i):
+                return self._request("GET", options["probe_path"], headers=probe_headers)[0] == 200
+
+            baseline = run_concurrently("probe (기준)", options["probe_workers"], options["probe_requests"], probe)
+            self.stdout.write(baseline.summary())
+
+            for path in options["login_path"]:
+                login, during = self._storm(path, credentials, probe, options)
+                self.stdout.write(login.summary())
+                self.stdout.write(during.summary())
+                self.stdout.write(
+                    f"  → 로그인 {login.throughput:.1f} req/s, probe p99 "
+                    f"{baseline.as_dict()['p99_ms']}ms → {during.as_dict()['p99_ms']}ms"
+                )
+        finally:
+            user.delete()
+
+    def _storm(self, path, credentials, probe, options):
+        """로그인 폭주를 백그라운드로 돌리면서, 끝날 때까지 probe 요청을 계속 보낸다."""
+        results = {}
+
+        def storm():
+            results["login"] = run_concurrently(
+                f"login {path}",
+                options["workers"],
+                options["iterations"],
+                lambda worker, i: self._request("POST", path, credentials)[0] == 200,
+            )
+
+        thread = threading.Thread(target=storm)
+        during = BenchResult(f"probe (로그인 {path} 폭주 중)")
+        started = time.perf_counter()
+        thread.start()
+
+        def probe_until_done(index):
+            i = 0
+            while thread.is_alive():
+                begin = time.perf_counter()
+                try:
+                    ok = probe(index, i)
+                except Exception:
+                    ok = False
+                during.record(time.perf_counter() - begin, ok)
+                i += 1
+
+        probes = [threading.Thread(target=probe_until_done, args=(i,)) for i in range(options["probe_workers"])]
+        for probe_thread in probes:
+            probe_thread.start()
+        thread.join()
+        for probe_thread in probes:
+            probe_thread.join()
+        during.elapsed = time.perf_counter() - started
+        return results["login"], during
+
+    def _request(self, method, path, data=None, headers=None):
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(data).encode() if data is not None else None,
+            headers={"Content-Type": "application/json", **(headers or {})},
+            method=method,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
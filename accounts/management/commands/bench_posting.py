@@ -0,0 +1,73 @@
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Sum
+
+from accounts import posting
+from accounts.benchmarks import run_concurrently
+from accounts.models import Account, Transaction, User
+from accounts.serializers import TransactionSerializer
+
+
+class Command(BaseCommand):
+    help = "계좌 하나에 N개의 동시 거래 생성기를 돌려 잔액 정합성과 처리량을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="동시 실행 스레드 수")
+        parser.add_argument("--iterations", type=int, default=200, help="스레드당 거래 수")
+        parser.add_argument("--keep", action="store_true", help="측정용 유저/계좌를 삭제하지 않음")
+
+    def handle(self, *args, **options):
+        workers, iterations = options["workers"], options["iterations"]
+
+        suffix = uuid.uuid4().hex[:12]
+        user = User.objects.create_user(email=f"bench-{suffix}@bench.local", nickname="bench", name="bench")
+        account = Account.objects.create(
+            account_number=f"B{suffix}", bank_code="000", account_type="CHECKING", balance=Decimal("0"), user=user
+        )
+
+        # 입금 3, 출금 2 를 번갈아 실행 → 출금은 잔액이 모자라면 실패해야 정상
+        def operation(worker, i):
+            direction = "DEPOSIT" if i % 2 == 0 else "WITHDRAW"
+            serializer = TransactionSerializer(
+                data={
+                    "account": account.pk,
+                    "deposit_and_withdrawal_type": direction,
+                    "transaction_amount": "3.00" if direction == "DEPOSIT" else "2.00",
+                    "transaction_type": "ATM",
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+            try:
+                posting.post(serializer)
+            except posting.InsufficientBalance:
+                return None
+            return True
+
+        try:
+            result = run_concurrently("posting", workers, iterations, operation)
+
+            account.refresh_from_db()
+            deposits = self._total(account, "DEPOSIT")
+            withdrawals = self._total(account, "WITHDRAW")
+            expected = deposits - withdrawals
+
+            self.stdout.write(result.summary())
+            self.stdout.write(
+                f"balance={account.balance} expected={expected} "
+                f"(deposits={deposits}, withdrawals={withdrawals}, rows={account.transaction_set.count()})"
+            )
+            if account.balance != expected or account.balance < 0:
+                raise CommandError("잔액 불일치: 동시 거래 중 변화량이 유실되었습니다.")
+            self.stdout.write(self.style.SUCCESS("잔액 정합성 확인 완료"))
+        finally:
+            if not options["keep"]:
+                user.delete()
+
+    @staticmethod
+    def _total(account, direction):
+        total = Transaction.objects.filter(account=account, deposit_and_withdrawal_type=direction).aggregate(
+            total=Sum("transaction_amount")
+        )["total"]
+        return total or Decimal("0")
@@ -0,0 +1,87 @@
+import json
+import urllib.error
+import urllib.request
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.benchmarks import run_concurrently
+from accounts.models import Account, Transaction, User
+
+# (이름, sync 경로, async 경로)
+ENDPOINTS = [
+    ("transactions", "/api/transactions/", "/api/async/transactions/"),
+    ("accounts", "/api/accounts/", "/api/async/accounts/"),
+    ("profile", "/profile/", "/async/profile/"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "조회 API 를 동시 요청 수별로 호출해 sync(WSGI) 배포와 async(ASGI) 배포의 처리량/지연을 비교합니다. "
+        "(두 서버를 띄워 두고 서버와 같은 DB 설정으로 실행)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sync-url", default="http://localhost:8000", help="WSGI 서버 주소 (빈 값이면 생략)")
+        parser.add_argument("--async-url", default="http://localhost:8001", help="ASGI 서버 주소 (빈 값이면 생략)")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64], help="동시 요청 수 (여러 개)")
+        parser.add_argument("--iterations", type=int, default=50, help="스레드당 요청 수")
+        parser.add_argument("--transactions", type=int, default=500, help="측정용 계좌에 만들 거래 수")
+        parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃(초)")
+
+    def handle(self, *args, **options):
+        suffix = uuid.uuid4().hex[:12]
+        user = User.objects.create_user(
+            email=f"reads-{suffix}@bench.local", nickname="bench", name="bench", is_active=True
+        )
+        account = Account.objects.create(
+            account_number=f"R{suffix}", bank_code="004", account_type="CHECKING", balance=Decimal("0"), user=user
+        )
+        Transaction.objects.bulk_create(
+            Transaction(
+                transaction_amount=Decimal("100"),
+                amount_after_transaction=Decimal("100"),
+                deposit_and_withdrawal_type="DEPOSIT",
+                transaction_type="ATM",
+                account=account,
+            )
+            for _ in range(options["transactions"])
+        )
+        headers = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+        targets = [
+            (label, url.rstrip("/"), index)
+            for label, url, index in [("sync", options["sync_url"], 1), ("async", options["async_url"], 2)]
+            if url
+        ]
+        try:
+            for workers in options["concurrency"]:
+                for label, base_url, index in targets:
+                    paths = [base_url + endpoint[index] for endpoint in ENDPOINTS]
+                    result = run_concurrently(
+                        f"{label} x{workers}",
+                        workers,
+                        options["iterations"],
+                        self._operation(paths, headers, options["timeout"]),
+                    )
+                    self.stdout.write(result.summary())
+        finally:
+            user.delete()
+
+    @staticmethod
+    def _operation(urls, headers, timeout):
+        # 스레드마다 엔드포인트를 돌아가며 호출
+        def operation(worker, i):
+            url = urls[(worker + i) % len(urls)]
+            request = urllib.request.Request(url, headers=headers)
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    json.loads(response.read())
+                    return response.status == 200
+            except urllib.error.HTTPError:
+                return False
+
+        return operation
@@ -0,0 +1,120 @@
+import io
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import balances, posting
+from accounts.models import Account, Transaction, User
+from accounts.serializers import TransactionSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "거래가 아주 많은 계좌(기본 100만 건)에서 과거 거래 수정/삭제 시 이후 거래 잔액 재계산 시간을 측정하고 "
+        "모든 거래 후 잔액이 맞는지 확인합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--transactions", type=int, default=1_000_000, help="계좌의 거래 수")
+        parser.add_argument("--keep", action="store_true", help="측정용 유저/계좌를 삭제하지 않음")
+
+    def handle(self, *args, **options):
+        count = options["transactions"]
+
+        suffix = uuid.uuid4().hex[:12]
+        user = User.objects.create_user(email=f"bench-{suffix}@bench.local", nickname="bench", name="bench")
+        account = Account.objects.create(
+            account_number=f"B{suffix}", bank_code="000", account_type="CHECKING", balance=Decimal("0"), user=user
+        )
+        try:
+            self._fill(account, count)
+            ids = list(
+                Transaction.objects.filter(account=account)
+                .order_by("transaction_timestamp", "id")[:1]
+                .values_list("pk", flat=True)
+            )
+            ids += self._ids_at(account, [count // 2, count - 10])
+
+            # 맨 앞 거래 수정 → 이후 전체, 중간 거래 수정 → 절반, 끝 부근 삭제 → 몇 건
+            self._measure("수정 (맨 앞, 이후 전체)", lambda: self._edit(ids[0], "7.00"))
+            self._measure("수정 (중간, 이후 절반)", lambda: self._edit(ids[1], "1.00"))
+            self._measure("삭제 (끝 부근)", lambda: posting.reverse(Transaction.objects.get(pk=ids[2])))
+            self._measure("전체 재계산 (rebuild_running_balances)", lambda: self._rebuild(account))
+            self._verify(account)
+        finally:
+            if not options["keep"]:
+                Transaction.objects.filter(account=account).delete()
+                user.delete()
+
+    def _fill(self, account, count):
+        # 입금 3원, 출금 1원을 번갈아 넣어 잔액이 항상 양수가 되게 함 (거래 후 잔액도 미리 계산)
+        started = time.perf_counter()
+        balance = Decimal("0")
+        batch = []
+        for i in range(count):
+            direction = "DEPOSIT" if i % 2 == 0 else "WITHDRAW"
+            amount = Decimal("3.00") if direction == "DEPOSIT" else Decimal("1.00")
+            balance += amount if direction == "DEPOSIT" else -amount
+            batch.append(
+                Transaction(
+                    account=account,
+                    transaction_amount=amount,
+                    amount_after_transaction=balance,
+                    account_factor_history="bench",
+                    deposit_and_withdrawal_type=direction,
+                    transaction_type="ATM",
+                )
+            )
+            if len(batch) == 10000:
+                Transaction.objects.bulk_create(batch)
+                batch = []
+        Transaction.objects.bulk_create(batch)
+        Account.objects.filter(pk=account.pk).update(balance=balance)
+        account.refresh_from_db()
+        # 수정/삭제 시 함께 갱신되는 일별 잔액/월별 집계도 실제 계좌처럼 채워 둠
+        call_command("rebuild_daily_balances", account=[account.pk], stdout=io.StringIO())
+        call_command("rebuild_rollups", account=[account.pk], stdout=io.StringIO())
+        self.stdout.write(f"거래 {count}건 생성 ({time.perf_counter() - started:.1f}초)")
+
+    @staticmethod
+    def _ids_at(account, positions):
+        rows = Transaction.objects.filter(account=account).order_by("transaction_timestamp", "id")
+        return [rows.values_list("pk", flat=True)[position] for position in positions]
+
+    def _measure(self, label, run):
+        started = time.perf_counter()
+        run()
+        self.stdout.write(f"{label}: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    @staticmethod
+    def _edit(pk, amount):
+        instance = Transaction.objects.get(pk=pk)
+        serializer = TransactionSerializer(instance, data={"transaction_amount": amount}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        posting.repost(serializer)
+
+    @staticmethod
+    def _rebuild(account):
+        # 위 수정/삭제로 바뀐 잔액 기준 (이미 맞는 행은 다시 쓰지 않으므로 주로 읽기 비용)
+        account.refresh_from_db()
+        return balances.recompute(account.pk, None, balances.opening_balance(account))
+
+    def _verify(self, account):
+        # 모든 행의 거래 후 잔액이 (일시, id) 순 누적 합계와 같고, 마지막 값이 계좌 잔액과 같아야 함
+        account.refresh_from_db()
+        running = balances.opening_balance(account)
+        rows = (
+            Transaction.objects.filter(account=account)
+            .order_by("transaction_timestamp", "id")
+            .values_list("deposit_and_withdrawal_type", "transaction_amount", "amount_after_transaction")
+        )
+        mismatches = 0
+        for direction, amount, after in rows.iterator(chunk_size=10000):
+            running += posting.signed_amount(direction, amount)
+            mismatches += after != running
+        if mismatches or running != account.balance:
+            raise CommandError(f"거래 후 잔액 불일치 {mismatches}건 (누적 {running}, 계좌 {account.balance})")
+        self.stdout.write(self.style.SUCCESS("모든 거래 후 잔액 일치"))
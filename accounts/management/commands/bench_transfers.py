@@ -0,0 +1,132 @@
+import random
+import threading
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, transaction
+from django.db.models import Count, Q, Sum
+
+from accounts import posting
+from accounts.balances import effects
+from accounts.benchmarks import run_concurrently
+from accounts.models import Account, Transaction, User
+
+OPENING_BALANCE = Decimal("1000.00")
+
+
+class Command(BaseCommand):
+    help = (
+        "적은 수의 계좌 사이에서 양방향 동시 이체를 돌려 교착(deadlock) 여부, 처리량, 잔액 정합성을 측정합니다. "
+        "--naive 는 보내는 계좌 → 받는 계좌 순서로 잠그는 비교용 방식."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--accounts", type=int, default=4, help="이체를 주고받을 계좌 수 (적을수록 경합이 심함)")
+        parser.add_argument("--workers", type=int, default=8, help="동시 실행 스레드 수")
+        parser.add_argument("--iterations", type=int, default=200, help="스레드당 호출 수")
+        parser.add_argument("--batch", type=int, default=1, help="호출 한 번에 보내는 이체 수 (transfer_many)")
+        parser.add_argument("--naive", action="store_true", help="계좌 pk 순서가 아니라 요청 순서로 잠금 (비교용)")
+        parser.add_argument("--keep", action="store_true", help="측정용 유저/계좌를 삭제하지 않음")
+
+    def handle(self, *args, **options):
+        if options["accounts"] < 2:
+            raise CommandError("--accounts 는 2 이상이어야 합니다.")
+        suffix = uuid.uuid4().hex[:12]
+        user = User.objects.create_user(email=f"bench-{suffix}@bench.local", nickname="bench", name="bench")
+        accounts = [
+            Account.objects.create(
+                account_number=f"T{suffix}{index:03d}",
+                bank_code="000",
+                account_type="CHECKING",
+                balance=OPENING_BALANCE,
+                user=user,
+            )
+            for index in range(options["accounts"])
+        ]
+
+        counts = {"deadlocks": 0, "rejected": 0, "transfers": 0}
+        lock = threading.Lock()
+        transfer = self._naive_transfer if options["naive"] else posting.transfer_many
+
+        def operation(worker, i):
+            rng = random.Random(worker * 1_000_003 + i)
+            batch = []
+            for _ in range(options["batch"]):
+                source, target = rng.sample(accounts, 2)
+                batch.append(
+                    {
+                        "from_account": source,
+                        "to_account": target,
+                        "transaction_amount": Decimal(rng.randint(1, 50)),
+                        "account_factor_history": "bench",
+                    }
+                )
+            try:
+                results = transfer(batch)
+            except OperationalError as exc:
+                if "deadlock" not in str(exc).lower():
+                    raise
+                with lock:
+                    counts["deadlocks"] += 1
+                return False
+            rejected = sum(isinstance(result, posting.InsufficientBalance) for result in results)
+            with lock:
+                counts["rejected"] += rejected
+                counts["transfers"] += len(results) - rejected
+            return True
+
+        try:
+            result = run_concurrently("transfers", options["workers"], options["iterations"], operation)
+            self.stdout.write(result.summary())
+            self.stdout.write(
+                f"이체 {counts['transfers']}건, 잔액 부족 {counts['rejected']}건, "
+                f"교착으로 실패한 호출 {counts['deadlocks']}건"
+            )
+            self._verify(accounts, counts["transfers"])
+        finally:
+            if not options["keep"]:
+                Transaction.objects.filter(account__in=accounts).delete()
+                user.delete()
+
+    @staticmethod
+    def _naive_transfer(transfers):
+        # 비교용: 이체마다 보내는 계좌, 받는 계좌 순으로 잠근다. 반대 방향 이체가 동시에 오면 서로의 두 번째 락을 기다림
+        with transaction.atomic():
+            for data in transfers:
+                for account in (data["from_account"], data["to_account"]):
+                    Account.objects.select_for_update().filter(pk=account.pk).values_list("pk").get()
+            return posting.transfer_many(transfers)
+
+    def _verify(self, accounts, transfers):
+        rows = Transaction.objects.filter(account__in=accounts)
+        problems = []
+
+        total = sum(Account.objects.filter(pk__in=[a.pk for a in accounts]).values_list("balance", flat=True))
+        if total != OPENING_BALANCE * len(accounts):
+            problems.append(f"잔액 합계 {total} (이체로 총액이 바뀌면 안 됨)")
+
+        for account in accounts:
+            account.refresh_from_db()
+            moved = rows.filter(account=account).aggregate(total=Sum(effects()))["total"] or Decimal("0")
+            if account.balance != OPENING_BALANCE + moved or account.balance < 0:
+                problems.append(
+                    f"{account.account_number}: 잔액 {account.balance}, 거래 기준 {OPENING_BALANCE + moved}"
+                )
+            last = rows.filter(account=account).order_by("-transaction_timestamp", "-id").first()
+            if last is not None and last.amount_after_transaction != account.balance:
+                problems.append(f"{account.account_number}: 마지막 거래 후 잔액 {last.amount_after_transaction}")
+
+        # 이체 묶음마다 출금 1 + 입금 1, 금액 같음
+        groups = rows.values("transfer").annotate(
+            legs=Count("id"),
+            net=Sum(effects()),
+            withdrawals=Count("id", filter=Q(deposit_and_withdrawal_type="WITHDRAW")),
+        )
+        broken = groups.exclude(legs=2, net=0, withdrawals=1).count()
+        if broken or groups.count() != transfers:
+            problems.append(f"이체 묶음 {groups.count()}개 (기대 {transfers}), 짝이 맞지 않는 묶음 {broken}개")
+
+        if problems:
+            raise CommandError("정합성 오류: " + "; ".join(problems))
+        self.stdout.write(self.style.SUCCESS("잔액/이체 묶음 정합성 확인 완료"))
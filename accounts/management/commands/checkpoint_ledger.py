@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts import ledger, versions
+from accounts.models import Account
+
+
+class Command(BaseCommand):
+    help = (
+        "원장 모드 잔액 체크포인트를 남기고 계좌 잔액 컬럼을 원장(체크포인트 + 이후 거래) 값과 맞춥니다. "
+        "(원장 모드 전환 직후 / 주기 실행용, 거래 행은 바꾸지 않음)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", type=int, action="append", help="대상 계좌 id (여러 번 지정 가능)")
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.order_by("pk")
+        if options["account"]:
+            accounts = accounts.filter(pk__in=options["account"])
+        account_ids = list(accounts.values_list("pk", flat=True))
+
+        created = mismatched = 0
+        for index, account_id in enumerate(account_ids, 1):
+            checkpointed, corrected = self._checkpoint(account_id)
+            created += checkpointed
+            mismatched += corrected
+            if index % 1000 == 0 or index == len(account_ids):
+                self.stdout.write(f"{index}/{len(account_ids)} 계좌 완료 (체크포인트 {created}개)")
+        if mismatched:
+            self.stdout.write(self.style.WARNING(f"잔액 컬럼이 원장과 달랐던 계좌 {mismatched}개를 원장 값으로 맞춤"))
+
+    @transaction.atomic
+    def _checkpoint(self, account_id):
+        # 계좌를 잠가서 체크포인트 위치와 합계 사이에 새 거래가 끼어들지 않게 함
+        stored, user_id = Account.objects.select_for_update().filter(pk=account_id).values_list("balance", "user").get()
+        had_checkpoint = ledger.latest_checkpoint(account_id) is not None
+        balance, tail = ledger.derive(account_id, stored)
+        checkpointed = not had_checkpoint
+        if tail:
+            ledger.create_checkpoint(account_id, balance)
+            checkpointed = True
+        if balance != stored:
+            Account.objects.filter(pk=account_id).update(balance=balance)
+            # 캐시해 둔 계좌 응답이 예전 잔액을 돌려주지 않게
+            transaction.on_commit(lambda: versions.bump(user_id))
+        return checkpointed, balance != stored
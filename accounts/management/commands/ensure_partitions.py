@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+
+from accounts import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "거래내역 월 파티션을 앞으로 쓸 달까지 미리 만드는 워커. 배포 없이 달이 넘어가도 파티션이 모자라지 않게 "
+        "주기적으로 확인합니다. PostgreSQL 파티션 테이블이 아니면 아무것도 하지 않습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead", type=int, default=partitions.MONTHS_AHEAD, help="이번 달부터 몇 달 뒤까지 만들지"
+        )
+        parser.add_argument("--interval", type=float, default=6 * 60 * 60, help="확인 주기(초)")
+        parser.add_argument("--once", action="store_true", help="한 번만 확인하고 종료 (cron 용)")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="대상 DB alias")
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                created = partitions.ensure_partitions(months_ahead=options["months_ahead"], using=options["database"])
+                for month in created:
+                    self.stdout.write(f"{month:%Y-%m} 파티션 생성")
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                # 긴 대기 동안 끊겼을 수 있는 커넥션 정리
+                close_old_connections()
+        except KeyboardInterrupt:
+            self.stdout.write("워커 종료")
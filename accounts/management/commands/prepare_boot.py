@@ -0,0 +1,124 @@
+import hashlib
+import os
+import pkgutil
+import time
+from contextlib import contextmanager
+from importlib import import_module
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+
+from accounts import partitions
+
+STATIC_FINGERPRINT_FILE = ".static-fingerprint"
+# 여러 컨테이너가 동시에 떠도 migrate 는 하나만 실행되도록 잡는 advisory lock 키 (임의의 고정값)
+MIGRATE_LOCK_ID = 0x5649524C
+
+
+class Command(BaseCommand):
+    help = (
+        "컨테이너 시작 시 준비 작업. 적용 안 된 마이그레이션이 있을 때만 migrate, "
+        "정적 파일 지문이 바뀌었을 때만 collectstatic 을 실행합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--no-migrate", action="store_true", help="마이그레이션 단계 생략 (이미지 빌드 시)")
+        parser.add_argument("--no-static", action="store_true", help="정적 파일 단계 생략")
+        parser.add_argument("--force", action="store_true", help="지문과 상관없이 migrate / collectstatic 실행")
+
+    def handle(self, *args, **options):
+        if not options["no_migrate"]:
+            self._step("migrate", lambda: self._migrate(options["database"], options["force"]))
+            # 마이그레이션이 없어 migrate 를 건너뛰어도 다음 달 파티션은 채워 둠
+            self._step("partitions", lambda: partitions.ensure_partitions(using=options["database"]))
+        if not options["no_static"]:
+            self._step("collectstatic", lambda: self._collectstatic(options["force"]))
+
+    def _step(self, name, run):
+        started = time.perf_counter()
+        ran = run()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(f"{name}: {'실행' if ran else '변경 없음, 생략'} ({elapsed:.0f}ms)")
+
+    # ---- 마이그레이션 ----
+    def _migrate(self, database, force):
+        connection = connections[database]
+        if not force and not self._pending_migrations(connection):
+            return False
+
+        with self._migrate_lock(connection):
+            # 락을 기다리는 동안 다른 컨테이너가 이미 적용했을 수 있음
+            if force or self._pending_migrations(connection):
+                call_command("migrate", database=database, interactive=False, verbosity=1)
+        return True
+
+    @staticmethod
+    def _pending_migrations(connection):
+        """
+        디스크의 마이그레이션 파일 이름과 django_migrations 에 기록된 이름을 비교한다.
+
+        마이그레이션 모듈을 import 해서 그래프를 만들지 않으므로 쿼리 한 번이면 끝난다.
+        (squash 등으로 판단이 애매하면 적용할 것이 있다고 보고 migrate 에 맡긴다)
+        """
+        applied = set(MigrationRecorder(connection).applied_migrations())
+        for app_config in apps.get_app_configs():
+            module_name, _explicit = MigrationLoader.migrations_module(app_config.label)
+            if module_name is None:
+                continue
+            try:
+                module = import_module(module_name)
+            except ModuleNotFoundError:
+                continue
+            for _finder, name, is_pkg in pkgutil.iter_modules(getattr(module, "__path__", [])):
+                if not is_pkg and name[0] not in "_~" and (app_config.label, name) not in applied:
+                    return True
+        return False
+
+    @staticmethod
+    @contextmanager
+    def _migrate_lock(connection):
+        if connection.vendor != "postgresql":
+            yield
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", [MIGRATE_LOCK_ID])
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATE_LOCK_ID])
+
+    # ---- 정적 파일 ----
+    def _collectstatic(self, force):
+        static_root = Path(settings.STATIC_ROOT)
+        record = static_root / STATIC_FINGERPRINT_FILE
+        fingerprint = self._static_fingerprint()
+        if not force and record.exists() and record.read_text().strip() == fingerprint:
+            return False
+
+        call_command("collectstatic", interactive=False, verbosity=0)
+        record.write_text(fingerprint)
+        return True
+
+    @staticmethod
+    def _static_fingerprint():
+        # 수집 대상 파일의 (경로, 크기, 수정 시각) 과 저장소 설정으로 지문을 만든다 (파일 내용은 읽지 않음)
+        digest = hashlib.sha256(repr(settings.STORAGES.get("staticfiles")).encode())
+        entries = []
+        for finder in get_finders():
+            for path, storage in finder.list(["CVS", ".*", "*~"]):
+                stat = os.stat(storage.path(path))
+                prefix = getattr(storage, "prefix", None) or ""
+                entries.append(f"{os.path.join(prefix, path)}:{stat.st_size}:{stat.st_mtime_ns}")
+        for entry in sorted(entries):
+            digest.update(entry.encode())
+            digest.update(b"\n")
+        return digest.hexdigest()
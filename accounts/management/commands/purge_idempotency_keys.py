@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts import idempotency
+from accounts.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "보관 기간(IDEMPOTENCY_KEY_TTL)이 지난 Idempotency-Key 기록을 작은 배치로 나눠 지웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="한 번에 지울 키 수")
+        parser.add_argument("--sleep", type=float, default=0.0, help="배치 사이 대기 시간(초), 운영 중 부하 조절용")
+        parser.add_argument("--dry-run", action="store_true", help="지울 키 수만 출력")
+
+    def handle(self, *args, **options):
+        expired = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=idempotency.KEY_TTL))
+        if options["dry_run"]:
+            self.stdout.write(f"만료된 키 {expired.count()}개")
+            return
+
+        deleted = 0
+        while True:
+            # created_at 인덱스로 만료된 키만 골라 배치마다 짧은 DELETE 한 번 (지운 행은 다음 배치에서 안 보임)
+            ids = list(expired.values_list("pk", flat=True)[: options["chunk_size"]])
+            if not ids:
+                break
+            deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
+            self.stdout.write(f"{deleted}개 삭제")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"만료된 키 {deleted}개 삭제 완료"))
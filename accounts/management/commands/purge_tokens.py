@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = (
+        "만료된 OutstandingToken / BlacklistedToken 을 작은 배치로 나눠 지웁니다. "
+        "(flushexpiredtokens 와 달리 한 번에 테이블 전체를 잠그지 않음)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="한 트랜잭션에서 지울 토큰 수")
+        parser.add_argument("--sleep", type=float, default=0.0, help="배치 사이 대기 시간(초), 운영 중 부하 조절용")
+        parser.add_argument("--dry-run", action="store_true", help="지울 토큰 수만 출력")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now)
+        if options["dry_run"]:
+            self.stdout.write(f"만료된 토큰 {expired.count()}개")
+            return
+
+        deleted = last_id = 0
+        while True:
+            # id 순으로 훑으며 다음 배치를 고름. 오래된(작은 id) 토큰부터 만료되므로 대부분 인덱스 앞부분만 읽는다
+            ids = list(
+                expired.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[: options["chunk_size"]]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                OutstandingToken.objects.filter(pk__in=ids).delete()
+            deleted += len(ids)
+            last_id = ids[-1]
+            self.stdout.write(f"{deleted}개 삭제")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"만료된 토큰 {deleted}개 삭제 완료"))
@@ -0,0 +1,101 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+from accounts import archive, partitions, versions
+from accounts.models import Account, DailyBalance, Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "거래내역으로부터 계좌별 일별 잔액 스냅샷을 다시 만듭니다. (최초 도입 시 백필 / 정합성 복구용) "
+        "아카이브된 달(archive_transactions)의 스냅샷은 입출금 합계를 그대로 두고 마감 잔액만 다시 맞춥니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", type=int, action="append", help="대상 계좌 id (여러 번 지정 가능)")
+        parser.add_argument("--chunk-size", type=int, default=500, help="한 트랜잭션에서 처리할 계좌 수")
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.order_by("pk")
+        if options["account"]:
+            accounts = accounts.filter(pk__in=options["account"])
+        account_ids = list(accounts.values_list("pk", flat=True))
+        # 아카이브된 달의 날짜 범위 (그 달의 거래는 DB 에 없음)
+        self.archived = Q()
+        for month in archive.archived_months():
+            self.archived |= Q(date__gte=month, date__lt=partitions.add_months(month, 1))
+
+        size = options["chunk_size"]
+        for start in range(0, len(account_ids), size):
+            self._rebuild(account_ids[start : start + size])
+            self.stdout.write(f"{min(start + size, len(account_ids))}/{len(account_ids)} 계좌 완료")
+
+    @transaction.atomic
+    def _rebuild(self, account_ids):
+        # 계좌를 잠가서 재계산 도중 들어오는 거래와 섞이지 않게 함
+        locked = list(
+            Account.objects.select_for_update()
+            .filter(pk__in=account_ids)
+            .order_by("pk")
+            .values_list("pk", "balance", "user")
+        )
+        balances = {account_id: balance for account_id, balance, _ in locked}
+
+        # (계좌, 날짜, 입출금 타입) 별 합계를 DB 에서 한 번에 집계
+        daily = defaultdict(lambda: {"deposit": Decimal("0"), "withdrawal": Decimal("0"), "count": 0})
+        rows = (
+            Transaction.objects.filter(account_id__in=account_ids)
+            .annotate(day=TruncDate("transaction_timestamp"))
+            .values("account_id", "day", "deposit_and_withdrawal_type")
+            .annotate(total=Sum("transaction_amount"), count=Count("id"))
+        )
+        for row in rows:
+            bucket = daily[(row["account_id"], row["day"])]
+            bucket["deposit" if row["deposit_and_withdrawal_type"] == "DEPOSIT" else "withdrawal"] += row["total"]
+            bucket["count"] += row["count"]
+
+        # 아카이브된 달의 스냅샷은 다시 만들 원본이 없으므로 남겨 두고, 그 입출금 합계를 잔액 누적에 그대로 씀
+        kept = {}
+        if self.archived:
+            for snapshot in DailyBalance.objects.filter(self.archived, account_id__in=account_ids):
+                kept[(snapshot.account_id, snapshot.date)] = snapshot
+                daily.pop((snapshot.account_id, snapshot.date), None)
+
+        # 현재 잔액에서 전체 변화량을 빼 최초 잔액을 구한 뒤 날짜순으로 누적
+        running = dict(balances)
+        for (account_id, _), bucket in daily.items():
+            running[account_id] -= bucket["deposit"] - bucket["withdrawal"]
+        for (account_id, _), snapshot in kept.items():
+            running[account_id] -= snapshot.deposit_total - snapshot.withdrawal_total
+
+        snapshots = []
+        for account_id, day in sorted([*daily, *kept]):
+            snapshot = kept.get((account_id, day))
+            if snapshot is not None:
+                running[account_id] += snapshot.deposit_total - snapshot.withdrawal_total
+                snapshot.closing_balance = running[account_id]
+                continue
+            bucket = daily[(account_id, day)]
+            running[account_id] += bucket["deposit"] - bucket["withdrawal"]
+            snapshots.append(
+                DailyBalance(
+                    account_id=account_id,
+                    date=day,
+                    closing_balance=running[account_id],
+                    deposit_total=bucket["deposit"],
+                    withdrawal_total=bucket["withdrawal"],
+                    transaction_count=bucket["count"],
+                )
+            )
+
+        DailyBalance.objects.filter(account_id__in=account_ids).exclude(self.archived).delete()
+        DailyBalance.objects.bulk_create(snapshots, batch_size=2000)
+        DailyBalance.objects.bulk_update(kept.values(), ["closing_balance"], batch_size=2000)
+        # 캐시해 둔 일별 잔액/통계 응답을 버리게
+        user_ids = {user_id for _, _, user_id in locked}
+        transaction.on_commit(lambda: versions.bump_many(user_ids))
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+
+from accounts import archive
+from accounts.models import Account, MonthlyRollup, Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "거래내역으로부터 월별 집계(MonthlyRollup)를 계좌 범위 청크 단위로 병렬 재계산합니다. "
+        "아카이브된 달(archive_transactions)은 DB 에 거래가 없으므로 기존 집계를 그대로 둡니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", type=int, action="append", help="대상 계좌 id (여러 번 지정 가능)")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="청크당 계좌 수")
+        parser.add_argument("--workers", type=int, default=4, help="동시에 처리할 청크 수 (스레드/DB 커넥션 수)")
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.order_by("pk")
+        if options["account"]:
+            accounts = accounts.filter(pk__in=options["account"])
+        account_ids = list(accounts.values_list("pk", flat=True))
+        self.archived = archive.archived_months()
+        size = options["chunk_size"]
+        chunks = [account_ids[start : start + size] for start in range(0, len(account_ids), size)]
+
+        workers = options["workers"]
+        if connection.vendor == "sqlite":
+            # SQLite 는 쓰기 트랜잭션을 하나씩만 허용하므로 병렬 처리 의미가 없음
+            workers = 1
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for rows in pool.map(self._rebuild_chunk, chunks):
+                done += 1
+                self.stdout.write(f"청크 {done}/{len(chunks)} 완료 ({rows}행)")
+
+    def _rebuild_chunk(self, account_ids):
+        try:
+            return self._rebuild(account_ids)
+        finally:
+            # 스레드마다 열린 DB 커넥션 정리
+            connection.close()
+
+    @transaction.atomic
+    def _rebuild(self, account_ids):
+        # 청크 계좌를 잠가 재계산 도중 들어오는 거래와 섞이지 않게 한 뒤, 집계는 GROUP BY 한 번으로 DB 에서 계산
+        list(Account.objects.select_for_update().filter(pk__in=account_ids).order_by("pk").values_list("pk"))
+        rows = (
+            Transaction.objects.filter(account_id__in=account_ids)
+            .annotate(month=TruncMonth("transaction_timestamp", output_field=DateField()))
+            .exclude(month__in=self.archived)
+            .values("account_id", "month", "transaction_type", "deposit_and_withdrawal_type")
+            .annotate(transaction_count=Count("id"), total_amount=Sum("transaction_amount"))
+            .order_by()
+        )
+
+        # 아카이브된 달은 다시 만들 원본 거래가 DB 에 없으므로 기존 집계를 지우지 않음
+        MonthlyRollup.objects.filter(account_id__in=account_ids).exclude(month__in=self.archived).delete()
+        created = MonthlyRollup.objects.bulk_create((MonthlyRollup(**row) for row in rows), batch_size=2000)
+        return len(created)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts import balances, ledger, versions
+from accounts.models import Account
+
+
+class Command(BaseCommand):
+    help = (
+        "계좌별 거래 후 잔액(amount_after_transaction)을 현재 잔액 기준으로 다시 계산합니다. "
+        "(과거 거래 수정/삭제로 어긋난 데이터 복구용, 계좌당 윈도 함수 UPDATE)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", type=int, action="append", help="대상 계좌 id (여러 번 지정 가능)")
+        parser.add_argument("--chunk-size", type=int, default=balances.CHUNK_SIZE, help="UPDATE 한 번에 처리할 거래 수")
+
+    def handle(self, *args, **options):
+        if ledger.LEDGER_MODE:
+            raise CommandError("원장 모드에서는 거래 행을 고치지 않습니다. (TRANSACTION_LEDGER_MODE)")
+        accounts = Account.objects.order_by("pk")
+        if options["account"]:
+            accounts = accounts.filter(pk__in=options["account"])
+        account_ids = list(accounts.values_list("pk", flat=True))
+
+        changed = 0
+        for index, account_id in enumerate(account_ids, 1):
+            changed += self._rebuild(account_id, options["chunk_size"])
+            if index % 1000 == 0 or index == len(account_ids):
+                self.stdout.write(f"{index}/{len(account_ids)} 계좌 완료 (바뀐 거래 {changed}건)")
+
+    @transaction.atomic
+    def _rebuild(self, account_id, chunk_size):
+        # 계좌를 잠가서 재계산 도중 들어오는 거래와 섞이지 않게 함
+        account = Account.objects.select_for_update().get(pk=account_id)
+        changed = balances.recompute(account_id, None, balances.opening_balance(account), chunk_size)
+        if changed:
+            # 캐시해 둔 거래 목록/ETag 가 예전 잔액을 돌려주지 않게
+            transaction.on_commit(lambda: versions.bump(account.user_id))
+        return changed
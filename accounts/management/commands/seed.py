@@ -0,0 +1,285 @@
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from datetime import time as dtime
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts import partitions, versions
+from accounts.constants import ACCOUNT_TYPE, BANK_CODES, TRANSACTION_METHOD, TRANSACTION_TYPE
+from accounts.models import Account, Transaction, User
+
+# 실제 분포에 가깝게 잡은 가중치 (목록에 없는 코드는 OTHER_WEIGHT 를 나눠 가짐)
+BANK_WEIGHTS = {
+    "004": 16,
+    "088": 14,
+    "011": 12,
+    "020": 10,
+    "081": 10,
+    "090": 10,
+    "003": 6,
+    "092": 6,
+    "089": 3,
+    "071": 3,
+    "045": 3,
+    "048": 2,
+}
+OTHER_BANK_WEIGHT = 5
+ACCOUNT_TYPE_WEIGHTS = {
+    "CHECKING": 55,
+    "SAVING": 20,
+    "STOCK": 8,
+    "PENSION": 4,
+    "IRP": 4,
+    "FOREIGN_CURRENCY": 4,
+    "LOAN": 3,
+    "TRUST": 2,
+}
+# 입출금 타입별 거래 방식 가중치
+METHOD_WEIGHTS = {
+    "DEPOSIT": {"TRANSFER": 55, "ATM": 20, "AUTOMATIC_TRANSFER": 15, "INTEREST": 10, "CARD": 0},
+    "WITHDRAW": {"CARD": 45, "TRANSFER": 25, "AUTOMATIC_TRANSFER": 20, "ATM": 10, "INTEREST": 0},
+}
+# 금액 로그정규 분포 (mu, sigma): 입금 중앙값 약 10만원, 출금 약 2만원, 이자 약 400원
+AMOUNT_LOGNORMAL = {"DEPOSIT": (11.5, 1.0), "WITHDRAW": (10.0, 1.1), "INTEREST": (6.0, 1.0)}
+DEPOSIT_RATIO = 0.4
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN = "민서지현준우예도하윤수영은재성진호연"
+
+METHOD_LABELS = dict(TRANSACTION_METHOD)
+DIRECTION_LABELS = dict(TRANSACTION_TYPE)
+
+
+class _Choice:
+    """가중치 목록에서 빠르게 뽑기 (누적 가중치를 한 번만 계산)."""
+
+    def __init__(self, weights):
+        self.values = list(weights)
+        self.cum_weights = list(accumulate(weights.values()))
+
+    def __call__(self, rng):
+        return rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "부하 테스트용 유저/계좌/거래를 대량으로 만듭니다. PostgreSQL(psycopg 3)은 COPY, 그 외는 executemany 로 넣고 "
+        "마지막에 일별 잔액/월별 집계를 다시 만듭니다. 같은 --seed 면 같은 데이터 (bench 명령과 함께 사용)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000, help="만들 유저 수")
+        parser.add_argument("--accounts-per-user", type=float, default=2.0, help="유저당 평균 계좌 수 (최소 1)")
+        parser.add_argument("--transactions-per-account", type=float, default=50.0, help="계좌당 평균 거래 수")
+        parser.add_argument("--days", type=int, default=365, help="거래 일시를 흩뿌릴 기간 (오늘까지 N일)")
+        parser.add_argument("--prefix", default="seed", help="이메일/계좌번호 접두어 (영숫자 8자 이하)")
+        parser.add_argument("--password", default="seed-password", help="모든 시드 유저의 비밀번호")
+        parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="한 트랜잭션에서 만들 유저 수")
+        parser.add_argument(
+            "--skip-derived", action="store_true", help="일별 잔액/월별 집계 재계산 생략 (나중에 직접 실행)"
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if not re.fullmatch(r"[A-Za-z0-9]{1,8}", prefix):
+            raise CommandError("--prefix 는 영숫자 8자 이하여야 합니다.")
+        self.email_prefix = f"{prefix.lower()}-"
+        self.number_prefix = prefix.upper()
+
+        self.use_copy = connection.vendor == "postgresql" and _is_psycopg3()
+        self.password_hash = make_password(options["password"])  # 해시는 한 번만 (유저마다 하면 수십 분)
+        self.pick_bank = _Choice(
+            {
+                code: BANK_WEIGHTS.get(code, OTHER_BANK_WEIGHT / (len(BANK_CODES) - len(BANK_WEIGHTS)))
+                for code, _ in BANK_CODES
+            }
+        )
+        self.pick_account_type = _Choice({code: ACCOUNT_TYPE_WEIGHTS.get(code, 1) for code, _ in ACCOUNT_TYPE})
+        self.pick_method = {direction: _Choice(weights) for direction, weights in METHOD_WEIGHTS.items()}
+
+        today = timezone.localdate()
+        self.until = timezone.make_aware(datetime.combine(today, dtime.max))
+        self.span = options["days"] * 86400
+        # 파티션 테이블이면 거래 일시를 흩뿌릴 기간의 월 파티션을 먼저 만듦 (없으면 DEFAULT 파티션에 쌓임)
+        partitions.ensure_partitions(since=self.until - timedelta(seconds=self.span))
+        self.options = options
+
+        # 이미 같은 접두어로 만든 데이터가 있으면 번호를 이어서 붙임 (다시 실행 = N명 추가)
+        user_offset = User.objects.filter(email__startswith=self.email_prefix).count()
+        self.account_offset = Account.objects.filter(account_number__startswith=self.number_prefix).count()
+        rng = random.Random(f"{options['seed']}:{user_offset}")
+
+        started = time.perf_counter()
+        totals = [0, 0, 0]
+        size = options["chunk_size"]
+        for start in range(user_offset, user_offset + options["users"], size):
+            end = min(start + size, user_offset + options["users"])
+            for index, count in enumerate(self._seed_chunk(rng, start, end)):
+                totals[index] += count
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"유저 {totals[0]} / 계좌 {totals[1]} / 거래 {totals[2]} ({elapsed:.1f}초, "
+                f"거래 {totals[2] / elapsed:,.0f}행/초)"
+            )
+
+        if not options["skip_derived"]:
+            self.stdout.write("일별 잔액/월별 집계 재계산 중...")
+            call_command("rebuild_daily_balances", stdout=self.stdout)
+            call_command("rebuild_rollups", stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"완료: {time.perf_counter() - started:.1f}초 ({self.insert_mode})"))
+
+    @property
+    def insert_mode(self):
+        return "COPY" if self.use_copy else "executemany"
+
+    @transaction.atomic
+    def _seed_chunk(self, rng, start, end):
+        now = timezone.now()
+        emails = [f"{self.email_prefix}{index:08d}@seed.local" for index in range(start, end)]
+        self._insert(
+            User,
+            [
+                "email",
+                "password",
+                "nickname",
+                "name",
+                "phone_number",
+                "last_login",
+                "is_staff",
+                "is_active",
+                "is_superuser",
+            ],
+            [
+                (
+                    email,
+                    self.password_hash,
+                    f"user{start + i}",
+                    rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN),
+                    f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}",
+                    now,
+                    False,
+                    True,
+                    False,
+                )
+                for i, email in enumerate(emails)
+            ],
+        )
+        user_ids = list(
+            User.objects.filter(email__range=(emails[0], emails[-1])).order_by("email").values_list("pk", flat=True)
+        )
+        if len(user_ids) != len(emails):
+            raise CommandError(f"{emails[0]} ~ {emails[-1]} 범위에 다른 유저가 섞여 있습니다. (--prefix 변경)")
+
+        # 계좌별 거래를 먼저 만들어 최종 잔액을 구한 뒤 계좌를 넣는다
+        accounts, histories = [], []
+        extra_accounts = self.options["accounts_per_user"] - 1
+        for user_id in user_ids:
+            count = 1 + (int(rng.expovariate(1 / extra_accounts)) if extra_accounts > 0 else 0)
+            for _ in range(count):
+                number = f"{self.number_prefix}{self.account_offset:010d}"
+                self.account_offset += 1
+                history, balance = self._history(rng)
+                accounts.append((number, self.pick_bank(rng), self.pick_account_type(rng), balance, user_id))
+                histories.append(history)
+        self._insert(Account, ["account_number", "bank_code", "account_type", "balance", "user"], accounts)
+        account_ids = list(
+            Account.objects.filter(account_number__range=(accounts[0][0], accounts[-1][0]))
+            .order_by("account_number")
+            .values_list("pk", flat=True)
+        )
+        if len(account_ids) != len(accounts):
+            raise CommandError(
+                f"{accounts[0][0]} ~ {accounts[-1][0]} 범위에 다른 계좌가 섞여 있습니다. --prefix 를 바꿔 주세요."
+            )
+
+        fields = [
+            "transaction_amount",
+            "amount_after_transaction",
+            "account_factor_history",
+            "deposit_and_withdrawal_type",
+            "transaction_type",
+            "transaction_timestamp",
+            "account",
+        ]
+        rows = [row + (account_id,) for account_id, history in zip(account_ids, histories) for row in history]
+        self._insert(Transaction, fields, rows)
+        # DB 를 비우고 다시 넣으면 같은 id 가 재사용되므로 예전 id 로 캐시된 응답을 버리게
+        transaction.on_commit(lambda: versions.bump_many(user_ids))
+        return len(user_ids), len(account_ids), len(rows)
+
+    def _history(self, rng):
+        """계좌 하나의 거래 목록(시간순)과 최종 잔액. 잔액이 모자란 출금은 입금으로 바꾼다."""
+        count = int(rng.expovariate(1 / self.options["transactions_per_account"]))
+        offsets = sorted((rng.random() * self.span for _ in range(count)), reverse=True)
+        balance = Decimal("0")
+        history = []
+        for offset in offsets:
+            direction = "DEPOSIT" if rng.random() < DEPOSIT_RATIO else "WITHDRAW"
+            method = self.pick_method[direction](rng)
+            amount = self._amount(rng, "INTEREST" if method == "INTEREST" else direction)
+            if direction == "WITHDRAW" and amount > balance:
+                direction = "DEPOSIT"
+                method = self.pick_method[direction](rng)
+            balance += amount if direction == "DEPOSIT" else -amount
+            history.append(
+                (
+                    amount,
+                    balance,
+                    f"{METHOD_LABELS[method]} {DIRECTION_LABELS[direction]}",
+                    direction,
+                    method,
+                    self.until - timedelta(seconds=offset),
+                )
+            )
+        return history, balance
+
+    @staticmethod
+    def _amount(rng, kind):
+        mu, sigma = AMOUNT_LOGNORMAL[kind]
+        # 10원 단위, 최소 10원
+        return Decimal(max(int(rng.lognormvariate(mu, sigma)) // 10 * 10, 10))
+
+    def _insert(self, model, fields, rows):
+        if not rows:
+            return
+        table = connection.ops.quote_name(model._meta.db_table)
+        model_fields = [model._meta.get_field(name) for name in fields]
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in model_fields)
+        with connection.cursor() as cursor:
+            if self.use_copy:
+                with cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                return
+            # 일시/금액 컬럼만 DB 값으로 변환 (필드마다 get_db_prep_save 를 부르면 변환이 삽입보다 느림)
+            adapters = {
+                "DateTimeField": connection.ops.adapt_datetimefield_value,
+                "DecimalField": connection.ops.adapt_decimalfield_value,
+            }
+            converters = [
+                (index, adapters[field.get_internal_type()])
+                for index, field in enumerate(model_fields)
+                if field.get_internal_type() in adapters
+            ]
+            if converters:
+                rows = [list(row) for row in rows]
+                for row in rows:
+                    for index, adapt in converters:
+                        row[index] = adapt(row[index])
+            placeholders = ", ".join(["%s"] * len(fields))
+            cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+
+
+def _is_psycopg3():
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return is_psycopg3
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts import outbox
+
+
+class Command(BaseCommand):
+    help = "발송 대기 메일(OutboxEmail)을 배치로 발송하는 워커. 여러 개를 동시에 띄워도 됩니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50, help="한 번에 점유/발송할 메일 수")
+        parser.add_argument("--interval", type=float, default=2.0, help="보낼 메일이 없을 때 대기 시간(초)")
+        parser.add_argument("--once", action="store_true", help="대기 중인 메일을 모두 보내고 종료")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = outbox.process_batch(batch_size)
+                if sent or failed:
+                    self.stdout.write(f"발송 {sent}건, 실패 {failed}건")
+                if sent + failed < batch_size:
+                    # 대기열이 비었음
+                    if options["once"]:
+                        return
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("워커 종료")
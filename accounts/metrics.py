@@ -0,0 +1,259 @@
+import glob
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess
+
+# prometheus_client 멀티프로세스 모드: 워커마다 이 디렉터리에 지표 파일(mmap)을 쓰고, /metrics 는 전부 합산해 응답한다.
+# 디렉터리는 PROMETHEUS_MULTIPROC_DIR 환경 변수로 정해진다 (settings.METRICS_DIR). gunicorn 마스터가 기동할 때 비운다
+METRICS_DIR = settings.METRICS_DIR
+GAUGE_INTERVAL = getattr(settings, "METRICS_GAUGE_INTERVAL", 1.0)
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+os.makedirs(METRICS_DIR, exist_ok=True)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "요청 처리 시간 (미들웨어 기준)",
+    ["view", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "요청 하나에서 실행한 SQL 쿼리 수", ["view"], buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "요청 하나에서 SQL 실행에 쓴 시간", ["view"], buckets=LATENCY_BUCKETS
+)
+REQUEST_SERIALIZER_SECONDS = Histogram(
+    "http_request_serializer_seconds",
+    "요청 하나에서 시리얼라이저(검증 + 직렬화)에 쓴 시간",
+    ["view"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# 게이지는 살아 있는 워커 것만 pid 라벨을 붙여 내보낸다 (죽은 워커 파일은 gunicorn child_exit 에서 정리)
+HASHER_RUNNING = Gauge(
+    "login_hasher_running", "비밀번호 해시 스레드 풀에서 실행 중인 작업 수", multiprocess_mode="liveall"
+)
+HASHER_QUEUE_DEPTH = Gauge(
+    "login_hasher_queue_depth", "비밀번호 해시 스레드 풀 대기열 길이", multiprocess_mode="liveall"
+)
+HASHER_REJECTED = Gauge(
+    "login_hasher_rejected",
+    "대기열이 가득 차 거절한 로그인 수 (프로세스 기동 후 누적)",
+    multiprocess_mode="liveall",
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "커넥션 풀에 열린 커넥션 수", ["database"], multiprocess_mode="liveall")
+DB_POOL_AVAILABLE = Gauge("db_pool_available", "커넥션 풀의 빈 커넥션 수", ["database"], multiprocess_mode="liveall")
+DB_POOL_REQUESTS_WAITING = Gauge(
+    "db_pool_requests_waiting", "커넥션 풀에서 커넥션을 기다리는 요청 수", ["database"], multiprocess_mode="liveall"
+)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "serializer_seconds", "serializer_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+
+# 지금 처리 중인 요청의 집계. sync_to_async 스레드에도 컨텍스트가 복사되므로 async 뷰의 쿼리도 잡힌다
+_current = ContextVar("request_metrics", default=None)
+
+
+def update_gauges():
+    """이 프로세스의 게이지 값을 지표 파일에 쓴다."""
+    # 순환 import 를 피하려고 여기서 가져옴
+    from .dbpool import stats as db_stats
+    from .hashing import hasher_pool
+
+    hasher = hasher_pool.stats()
+    HASHER_RUNNING.set(hasher["running"])
+    HASHER_QUEUE_DEPTH.set(hasher["queue_depth"])
+    HASHER_REJECTED.set(hasher["rejected"])
+    for alias, info in db_stats().items():
+        if isinstance(info, dict) and info.get("mode") == "pool":
+            DB_POOL_SIZE.labels(alias).set(info.get("pool_size", 0))
+            DB_POOL_AVAILABLE.labels(alias).set(info.get("pool_available", 0))
+            DB_POOL_REQUESTS_WAITING.labels(alias).set(info.get("requests_waiting", 0))
+
+
+class _GaugeUpdater:
+    """
+    GAUGE_INTERVAL 마다 게이지를 갱신하는 스레드. 다른 워커가 /metrics 를 응답해도 이 워커의 값이 보이도록.
+
+    fork 로 만들어진 워커는 마스터의 스레드를 물려받지 않으므로 상태를 비우고 다시 띄운다.
+    띄우는 곳은 워커의 post_worker_init 훅뿐이다 (config/gunicorn.conf.py). 요청 처리 경로에서 띄우면
+    마스터의 워밍업 요청(when_ready)이 fork 전에 스레드를 만들어, 스레드가 잡고 있던 락을 물려받은 워커가 멈출 수 있다.
+    훅이 없는 실행(runserver 등)은 /metrics 응답 때 그 프로세스의 값을 바로 갱신한다 (exposition).
+    """
+
+    def __init__(self):
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """이 프로세스의 갱신 스레드를 띄운다 (이미 떠 있으면 무시)."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._update_forever, name="metrics-gauges", daemon=True)
+                self._thread.start()
+
+    def _update_forever(self):
+        while True:
+            try:
+                update_gauges()
+            except Exception:
+                logger.exception("게이지 갱신 실패")
+            time.sleep(GAUGE_INTERVAL)
+
+
+gauges = _GaugeUpdater()
+
+
+def record(view, method, status, elapsed, stats):
+    REQUEST_DURATION.labels(view, method, f"{status // 100}xx").observe(elapsed)
+    REQUEST_DB_QUERIES.labels(view).observe(stats.queries)
+    REQUEST_DB_SECONDS.labels(view).observe(stats.db_seconds)
+    REQUEST_SERIALIZER_SECONDS.labels(view).observe(stats.serializer_seconds)
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match.route or "unnamed"
+
+
+class MetricsMiddleware:
+    """
+    URL 이름별 처리 시간, SQL 쿼리 수 / 시간, 시리얼라이저 시간을 기록한다. MIDDLEWARE 맨 앞에 둔다.
+
+    스트리밍 응답은 본문을 다 보내기 전에 기록되므로 그 뒤의 쿼리는 포함되지 않는다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            _current.reset(token)
+            record(_view_name(request), request.method, status, time.perf_counter() - start, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            _current.reset(token)
+            record(_view_name(request), request.method, status, time.perf_counter() - start, stats)
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - start
+
+
+def _install_execute_wrapper(sender, connection, **kwargs):
+    # 커넥션(스레드별 DatabaseWrapper)마다 한 번만 붙인다. 요청 밖의 쿼리는 그대로 통과
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _timed(method):
+    def wrapper(self, *args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return method(self, *args, **kwargs)
+        # 중첩 호출(ListSerializer → 자식 등)은 바깥 한 번만 잰다
+        stats.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            stats.serializer_depth -= 1
+            if not stats.serializer_depth:
+                stats.serializer_seconds += time.perf_counter() - start
+
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def install():
+    """AccountsConfig.ready() 에서 한 번 호출: 모든 DB 커넥션과 시리얼라이저에 계측을 붙인다."""
+    from rest_framework.serializers import BaseSerializer
+
+    connection_created.connect(_install_execute_wrapper, dispatch_uid="metrics-execute-wrapper")
+    if not hasattr(BaseSerializer.is_valid, "__wrapped__"):
+        BaseSerializer.is_valid = _timed(BaseSerializer.is_valid)
+        BaseSerializer.data = property(_timed(BaseSerializer.data.fget))
+
+
+def clear():
+    """지표 디렉터리를 비운다 (gunicorn 마스터 기동 시)."""
+    for path in glob.glob(os.path.join(METRICS_DIR, "*.db")):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def mark_process_dead(pid):
+    """끝난 워커의 게이지 파일을 지운다 (gunicorn child_exit). 히스토그램은 워커 재시작 때 값이 줄지 않게 남긴다."""
+    multiprocess.mark_process_dead(pid, METRICS_DIR)
+
+
+def exposition():
+    """모든 프로세스의 지표를 합산한 Prometheus 텍스트 포맷."""
+    update_gauges()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, METRICS_DIR)
+    return generate_latest(registry)
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_alter_user_is_active"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["account", "-transaction_timestamp", "-id"], name="txn_account_ts_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["account", "transaction_amount", "id"], name="txn_account_amount_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "transaction_type", "-transaction_timestamp"], name="txn_account_method_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "deposit_and_withdrawal_type", "-transaction_timestamp"],
+                name="txn_account_dir_ts_idx",
+            ),
+        ),
+        # 복합 인덱스가 모두 만들어진 뒤 단일 컬럼 FK 인덱스를 제거
+        migrations.AlterField(
+            model_name="transaction",
+            name="account",
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to="accounts.account"),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_transaction_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyBalance",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField(verbose_name="기준일")),
+                ("closing_balance", models.DecimalField(decimal_places=2, max_digits=18, verbose_name="마감 잔액")),
+                (
+                    "deposit_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name="입금 합계"),
+                ),
+                (
+                    "withdrawal_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name="출금 합계"),
+                ),
+                ("transaction_count", models.PositiveIntegerField(default=0, verbose_name="거래 건수")),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_balances",
+                        to="accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "일별 잔액",
+                "verbose_name_plural": "일별 잔액 목록",
+                "db_table": "daily_balances",
+                "constraints": [
+                    models.UniqueConstraint(fields=("account", "date"), name="daily_balance_account_date_uniq")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_daily_balances"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField(verbose_name="기준월")),
+                (
+                    "transaction_type",
+                    models.CharField(
+                        choices=[
+                            ("ATM", "ATM 거래"),
+                            ("TRANSFER", "계좌이체"),
+                            ("AUTOMATIC_TRANSFER", "자동이체"),
+                            ("CARD", "카드결제"),
+                            ("INTEREST", "이자"),
+                        ],
+                        max_length=20,
+                        verbose_name="거래 타입",
+                    ),
+                ),
+                (
+                    "deposit_and_withdrawal_type",
+                    models.CharField(
+                        choices=[("DEPOSIT", "입금"), ("WITHDRAW", "출금")], max_length=8, verbose_name="입출금 타입"
+                    ),
+                ),
+                ("transaction_count", models.IntegerField(default=0, verbose_name="거래 건수")),
+                (
+                    "total_amount",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name="거래 금액 합계"),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to="accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "월별 거래 집계",
+                "verbose_name_plural": "월별 거래 집계 목록",
+                "db_table": "monthly_rollups",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("account", "month", "transaction_type", "deposit_and_withdrawal_type"),
+                        name="monthly_rollup_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_monthly_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEmail",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("subject", models.CharField(max_length=255, verbose_name="제목")),
+                ("body", models.TextField(verbose_name="본문")),
+                ("from_email", models.CharField(max_length=255, verbose_name="보낸 사람")),
+                ("recipients", models.JSONField(verbose_name="받는 사람 목록")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "발송 대기"),
+                            ("SENDING", "발송 중"),
+                            ("SENT", "발송 완료"),
+                            ("FAILED", "발송 실패"),
+                        ],
+                        default="PENDING",
+                        max_length=10,
+                        verbose_name="상태",
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0, verbose_name="시도 횟수")),
+                (
+                    "available_at",
+                    models.DateTimeField(default=django.utils.timezone.now, verbose_name="발송 가능 시각"),
+                ),
+                ("locked_at", models.DateTimeField(blank=True, null=True, verbose_name="점유 시각")),
+                ("sent_at", models.DateTimeField(blank=True, null=True, verbose_name="발송 시각")),
+                ("last_error", models.TextField(blank=True, verbose_name="마지막 오류")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="생성 일시")),
+            ],
+            options={
+                "verbose_name": "발송 대기 메일",
+                "verbose_name_plural": "발송 대기 메일 목록",
+                "db_table": "outbox_emails",
+                "indexes": [models.Index(fields=["status", "available_at"], name="outbox_status_available_idx")],
+            },
+        ),
+    ]
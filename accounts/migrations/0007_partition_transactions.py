@@ -0,0 +1,85 @@
+from django.db import migrations
+
+from accounts import partitions
+
+# 거래 테이블을 transaction_timestamp 월 단위 RANGE 파티션 테이블로 바꾼다 (PostgreSQL 만, 그 외 DB 는 그대로).
+#
+# - 파티션 테이블의 PK 는 파티션 키를 포함해야 하므로 (id, transaction_timestamp). id 는 계속 시퀀스로 유일하다.
+# - PostgreSQL 16 은 파티션 테이블에 IDENTITY 컬럼을 허용하지 않으므로 id 는 OWNED BY 시퀀스 + DEFAULT nextval.
+# - 모델/인덱스 정의는 바뀌지 않으므로 상태(state) 변경 없이 RunPython 으로만 처리한다.
+# - 기존 행이 있는 달부터 이번 달 + TRANSACTION_PARTITION_MONTHS_AHEAD 까지 파티션을 만들고, 이후에는
+#   migrate 후(post_migrate) / prepare_boot / seed 가 앞으로 쓸 파티션을 채운다.
+
+TABLE = partitions.PARENT
+LEGACY = f"{TABLE}_unpartitioned"
+SEQUENCE = f"{TABLE}_id_seq"
+
+
+def _restore_constraints(apps, schema_editor, primary_key):
+    model = apps.get_model("accounts", "Transaction")
+    quote = schema_editor.quote_name
+    schema_editor.execute(f"ALTER TABLE {quote(TABLE)} ADD PRIMARY KEY ({primary_key})")
+    field = model._meta.get_field("account")
+    schema_editor.execute(schema_editor._create_fk_sql(model, field, "_fk_%(to_table)s_%(to_column)s"))
+    for index in model._meta.indexes:
+        schema_editor.add_index(model, index)
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    using = schema_editor.connection.alias
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(transaction_timestamp), COALESCE(MAX(id), 0) FROM {quote(TABLE)}")
+        oldest, last_id = cursor.fetchone()
+
+    schema_editor.execute(f"ALTER TABLE {quote(TABLE)} RENAME TO {quote(LEGACY)}")
+    schema_editor.execute(
+        f"CREATE TABLE {quote(TABLE)} (LIKE {quote(LEGACY)} INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (transaction_timestamp)"
+    )
+    schema_editor.execute(f"CREATE TABLE {quote(partitions.DEFAULT_PARTITION)} PARTITION OF {quote(TABLE)} DEFAULT")
+    partitions.ensure_partitions(since=oldest, using=using)
+
+    schema_editor.execute(f"INSERT INTO {quote(TABLE)} SELECT * FROM {quote(LEGACY)}")
+    # 인덱스 이름이 겹치므로 옛 테이블(IDENTITY 시퀀스 포함)을 먼저 지운다
+    schema_editor.execute(f"DROP TABLE {quote(LEGACY)}")
+
+    schema_editor.execute(f"CREATE SEQUENCE {quote(SEQUENCE)} OWNED BY {quote(TABLE)}.id")
+    schema_editor.execute("SELECT setval(%s, %s, %s)", [SEQUENCE, max(last_id, 1), last_id > 0])
+    schema_editor.execute(f"ALTER TABLE {quote(TABLE)} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+    _restore_constraints(apps, schema_editor, "id, transaction_timestamp")
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    # 아카이브로 옮긴 달은 되돌리지 않는다 (파일은 그대로 남음)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {quote(TABLE)}")
+        (last_id,) = cursor.fetchone()
+    schema_editor.execute(f"CREATE TABLE {quote(LEGACY)} (LIKE {quote(TABLE)})")
+    schema_editor.execute(f"INSERT INTO {quote(LEGACY)} SELECT * FROM {quote(TABLE)}")
+    # 파티션과 시퀀스(OWNED BY)도 함께 지워진다
+    schema_editor.execute(f"DROP TABLE {quote(TABLE)}")
+    schema_editor.execute(f"ALTER TABLE {quote(LEGACY)} RENAME TO {quote(TABLE)}")
+    schema_editor.execute(f"ALTER TABLE {quote(TABLE)} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    schema_editor.execute(
+        "SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, %s)", [TABLE, max(last_id, 1), last_id > 0]
+    )
+    _restore_constraints(apps, schema_editor, "id")
+
+
+class Migration(migrations.Migration):
+    # 테이블 교체/대량 복사를 한 트랜잭션에서 처리 (실패하면 통째로 되돌림)
+    atomic = True
+
+    dependencies = [
+        ("accounts", "0006_outbox_emails"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
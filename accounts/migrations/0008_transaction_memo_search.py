@@ -0,0 +1,35 @@
+from django.db import migrations
+
+from accounts import search
+
+# 거래 메모(account_factor_history) 검색 인덱스.
+# PostgreSQL: to_tsvector('simple', 메모) GIN 인덱스 (파티션 테이블이면 모든 월 파티션에 만들어짐)
+# SQLite: FTS5 외부 콘텐츠 테이블 + 동기화 트리거
+# DB 별로 다른 객체라 모델 Meta 대신 RunPython 으로 만든다.
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("accounts", "Transaction"), search.memo_index())
+    elif vendor == "sqlite":
+        search.create_fts(schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("accounts", "Transaction"), search.memo_index())
+    elif vendor == "sqlite":
+        search.drop_fts(schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_partition_transactions"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_transaction_memo_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceCheckpoint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("transaction_timestamp", models.DateTimeField(blank=True, null=True, verbose_name="마지막 거래 일시")),
+                ("transaction_id", models.BigIntegerField(blank=True, null=True, verbose_name="마지막 거래")),
+                ("balance", models.DecimalField(decimal_places=2, max_digits=18, verbose_name="잔액")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="생성 일시")),
+            ],
+            options={
+                "verbose_name": "잔액 체크포인트",
+                "verbose_name_plural": "잔액 체크포인트 목록",
+                "db_table": "balance_checkpoints",
+            },
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="reverses",
+            field=models.BigIntegerField(blank=True, null=True, verbose_name="상쇄 대상 거래"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("reverses__isnull", False)),
+                fields=["account", "reverses"],
+                name="txn_account_reverses_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="balancecheckpoint",
+            name="account",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="checkpoints",
+                to="accounts.account",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="balancecheckpoint",
+            index=models.Index(fields=["account", "-id"], name="checkpoint_account_latest_idx"),
+        ),
+    ]
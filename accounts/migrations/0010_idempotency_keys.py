@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:53
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_ledger_checkpoints"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.BinaryField(max_length=32, verbose_name="키 해시")),
+                ("fingerprint", models.BinaryField(max_length=32, verbose_name="요청 해시")),
+                ("status_code", models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="응답 상태")),
+                (
+                    "response",
+                    models.JSONField(
+                        blank=True,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name="응답 본문",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="점유 일시")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "멱등 키",
+                "verbose_name_plural": "멱등 키 목록",
+                "db_table": "idempotency_keys",
+                "indexes": [models.Index(fields=["created_at"], name="idempotency_created_idx")],
+                "constraints": [models.UniqueConstraint(fields=("user", "key"), name="idempotency_user_key_uniq")],
+            },
+        ),
+    ]
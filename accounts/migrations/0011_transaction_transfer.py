@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0010_idempotency_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="transfer",
+            field=models.UUIDField(blank=True, null=True, verbose_name="이체 묶음"),
+        ),
+    ]
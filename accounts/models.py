@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 from accounts.constants import TRANSACTION_METHOD, TRANSACTION_TYPE
 
@@ -68,7 +70,147 @@ class Transaction(models.Model):
     deposit_and_withdrawal_type = models.CharField("입출금 타입", max_length=8, choices=TRANSACTION_TYPE)
     transaction_type = models.CharField("거래 타입", max_length=20, choices=TRANSACTION_METHOD)
     transaction_timestamp = models.DateTimeField("거래 일시", auto_now_add=True)
-    account = models.ForeignKey(Account, on_delete=models.CASCADE)
+    # 단일 컬럼 FK 인덱스 대신 account 로 시작하는 복합 인덱스들이 FK 조회/연쇄 삭제를 함께 처리
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, db_index=False)
+    # 원장 모드에서 수정/삭제 대신 덧붙인 상쇄 거래면 상쇄한 거래의 id (파티션 테이블이라 FK 대신 값만 저장)
+    reverses = models.BigIntegerField("상쇄 대상 거래", null=True, blank=True)
+    # 계좌 이체로 생긴 출금/입금 두 행이 같은 값을 가짐 (posting.transfer_many)
+    transfer = models.UUIDField("이체 묶음", null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 기본 목록: 계좌별 최신순 (키셋 페이지네이션 키와 동일)
+            models.Index(fields=["account", "-transaction_timestamp", "-id"], name="txn_account_ts_idx"),
+            # ?ordering=transaction_amount / min_amount, max_amount 범위 조회
+            models.Index(fields=["account", "transaction_amount", "id"], name="txn_account_amount_idx"),
+            # ?transaction_type= / ?deposit_and_withdrawal_type= 조건 + 최신순
+            models.Index(
+                fields=["account", "transaction_type", "-transaction_timestamp"], name="txn_account_method_ts_idx"
+            ),
+            models.Index(
+                fields=["account", "deposit_and_withdrawal_type", "-transaction_timestamp"],
+                name="txn_account_dir_ts_idx",
+            ),
+            # 원장 모드: 이미 상쇄된 거래인지 확인
+            models.Index(
+                fields=["account", "reverses"],
+                name="txn_account_reverses_idx",
+                condition=models.Q(reverses__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.id} - {self.transaction_type} {self.transaction_amount}"
+
+
+class DailyBalance(models.Model):
+    # 계좌별 일 마감 스냅샷. 거래 쓰기 경로(posting)에서 같은 트랜잭션으로 증분 갱신됨
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="daily_balances")
+    date = models.DateField("기준일")
+    closing_balance = models.DecimalField("마감 잔액", decimal_places=2, max_digits=18)
+    deposit_total = models.DecimalField("입금 합계", decimal_places=2, max_digits=18, default=0)
+    withdrawal_total = models.DecimalField("출금 합계", decimal_places=2, max_digits=18, default=0)
+    transaction_count = models.PositiveIntegerField("거래 건수", default=0)
+
+    class Meta:
+        verbose_name = "일별 잔액"
+        verbose_name_plural = "일별 잔액 목록"
+        db_table = "daily_balances"
+        constraints = [models.UniqueConstraint(fields=["account", "date"], name="daily_balance_account_date_uniq")]
+
+    def __str__(self):
+        return f"{self.account_id} {self.date} {self.closing_balance}"
+
+
+class MonthlyRollup(models.Model):
+    # 계좌 x 월 x 거래 방식 x 입출금 타입 별 합계. 거래 쓰기 경로(posting)에서 같은 트랜잭션으로 증분 갱신됨
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="monthly_rollups")
+    month = models.DateField("기준월")  # 해당 월 1일
+    transaction_type = models.CharField("거래 타입", max_length=20, choices=TRANSACTION_METHOD)
+    deposit_and_withdrawal_type = models.CharField("입출금 타입", max_length=8, choices=TRANSACTION_TYPE)
+    transaction_count = models.IntegerField("거래 건수", default=0)
+    total_amount = models.DecimalField("거래 금액 합계", decimal_places=2, max_digits=20, default=0)
+
+    class Meta:
+        verbose_name = "월별 거래 집계"
+        verbose_name_plural = "월별 거래 집계 목록"
+        db_table = "monthly_rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "month", "transaction_type", "deposit_and_withdrawal_type"],
+                name="monthly_rollup_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.account_id} {self.month:%Y-%m} {self.transaction_type} {self.deposit_and_withdrawal_type}"
+
+
+class BalanceCheckpoint(models.Model):
+    # 원장 모드 잔액 체크포인트: (거래 일시, 거래 id) 위치까지의 잔액. 잔액 = 마지막 체크포인트 + 이후 거래 변화량 합계
+    # 위치가 비어 있으면 거래가 하나도 없던 시점 (이후 = 모든 거래)
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="checkpoints", db_index=False)
+    transaction_timestamp = models.DateTimeField("마지막 거래 일시", null=True, blank=True)
+    transaction_id = models.BigIntegerField("마지막 거래", null=True, blank=True)
+    balance = models.DecimalField("잔액", decimal_places=2, max_digits=18)
+    created_at = models.DateTimeField("생성 일시", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "잔액 체크포인트"
+        verbose_name_plural = "잔액 체크포인트 목록"
+        db_table = "balance_checkpoints"
+        indexes = [models.Index(fields=["account", "-id"], name="checkpoint_account_latest_idx")]
+
+    def __str__(self):
+        return f"{self.account_id} {self.transaction_id} {self.balance}"
+
+
+class IdempotencyKey(models.Model):
+    # POST 재시도 중복 방지 (accounts.idempotency). 키/요청 원문 대신 SHA-256 값만 저장
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
+    key = models.BinaryField("키 해시", max_length=32)
+    fingerprint = models.BinaryField("요청 해시", max_length=32)
+    status_code = models.PositiveSmallIntegerField("응답 상태", null=True, blank=True)  # 비어 있으면 처리 중
+    response = models.JSONField("응답 본문", null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField("점유 일시", default=timezone.now)
+
+    class Meta:
+        verbose_name = "멱등 키"
+        verbose_name_plural = "멱등 키 목록"
+        db_table = "idempotency_keys"
+        constraints = [models.UniqueConstraint(fields=["user", "key"], name="idempotency_user_key_uniq")]
+        indexes = [models.Index(fields=["created_at"], name="idempotency_created_idx")]
+
+    def __str__(self):
+        return f"{self.user_id} {self.key.hex()[:16]} {self.status_code}"
+
+
+class OutboxEmail(models.Model):
+    # 요청 트랜잭션과 함께 저장되고, send_outbox 워커가 배치로 발송하는 메일
+    STATUS_CHOICES = [
+        ("PENDING", "발송 대기"),
+        ("SENDING", "발송 중"),
+        ("SENT", "발송 완료"),
+        ("FAILED", "발송 실패"),
+    ]
+
+    subject = models.CharField("제목", max_length=255)
+    body = models.TextField("본문")
+    from_email = models.CharField("보낸 사람", max_length=255)
+    recipients = models.JSONField("받는 사람 목록")
+    status = models.CharField("상태", max_length=10, choices=STATUS_CHOICES, default="PENDING")
+    attempts = models.PositiveSmallIntegerField("시도 횟수", default=0)
+    available_at = models.DateTimeField("발송 가능 시각", default=timezone.now)
+    locked_at = models.DateTimeField("점유 시각", null=True, blank=True)
+    sent_at = models.DateTimeField("발송 시각", null=True, blank=True)
+    last_error = models.TextField("마지막 오류", blank=True)
+    created_at = models.DateTimeField("생성 일시", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "발송 대기 메일"
+        verbose_name_plural = "발송 대기 메일 목록"
+        db_table = "outbox_emails"
+        indexes = [models.Index(fields=["status", "available_at"], name="outbox_status_available_idx")]
+
+    def __str__(self):
+        return f"{self.id} {self.status} {self.subject}"
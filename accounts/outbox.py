@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+# 워커가 메일을 점유한 채 죽었을 때, 이 시간이 지나면 다른 워커가 다시 가져감
+LEASE_SECONDS = 300
+
+
+def enqueue(subject, message, from_email, recipient_list):
+    """send_mail 과 같은 인자로 발송 대기 메일을 저장한다. 호출한 쪽의 DB 트랜잭션에 함께 묶인다."""
+    return OutboxEmail.objects.create(
+        subject=subject, body=message, from_email=from_email, recipients=list(recipient_list)
+    )
+
+
+def claim(batch_size):
+    """
+    발송할 메일을 batch_size 개까지 점유한다.
+
+    SELECT ... FOR UPDATE SKIP LOCKED 로 다른 워커가 잡고 있는 행은 건너뛰므로 여러 워커를 동시에 띄워도
+    같은 메일을 두 번 보내지 않는다. 점유 표시(SENDING)만 하고 바로 커밋해 락을 오래 잡지 않는다.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="PENDING", available_at__lte=now)
+                | Q(status="SENDING", locked_at__lt=now - timedelta(seconds=LEASE_SECONDS))
+            )
+            .order_by("available_at", "id")[:batch_size]
+        )
+        if messages:
+            OutboxEmail.objects.filter(pk__in=[message.pk for message in messages]).update(
+                status="SENDING", locked_at=now
+            )
+    return messages
+
+
+def deliver(messages, connection=None):
+    """
+    점유한 메일을 SMTP 커넥션 하나로 연달아 보낸다. 실패한 메일은 지수 백오프로 다시 대기시킨다.
+
+    반환값은 (발송 성공 수, 실패 수).
+    """
+    sent = failed = 0
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        # SMTP 서버에 접속하지 못함 → 점유한 메일을 모두 백오프 후 다시 대기시키고 워커는 계속 돈다
+        for message in messages:
+            _retry_later(message, exc)
+        return 0, len(messages)
+    # 이미 열린 커넥션이므로 with 는 닫기만 담당
+    with connection:
+        for message in messages:
+            try:
+                EmailMessage(
+                    subject=message.subject,
+                    body=message.body,
+                    from_email=message.from_email,
+                    to=message.recipients,
+                    connection=connection,
+                ).send()
+            except Exception as exc:
+                failed += 1
+                _retry_later(message, exc)
+            else:
+                sent += 1
+                OutboxEmail.objects.filter(pk=message.pk).update(
+                    status="SENT", sent_at=timezone.now(), attempts=message.attempts + 1, locked_at=None
+                )
+    return sent, failed
+
+
+def process_batch(batch_size=50, connection=None):
+    messages = claim(batch_size)
+    if not messages:
+        return 0, 0
+    return deliver(messages, connection)
+
+
+def _retry_later(message, exc):
+    attempts = message.attempts + 1
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    OutboxEmail.objects.filter(pk=message.pk).update(
+        status="FAILED" if attempts >= MAX_ATTEMPTS else "PENDING",
+        attempts=attempts,
+        available_at=timezone.now() + timedelta(seconds=delay),
+        locked_at=None,
+        last_error=repr(exc)[:2000],
+    )
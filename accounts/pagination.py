@@ -0,0 +1,188 @@
+import heapq
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import cmp_to_key
+from itertools import chain
+from operator import attrgetter
+
+from django.db.models import Q
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    (정렬 필드..., id) 조합을 키로 쓰는 커서 페이지네이션.
+
+    OFFSET 없이 "마지막으로 본 행보다 뒤" 조건(WHERE) + LIMIT 으로 다음 페이지를 읽고,
+    COUNT(*) 도 하지 않는다. 정렬은 OrderingFilter 가 적용된 queryset 의 order_by 를 따르며
+    동률을 끊기 위해 id 를 마지막 키로 덧붙인다.
+    커서는 정렬 키 값과 방향을 담은 JSON 을 base64 로 감싼 불투명 문자열이다.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "유효하지 않은 커서입니다."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.build_page(list(self.get_page_queryset(queryset, request, view)))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """이번 페이지를 읽을 queryset (page_size + 1 행) 을 만든다. 평가는 호출하는 쪽에서."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.size = self.get_page_size(request)
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = bool(self.cursor and self.cursor["r"])
+        ordering = [self._flip(field) for field in self.ordering] if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            queryset = queryset.filter(self._after(ordering, self.cursor["p"]))
+        return queryset[: self.size + 1]
+
+    def build_page(self, rows):
+        reverse = bool(self.cursor and self.cursor["r"])
+        has_more = len(rows) > self.size
+        rows = rows[: self.size]
+        if reverse:
+            rows.reverse()
+
+        # 정방향으로 왔으면 커서가 있다는 것 자체가 앞 페이지가 있다는 뜻, 역방향이면 그 반대
+        self.has_next = has_more if not reverse else True
+        self.has_previous = (self.cursor is not None) if not reverse else has_more
+        self.page = rows
+        return rows
+
+    def merge_page(self, rows, extra_rows):
+        """
+        get_page_queryset 으로 읽은 rows 에 DB 밖의 행(아카이브 등)을 같은 정렬/커서 기준으로 섞어 페이지를 만든다.
+        """
+        reverse = bool(self.cursor and self.cursor["r"])
+        ordering = [self._flip(field) for field in self.ordering] if reverse else self.ordering
+        compare = compare_keys_for(ordering)
+        to_key = cmp_to_key(compare)
+
+        def position(row):
+            return [self._value(row, field) for field in ordering]
+
+        if self.cursor:
+            extra_rows = (row for row in extra_rows if compare(position(row), self.cursor["p"]) > 0)
+        rows = heapq.nsmallest(self.size + 1, chain(rows, extra_rows), key=lambda row: to_key(position(row)))
+        return self.build_page(rows)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = [field for field in queryset.query.order_by or queryset.model._meta.ordering]
+        if any(not isinstance(field, str) for field in ordering):
+            raise ValueError("KeysetPagination 은 필드 이름 기반 정렬만 지원합니다.")
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            # 동률 방지용 id 키는 첫 정렬 키와 같은 방향으로
+            descending = bool(ordering) and ordering[0].startswith("-")
+            ordering.append("-id" if descending else "id")
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, row, reverse):
+        position = [self._dump(self._value(row, field)) for field in self.ordering]
+        payload = json.dumps({"o": self.ordering, "p": position, "r": int(reverse)}, separators=(",", ":"))
+        encoded = urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            cursor = json.loads(urlsafe_b64decode(padded.encode("ascii")))
+            if cursor["o"] != self.ordering or len(cursor["p"]) != len(self.ordering):
+                # 정렬 조건이 바뀌었으면 이전 커서는 쓸 수 없음
+                raise ValueError
+            cursor["p"] = [self._load(field, value) for field, value in zip(self.ordering, cursor["p"])]
+            cursor["r"] = bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def _after(self, ordering, position):
+        # (a, b, id) > (x, y, z) 를 필드별 방향을 반영해 풀어 쓴 조건
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            step = Q(**{f"{name}__{lookup}": position[index]})
+            for previous, value in zip(ordering[:index], position):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+        return condition
+
+    def _value(self, row, field):
+        name = field.lstrip("-")
+        if isinstance(row, dict):
+            return row[name]
+        return attrgetter(name.replace("__", "."))(row)
+
+    def _dump(self, value):
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return value if isinstance(value, (int, float, bool)) or value is None else force_str(value)
+
+    def _load(self, field, value):
+        name = field.lstrip("-")
+        model_field = self.model._meta.get_field("id" if name == "pk" else name)
+        return model_field.to_python(value)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def compare_keys_for(ordering):
+    """ordering(["-a", "b", ...]) 방향대로 정렬 키 값 목록 두 개를 비교하는 cmp 함수 (DB 밖에서 같은 순서로 섞을 때)."""
+    descending = [field.startswith("-") for field in ordering]
+
+    def compare(left, right):
+        for desc, a, b in zip(descending, left, right):
+            if a != b:
+                return (1 if a > b else -1) * (-1 if desc else 1)
+        return 0
+
+    return compare
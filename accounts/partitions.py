@@ -0,0 +1,123 @@
+import re
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+# 거래 테이블(PostgreSQL)은 transaction_timestamp 의 월(현지 시각) 단위 RANGE 파티션.
+# 범위 밖의 행은 DEFAULT 파티션으로 들어가고, 그 달 파티션을 만들 때 옮겨진다.
+PARENT = "accounts_transaction"
+DEFAULT_PARTITION = f"{PARENT}_default"
+MONTHS_AHEAD = getattr(settings, "TRANSACTION_PARTITION_MONTHS_AHEAD", 3)
+
+_NAME = re.compile(rf"^{PARENT}_p(\d{{4}})(\d{{2}})$")
+
+
+def month_start(value):
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date()
+    return value.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARENT}_p{month:%Y%m}"
+
+
+def bounds(month):
+    """그 달 파티션의 [시작, 끝) 경계 (현지 시각 자정)."""
+    start = timezone.make_aware(datetime.combine(month, datetime.min.time()))
+    end = timezone.make_aware(datetime.combine(add_months(month, 1), datetime.min.time()))
+    return start, end
+
+
+def is_partitioned(using="default"):
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [PARENT],
+        )
+        return cursor.fetchone() is not None
+
+
+def live_months(using="default"):
+    """DB 에 붙어 있는 월 파티션 목록 (오래된 순)."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s AND pg_table_is_visible(p.oid)",
+            [PARENT],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return sorted(date(int(match[1]), int(match[2]), 1) for match in map(_NAME.match, names) if match)
+
+
+def ensure_partitions(since=None, months_ahead=MONTHS_AHEAD, using="default"):
+    """
+    since 가 속한 달(기본: 이번 달)부터 months_ahead 달 뒤까지 없는 파티션을 만든다. 만든 달 목록을 돌려준다.
+
+    PostgreSQL 이 아니거나 아직 파티션 테이블이 아니면 아무것도 하지 않는다.
+    migrate 후(post_migrate), prepare_boot, seed 에서 호출되므로 배포할 때마다 앞으로 쓸 파티션이 채워진다.
+    배포 없이 달이 넘어가는 경우는 ensure_partitions 명령(워커)이 주기적으로 채운다.
+    """
+    if not is_partitioned(using):
+        return []
+    current = month_start(timezone.localdate())
+    month = min(month_start(since), current) if since else current
+    last = add_months(current, months_ahead)
+    existing = set(live_months(using))
+
+    created = []
+    while month <= last:
+        if month not in existing:
+            _create_partition(month, using)
+            created.append(month)
+        month = add_months(month, 1)
+    return created
+
+
+def _create_partition(month, using):
+    name, (start, end) = partition_name(month), bounds(month)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    values = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        # DEFAULT 파티션에 그 달 행이 있으면 PARTITION OF 가 실패하므로, 새 테이블로 옮긴 뒤 붙인다
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {quote(DEFAULT_PARTITION)} "
+            "WHERE transaction_timestamp >= %s AND transaction_timestamp < %s)",
+            [start, end],
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"CREATE TABLE {quote(name)} PARTITION OF {quote(PARENT)} {values}")
+            return
+        cursor.execute(f"CREATE TABLE {quote(name)} (LIKE {quote(PARENT)} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} "
+            "WHERE transaction_timestamp >= %s AND transaction_timestamp < %s RETURNING *) "
+            f"INSERT INTO {quote(name)} SELECT * FROM moved",
+            [start, end],
+        )
+        cursor.execute(f"ALTER TABLE {quote(PARENT)} ATTACH PARTITION {quote(name)} {values}")
+
+
+def drop_partition(month, using="default"):
+    """그 달 파티션을 떼어 내고 지운다. 호출하는 쪽의 트랜잭션 안에서 실행된다 (아카이브 파일을 쓴 뒤)."""
+    quote = connections[using].ops.quote_name
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(PARENT)} DETACH PARTITION {quote(partition_name(month))}")
+        cursor.execute(f"DROP TABLE {quote(partition_name(month))}")
+
+
+def on_post_migrate(sender, using="default", **kwargs):
+    ensure_partitions(using=using)
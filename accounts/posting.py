@@ -0,0 +1,318 @@
+import uuid
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import PermissionDenied
+
+from . import balances, ledger, rollups, snapshots
+from .models import Account, Transaction
+
+
+class InsufficientBalance(PermissionDenied):
+    default_detail = "잔액이 부족합니다."
+    default_code = "insufficient_balance"
+
+
+class NotReversible(PermissionDenied):
+    default_detail = "이미 취소된 거래입니다."
+    default_code = "not_reversible"
+
+
+def signed_amount(deposit_or_withdrawal, amount):
+    # 입금은 +, 출금은 - 로 잔액에 반영될 변화량
+    amount = Decimal(amount)
+    return amount if deposit_or_withdrawal == "DEPOSIT" else -amount
+
+
+def apply_delta(account_id, delta, message=None):
+    """
+    잔액을 조건부 UPDATE 한 번으로 반영하고 반영 후 잔액을 돌려준다.
+
+    UPDATE accounts SET balance = balance + delta WHERE id = ? AND balance + delta >= 0
+    이 문장이 계좌 행 락을 잡으므로, 같은 atomic 블록 안에서 이어지는 읽기/쓰기는
+    다른 요청과 섞이지 않는다. 반드시 transaction.atomic() 안에서 호출해야 한다.
+    원장 모드에서는 잔액 컬럼 대신 체크포인트 + 이후 거래로 구한 잔액을 기준으로 한다.
+    """
+    if ledger.LEDGER_MODE:
+        return _apply_ledger_delta(account_id, delta, message)
+
+    queryset = Account.objects.filter(pk=account_id)
+    if delta < 0:
+        # 출금성 변화만 잔액 조건을 건다 (기존 동작과 동일하게 입금은 항상 허용)
+        queryset = queryset.filter(balance__gte=-delta)
+
+    if not queryset.update(balance=F("balance") + delta):
+        raise InsufficientBalance(message)
+
+    return Account.objects.filter(pk=account_id).values_list("balance", flat=True).get()
+
+
+def _apply_ledger_delta(account_id, delta, message):
+    stored = Account.objects.select_for_update().filter(pk=account_id).values_list("balance", flat=True).get()
+    balance = ledger.current_balance(account_id, stored) + delta
+    if delta < 0 and balance < 0:
+        raise InsufficientBalance(message)
+    Account.objects.filter(pk=account_id).update(balance=balance)
+    return balance
+
+
+def post(serializer):
+    """새 거래를 잔액에 반영하고 거래 행을 저장한다."""
+    data = serializer.validated_data
+    delta = signed_amount(data["deposit_and_withdrawal_type"], data["transaction_amount"])
+
+    with transaction.atomic():
+        balance = apply_delta(data["account"].pk, delta)
+        txn = serializer.save(amount_after_transaction=balance)
+        _record(txn, balance)
+        return txn
+
+
+def repost(serializer):
+    """기존 거래의 금액/입출금 타입 변경분만큼 잔액을 보정하고 거래 행을 갱신한다."""
+    if ledger.LEDGER_MODE:
+        return amend(serializer)
+
+    instance = serializer.instance
+    data = serializer.validated_data
+
+    with transaction.atomic():
+        # 동시에 같은 거래를 수정하는 요청이 변화량을 이중 반영하지 않도록 원본을 잠그고 다시 읽는다
+        current = Transaction.objects.select_for_update().get(pk=instance.pk)
+
+        old_effect = signed_amount(current.deposit_and_withdrawal_type, current.transaction_amount)
+        new_effect = signed_amount(
+            data.get("deposit_and_withdrawal_type", current.deposit_and_withdrawal_type),
+            data.get("transaction_amount", current.transaction_amount),
+        )
+
+        balance = apply_delta(current.account_id, new_effect - old_effect, "수정 결과 잔액이 부족합니다.")
+        # 거래 후 잔액은 그 거래 시점 기준: 직전 잔액 + 바뀐 변화량. 이후 거래들의 잔액은 한 번에 다시 계산
+        opening = current.amount_after_transaction - old_effect
+        txn = serializer.save(amount_after_transaction=opening + new_effect)
+        if new_effect != old_effect:
+            balances.recompute(current.account_id, (current.transaction_timestamp, current.pk), opening)
+            ledger.invalidate(current.account_id)
+
+        # 파생 데이터: 원래 거래를 빼고 바뀐 거래를 더함 (과거 날짜 거래면 이후 스냅샷까지 보정됨)
+        _record(current, balance - new_effect, sign=-1)
+        _record(txn, balance)
+        return txn
+
+
+def reverse(instance):
+    """거래의 잔액 영향을 되돌리고 거래 행을 삭제한다."""
+    if ledger.LEDGER_MODE:
+        return cancel(instance)
+
+    with transaction.atomic():
+        current = Transaction.objects.select_for_update().filter(pk=instance.pk).first()
+        if current is None:
+            # 이미 다른 요청이 삭제함
+            return
+
+        effect = signed_amount(current.deposit_and_withdrawal_type, current.transaction_amount)
+        balance = apply_delta(current.account_id, -effect, "해당 거래를 삭제하면 잔액이 음수가 되어 삭제 불가.")
+        _record(current, balance, sign=-1)
+        position = (current.transaction_timestamp, current.pk)
+        current.delete()
+        # 이후 거래들의 거래 후 잔액에서 삭제한 거래의 영향을 뺌
+        balances.recompute(current.account_id, position, current.amount_after_transaction - effect)
+        ledger.invalidate(current.account_id)
+
+
+# 원장 모드 수정으로 바뀔 수 있는 거래 필드. 하나라도 바뀌면 상쇄 거래 + 새 거래를 남김 (메모만 바뀌어도)
+AMENDABLE_FIELDS = ("transaction_amount", "deposit_and_withdrawal_type", "transaction_type", "account_factor_history")
+
+
+def amend(serializer):
+    """
+    원장 모드의 거래 수정: 원래 거래를 상쇄하는 거래와 바뀐 값의 새 거래를 덧붙이고 새 거래를 돌려준다.
+
+    원래 거래 행은 그대로 남는다. serializer.instance 도 새 거래로 바뀌어 응답은 새 거래 기준.
+    """
+    instance = serializer.instance
+    data = serializer.validated_data
+    fields = {name: data.get(name, getattr(instance, name)) for name in AMENDABLE_FIELDS}
+    if all(value == getattr(instance, name) for name, value in fields.items()):
+        return instance
+
+    with transaction.atomic():
+        _check_reversible(instance)
+        replacement = dict(fields)
+        # 늘어나는 쪽을 먼저 덧붙여서 중간 잔액이 음수가 되지 않게 (잔액 검사는 결과적으로 최종 잔액 기준)
+        for entry in sorted([_reversal_of(instance), replacement], key=_effect, reverse=True):
+            txn = _append(instance.account_id, entry, "수정 결과 잔액이 부족합니다.")
+            if entry is replacement:
+                serializer.instance = txn
+        return serializer.instance
+
+
+def cancel(instance):
+    """원장 모드의 거래 삭제: 원래 거래를 상쇄하는 거래를 덧붙인다."""
+    with transaction.atomic():
+        _check_reversible(instance)
+        return _append(
+            instance.account_id, _reversal_of(instance), "해당 거래를 삭제하면 잔액이 음수가 되어 삭제 불가."
+        )
+
+
+def _check_reversible(instance):
+    # 계좌 행 락으로 같은 거래를 동시에 취소하는 요청을 직렬화한 뒤 확인 (거래 행에는 락을 잡지 않음)
+    Account.objects.select_for_update().filter(pk=instance.account_id).values_list("pk").get()
+    if instance.reverses is not None:
+        raise NotReversible("상쇄 거래는 수정하거나 삭제할 수 없습니다.")
+    if Transaction.objects.filter(account_id=instance.account_id, reverses=instance.pk).exists():
+        raise NotReversible()
+
+
+def _reversal_of(txn):
+    return {
+        "transaction_amount": txn.transaction_amount,
+        "deposit_and_withdrawal_type": "WITHDRAW" if txn.deposit_and_withdrawal_type == "DEPOSIT" else "DEPOSIT",
+        "transaction_type": txn.transaction_type,
+        "account_factor_history": f"취소 #{txn.pk} {txn.account_factor_history}".strip()[:255],
+        "reverses": txn.pk,
+    }
+
+
+def _effect(fields):
+    return signed_amount(fields["deposit_and_withdrawal_type"], fields["transaction_amount"])
+
+
+def _append(account_id, fields, message):
+    balance = apply_delta(account_id, _effect(fields), message)
+    txn = Transaction.objects.create(account_id=account_id, amount_after_transaction=balance, **fields)
+    _record(txn, balance)
+    return txn
+
+
+def post_many(rows):
+    """
+    여러 거래를 한 번에 반영한다. rows 는 검증된 validated_data 목록.
+
+    관련 계좌를 pk 순서로 잠근 뒤 행 순서대로 거래 후 잔액을 계산하고,
+    거래 행은 bulk_create 한 번, 잔액은 계좌당 UPDATE 한 번으로 반영한다.
+    반환값은 rows 와 같은 순서의 Transaction 또는 InsufficientBalance 목록.
+    """
+    if not rows:
+        return []
+
+    with transaction.atomic():
+        balances = _lock_accounts({data["account"].pk for data in rows})
+        opening = dict(balances)
+
+        results = []
+        for data in rows:
+            account_id = data["account"].pk
+            delta = signed_amount(data["deposit_and_withdrawal_type"], data["transaction_amount"])
+            if delta < 0 and balances[account_id] + delta < 0:
+                results.append(InsufficientBalance())
+                continue
+            balances[account_id] += delta
+            results.append(Transaction(**data, amount_after_transaction=balances[account_id]))
+
+        _save_entries([result for result in results if isinstance(result, Transaction)], opening, balances)
+
+    return results
+
+
+def transfer_many(transfers):
+    """
+    계좌 이체 여러 건을 한 트랜잭션에서 반영한다. transfers 는 검증된 TransferSerializer.validated_data 목록.
+
+    이체 한 건은 보내는 계좌의 출금 + 받는 계좌의 입금 두 행이며 같은 transfer 값(UUID)으로 묶인다.
+    관련 계좌를 모두 pk 순서로 한 번에 잠그므로, 서로 반대 방향으로 동시에 이체해도 락 순서가 엇갈려 교착되지 않는다.
+    반환값은 transfers 와 같은 순서의 (출금 거래, 입금 거래) 또는 InsufficientBalance 목록.
+    """
+    if not transfers:
+        return []
+
+    with transaction.atomic():
+        balances = _lock_accounts({pk for data in transfers for pk in (data["from_account"].pk, data["to_account"].pk)})
+        opening = dict(balances)
+
+        results, entries = [], []
+        for data in transfers:
+            source, target, amount = data["from_account"], data["to_account"], data["transaction_amount"]
+            if balances[source.pk] < amount:
+                results.append(InsufficientBalance())
+                continue
+            group = uuid.uuid4()
+            memo = data.get("account_factor_history", "")
+            legs = []
+            for account, direction, delta in ((source, "WITHDRAW", -amount), (target, "DEPOSIT", amount)):
+                balances[account.pk] += delta
+                legs.append(
+                    Transaction(
+                        account=account,
+                        deposit_and_withdrawal_type=direction,
+                        transaction_amount=amount,
+                        transaction_type="TRANSFER",
+                        account_factor_history=memo,
+                        amount_after_transaction=balances[account.pk],
+                        transfer=group,
+                    )
+                )
+            entries.extend(legs)
+            results.append(tuple(legs))
+
+        _save_entries(entries, opening, balances)
+
+    return results
+
+
+def _lock_accounts(account_ids):
+    # 계좌 행을 pk 순서로 잠그고 {pk: 잔액} 을 돌려줌 (원장 모드면 원장에서 구한 잔액)
+    balances = dict(
+        Account.objects.select_for_update()
+        .filter(pk__in=sorted(account_ids))
+        .order_by("pk")
+        .values_list("pk", "balance")
+    )
+    if ledger.LEDGER_MODE:
+        balances = {pk: ledger.current_balance(pk, stored) for pk, stored in balances.items()}
+    return balances
+
+
+def _save_entries(entries, opening, balances):
+    """
+    _lock_accounts 로 잠근 계좌들의 새 거래 행을 저장한다.
+
+    거래 행은 bulk_create 한 번, 잔액은 바뀐 계좌당 UPDATE 한 번,
+    일별 스냅샷은 (계좌, 날짜, 입출금 타입), 월별 집계는 (계좌, 월, 거래 방식, 입출금 타입) 묶음당 한 번씩 반영한다.
+    """
+    created = Transaction.objects.bulk_create(entries)
+    for account_id, balance in balances.items():
+        if balance != opening[account_id]:
+            # 계좌 행 락을 잡고 있으므로 balance + 변화량과 같음 (원장 모드면 원장에서 구한 잔액 기준)
+            Account.objects.filter(pk=account_id).update(balance=balance)
+
+    running = dict(opening)
+    daily, monthly = {}, {}
+    for txn in created:
+        direction = txn.deposit_and_withdrawal_type
+        day = timezone.localdate(txn.transaction_timestamp)
+        _accumulate(daily, (txn.account_id, day, direction), txn.transaction_amount)
+        _accumulate(
+            monthly, (txn.account_id, day.replace(day=1), txn.transaction_type, direction), txn.transaction_amount
+        )
+    for (account_id, day, direction), (amount, count) in daily.items():
+        running[account_id] += signed_amount(direction, amount)
+        snapshots.record(account_id, day, direction, amount, count, running[account_id])
+    for (account_id, month, method, direction), (amount, count) in monthly.items():
+        rollups.record(account_id, month, method, direction, amount, count)
+    return created
+
+
+def _record(txn, balance, sign=1):
+    # 거래 행 추가/제거에 딸린 파생 데이터(일별 스냅샷, 월별 집계)를 같은 트랜잭션 안에서 갱신
+    snapshots.record_transaction(txn, balance, sign)
+    rollups.record_transaction(txn, sign)
+
+
+def _accumulate(groups, key, amount):
+    total, count = groups.get(key, (Decimal("0"), 0))
+    groups[key] = (total + amount, count + 1)
@@ -0,0 +1,47 @@
+import csv
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class _Echo:
+    # csv.writer 가 쓴 한 줄을 그대로 돌려받기 위한 가짜 파일 객체
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # 스트리밍이 아닌 응답(에러 등)은 dict 한 건을 헤더 + 한 줄로 렌더링
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows and isinstance(rows[0], dict) else ["detail"]
+        return "".join(self.stream(fields, rows)).encode(self.charset)
+
+    def stream(self, fields, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow([row.get(field, "") for field in fields] if isinstance(row, dict) else [row])
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return "".join(self.stream(None, rows)).encode(self.charset)
+
+    def stream(self, fields, rows):
+        encoder = JSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode(row) + "\n"
@@ -0,0 +1,107 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = "db_pin"
+
+# 이번 요청의 읽기 쿼리를 보낼 DB 별칭. ReplicaReadMixin 이 조회 요청에서만 설정한다
+_read_alias = ContextVar("replica_read_alias", default=None)
+
+
+class ReplicaRouter:
+    """
+    ReplicaReadMixin 이 복제본 읽기를 켠 요청 안에서만 읽기 쿼리를 복제본으로 보낸다.
+    그 밖의 모든 쿼리(쓰기, 다른 뷰, 관리 명령, 워커)는 default(primary).
+    """
+
+    def db_for_read(self, model, **hints):
+        # None 을 돌려주면 Django 가 인스턴스를 읽어 온 DB 를 쓰므로 항상 명시
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        # 복제본에서 읽은 객체를 저장해도 primary 로
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본과 primary 는 같은 데이터
+        return True
+
+
+def read_alias():
+    """이번 요청의 읽기 DB 별칭. 요청 스코프가 끝난 뒤 평가되는 쿼리셋(스트리밍 응답)은 이 값으로 .using() 해 둔다."""
+    return _read_alias.get() or DEFAULT_DB_ALIAS
+
+
+def replica_for(user_id):
+    # 유저마다 항상 같은 복제본 → 복제본끼리 지연이 달라도 요청 사이에 잔액이 되돌아가 보이지 않음
+    replicas = settings.DATABASE_REPLICAS
+    return replicas[user_id % len(replicas)]
+
+
+def _pin_key(user_id):
+    return f"db-pin:{user_id}"
+
+
+def pin(user_id):
+    """user 의 조회를 REPLICA_PIN_SECONDS 동안 primary 에서 하도록 고정. 고정이 끝나는 시각을 돌려준다."""
+    cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+    return time.time() + settings.REPLICA_PIN_SECONDS
+
+
+def is_pinned(request):
+    # 쿠키는 다른 컨테이너(캐시를 공유하지 않는)로 간 다음 요청에서도 고정이 유지되게 함
+    try:
+        if float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    return bool(cache.get(_pin_key(request.user.pk)))
+
+
+@contextmanager
+def request_scope():
+    """요청이 끝나면 읽기 DB 선택을 되돌린다 (같은 스레드/컨텍스트의 다음 요청으로 새지 않게)."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaReadMixin:
+    """
+    DRF 뷰용. 조회 요청은 복제본에서 읽고, 쓰기 요청(POST/PUT/PATCH/DELETE)을 보낸 유저는
+    REPLICA_PIN_SECONDS 동안 primary 에서 읽는다 (read-your-writes). 복제본이 없으면 아무것도 하지 않는다.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with request_scope():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not settings.DATABASE_REPLICAS or not request.user.is_authenticated:
+            return
+        if request.method not in SAFE_METHODS:
+            self.pinned_until = pin(request.user.pk)
+        elif not is_pinned(request):
+            _read_alias.set(replica_for(request.user.pk))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        pinned_until = getattr(self, "pinned_until", None)
+        if pinned_until:
+            response.set_cookie(
+                PIN_COOKIE,
+                f"{pinned_until:.3f}",
+                max_age=math.ceil(settings.REPLICA_PIN_SECONDS),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
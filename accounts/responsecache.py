@@ -0,0 +1,77 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import parse_etags
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from . import versions
+
+RESPONSE_CACHE_TTL = getattr(settings, "RESPONSE_CACHE_TTL", 300)
+_UNCACHED_HEADERS = {"ETag", "Cache-Control", "Content-Length"}
+
+
+class VersionedListCacheMixin:
+    """
+    DRF 뷰용. 목록(list) 응답을 유저별 데이터 버전(accounts.versions) 기준으로 캐시하고 강한 ETag 를 붙인다.
+
+    - If-None-Match 가 현재 ETag 와 같으면 ORM/시리얼라이저 없이 304
+    - 캐시에 렌더링된 응답이 있으면 그대로 반환
+    - 이 뷰로 들어온 쓰기 요청(POST/PUT/PATCH/DELETE)은 처리 전후로 그 유저의 버전을 바꾼다
+      (처리 후에 한 번 더 바꿔서, 처리 도중 옛 버전으로 캐시된 응답이 남지 않게)
+    - 캐시가 워커끼리 공유되지 않으면(settings.SHARED_CACHE=False) 캐시/ETag 없이 매번 새로 만든다
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS and request.user.is_authenticated:
+            self.written_by = request.user.pk
+            versions.bump(self.written_by)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_list_response(request) or super().list(request, *args, **kwargs)
+
+    def get_cached_list_response(self, request):
+        """304 또는 캐시된 응답. 없으면 None 을 돌려주고, 새로 만든 응답은 finalize_response 에서 저장한다."""
+        if not settings.SHARED_CACHE:
+            return None
+        variant = f"{request.build_absolute_uri()}|{request.accepted_media_type}"
+        digest = hashlib.sha256(variant.encode()).hexdigest()[:16]
+        etag = f'"{versions.current(request.user.pk)}.{digest}"'
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=304)
+        else:
+            key = f"list-response:{request.user.pk}:{etag}"
+            cached = cache.get(key)
+            if cached is None:
+                self.list_cache = (key, etag)
+                return None
+            content, headers = cached
+            response = HttpResponse(content)
+            for name, value in headers:
+                response[name] = value
+        self._set_cache_headers(response, etag)
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        list_cache = getattr(self, "list_cache", None)
+        if list_cache and response.status_code == 200:
+            key, etag = list_cache
+            response.render()
+            # 본문과 함께 헤더(Content-Type, Vary, Allow 등)도 저장. ETag/Cache-Control 은 꺼낼 때 다시 붙임
+            headers = [(name, value) for name, value in response.items() if name not in _UNCACHED_HEADERS]
+            cache.set(key, (response.content, headers), RESPONSE_CACHE_TTL)
+            self._set_cache_headers(response, etag)
+        if getattr(self, "written_by", None):
+            versions.bump(self.written_by)
+        return response
+
+    @staticmethod
+    def _set_cache_headers(response, etag):
+        response["ETag"] = etag
+        # 클라이언트가 저장은 하되 쓸 때마다 ETag 로 재검증
+        response["Cache-Control"] = "private, no-cache"
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+# 로컬 블룸 필터를 DB 블랙리스트로부터 다시 만드는 주기(초)
+BLOOM_REBUILD_SECONDS = getattr(settings, "TOKEN_REVOCATION_BLOOM_REBUILD_SECONDS", 60)
+BLOOM_ERROR_RATE = getattr(settings, "TOKEN_REVOCATION_BLOOM_ERROR_RATE", 0.01)
+BUILD_CHUNK_SIZE = 10000
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """jti 문자열 집합용 블룸 필터. 없다고 하면 확실히 없고, 있다고 하면 error_rate 확률로 오답."""
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # 128비트 해시 하나를 둘로 나눠 k 개의 위치를 만든다 (double hashing)
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class _Index:
+    """
+    이 프로세스의 블룸 필터. 백그라운드 스레드가 BLOOM_REBUILD_SECONDS 마다 DB 블랙리스트로 새로 만들어 바꿔 끼운다
+    (블랙리스트 전체를 읽는 작업이 인증 경로에서 일어나지 않음). 첫 필터가 만들어지기 전에는 bloom() 이 None.
+    fork 로 만들어진 워커는 마스터의 필터/스레드를 물려받지 않도록 비운다.
+    """
+
+    def __init__(self):
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._builder = None
+        # 필터를 만드는 동안 mark() 된 jti (DB 에서 읽은 뒤에 폐기됐을 수 있으므로 새 필터에도 넣음)
+        self._building = False
+        self._marked = []
+
+    def bloom(self):
+        self.start()
+        return self._bloom
+
+    def start(self):
+        """이 프로세스의 재생성 스레드를 띄운다 (이미 떠 있으면 무시)."""
+        if self._builder is not None:
+            return
+        with self._lock:
+            if self._builder is None:
+                self._builder = threading.Thread(target=self._rebuild_forever, name="revocation-bloom", daemon=True)
+                self._builder.start()
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            if self._building:
+                self._marked.append(jti)
+
+    def rebuild(self):
+        """DB 블랙리스트로 새 필터를 만들어 바꿔 끼운다 (재생성 스레드에서 호출)."""
+        with self._lock:
+            self._building, self._marked = True, []
+        try:
+            bloom = build()
+            with self._lock:
+                for jti in self._marked:
+                    bloom.add(jti)
+                self._bloom = bloom
+        finally:
+            with self._lock:
+                self._building, self._marked = False, []
+
+    def _rebuild_forever(self):
+        while True:
+            try:
+                self.rebuild()
+            except Exception:
+                # DB 일시 장애 등. 기존 필터(없으면 DB 확인)로 계속 동작하고 다음 주기에 다시 시도
+                logger.exception("토큰 블랙리스트 블룸 필터 재생성 실패")
+            finally:
+                # 다음 재생성까지 쓰지 않는 이 스레드의 DB 커넥션은 닫음 (풀이면 반납)
+                connections.close_all()
+            time.sleep(BLOOM_REBUILD_SECONDS)
+
+
+_index = _Index()
+
+
+def _key(jti):
+    return f"revoked-jti:{jti}"
+
+
+def build():
+    """아직 만료되지 않은 블랙리스트 토큰의 jti 로 블룸 필터를 만든다."""
+    revoked = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+    bloom = BloomFilter(int(revoked.count() * 1.5) + 1000)
+    for jti in revoked.values_list("token__jti", flat=True).iterator(chunk_size=BUILD_CHUNK_SIZE):
+        bloom.add(jti)
+    return bloom
+
+
+def mark(jti, expires_at):
+    """폐기된 jti 를 공유 캐시(만료 시각까지)와 이 프로세스의 블룸 필터에 기록한다. DB 기록은 호출한 쪽에서."""
+    ttl = (expires_at - timezone.now()).total_seconds()
+    if ttl > 0:
+        cache.set(_key(jti), True, math.ceil(ttl))
+    _index.add(jti)
+
+
+def is_revoked(jti):
+    """
+    jti 가 블랙리스트에 있는지 확인한다. 대부분 DB 를 읽지 않는다.
+
+    1. 공유 캐시 표시 - 다른 프로세스에서 방금 폐기한 토큰도 바로 보인다.
+    2. 로컬 블룸 필터가 "없음" 이면 끝. 캐시 표시가 유실됐더라도 다음 재생성(BLOOM_REBUILD_SECONDS) 때 반영된다.
+    3. 블룸 필터가 "있을 수도" 라고 하면 DB 에서 확인 (거짓 양성 대비).
+       프로세스가 뜬 직후 첫 필터가 아직 만들어지지 않았을 때도 DB 에서 확인 (인덱스 조회 한 번).
+
+    캐시가 공유되지 않으면(settings.SHARED_CACHE=False) 다른 프로세스의 폐기가 1 에 보이지 않으므로
+    2 의 "없음" 을 믿지 않고 항상 DB 에서 확인한다.
+    """
+    if cache.get(_key(jti)):
+        return True
+    bloom = _index.bloom()
+    if bloom is not None and jti not in bloom and settings.SHARED_CACHE:
+        return False
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
@@ -0,0 +1,57 @@
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import MonthlyRollup
+
+
+def month_of(timestamp):
+    return timezone.localdate(timestamp).replace(day=1)
+
+
+def record(account_id, month, transaction_type, direction, amount, count):
+    """
+    월별 집계 한 칸에 금액/건수 변화를 더한다. amount/count 는 부호 있는 값(취소/삭제는 음수).
+
+    posting 의 atomic 블록 안, 계좌 행 락을 잡은 상태에서 호출되므로 같은 칸을 동시에 만드는 경합이 없다.
+    """
+    key = {
+        "account_id": account_id,
+        "month": month,
+        "transaction_type": transaction_type,
+        "deposit_and_withdrawal_type": direction,
+    }
+    updated = MonthlyRollup.objects.filter(**key).update(
+        transaction_count=F("transaction_count") + count,
+        total_amount=F("total_amount") + amount,
+    )
+    if not updated:
+        MonthlyRollup.objects.create(**key, transaction_count=count, total_amount=amount)
+
+
+def record_transaction(txn, sign=1):
+    """거래 한 건 추가(sign=1) 또는 제거(sign=-1)를 월별 집계에 반영."""
+    record(
+        txn.account_id,
+        month_of(txn.transaction_timestamp),
+        txn.transaction_type,
+        txn.deposit_and_withdrawal_type,
+        sign * txn.transaction_amount,
+        sign,
+    )
+
+
+def summary(user, account=None, start=None, end=None):
+    """유저(또는 계좌 하나)의 월 x 거래 방식 x 입출금 타입 별 합계."""
+    queryset = MonthlyRollup.objects.filter(account__user=user, transaction_count__gt=0)
+    if account is not None:
+        queryset = queryset.filter(account_id=account)
+    if start is not None:
+        queryset = queryset.filter(month__gte=start.replace(day=1))
+    if end is not None:
+        queryset = queryset.filter(month__lte=end.replace(day=1))
+
+    return (
+        queryset.values("month", "transaction_type", "deposit_and_withdrawal_type")
+        .annotate(transaction_count=Sum("transaction_count"), total_amount=Sum("total_amount"))
+        .order_by("-month", "transaction_type", "deposit_and_withdrawal_type")
+    )
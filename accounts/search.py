@@ -0,0 +1,145 @@
+import re
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchVector, SearchVectorExact
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+from .constants import TRANSACTION_METHOD, TRANSACTION_TYPE
+
+# 거래 검색 (?search=): 검색어마다
+#   - 거래 방식/입출금 타입 코드나 이름에 들어 있으면 해당 코드와 정확히 일치 (인덱스 사용)
+#   - 메모(account_factor_history)의 단어가 검색어로 시작하면 일치
+#     PostgreSQL 은 to_tsvector('simple') GIN 인덱스, SQLite 는 FTS5 테이블로 찾는다 (LIKE '%x%' 전체 스캔 없음)
+# 여러 검색어는 모두 만족해야 한다.
+MEMO_FIELD = "account_factor_history"
+ENUM_FIELDS = {"transaction_type": TRANSACTION_METHOD, "deposit_and_withdrawal_type": TRANSACTION_TYPE}
+
+INDEX_NAME = "txn_memo_search_idx"
+FTS_TABLE = "accounts_transaction_fts"
+_WORD = re.compile(r"\w+")
+
+
+def memo_vector():
+    return SearchVector(MEMO_FIELD, config="simple")
+
+
+def memo_index():
+    """PostgreSQL 메모 검색 인덱스. 조회 쪽과 같은 memo_vector() 식이어야 인덱스를 탄다."""
+    return GinIndex(memo_vector(), name=INDEX_NAME)
+
+
+def enum_codes(term):
+    """검색어가 코드/이름에 들어 있는 {필드: [코드]}."""
+    term = term.casefold()
+    matched = {}
+    for field, choices in ENUM_FIELDS.items():
+        codes = [code for code, label in choices if term in code.casefold() or term in label.casefold()]
+        if codes:
+            matched[field] = codes
+    return matched
+
+
+def term_condition(term, using="default"):
+    condition = Q(pk__in=[])
+    for field, codes in enum_codes(term).items():
+        condition |= Q(**{f"{field}__in": codes})
+
+    words = [word.casefold() for word in _WORD.findall(term)]
+    if not words:
+        return condition
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        query = " & ".join(f"'{word}':*" for word in words)
+        condition |= Q(SearchVectorExact(memo_vector(), SearchQuery(query, search_type="raw", config="simple")))
+    elif vendor == "sqlite":
+        query = " AND ".join(f'"{word}"*' for word in words)
+        condition |= Q(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]))
+    else:
+        for word in words:
+            condition |= Q(**{f"{MEMO_FIELD}__icontains": word})
+    return condition
+
+
+def term_matches(txn, term):
+    """DB 밖의 거래(아카이브 등)에 term_condition 과 같은 기준을 적용."""
+    if any(getattr(txn, field) in codes for field, codes in enum_codes(term).items()):
+        return True
+    words = [word.casefold() for word in _WORD.findall(term)]
+    memo = [word.casefold() for word in _WORD.findall(getattr(txn, MEMO_FIELD))]
+    return bool(words) and all(any(token.startswith(word) for token in memo) for word in words)
+
+
+def filter_terms(queryset, terms):
+    for term in terms:
+        queryset = queryset.filter(term_condition(term, queryset.db))
+    return queryset
+
+
+class TransactionSearchFilter(SearchFilter):
+    """search_fields 의 icontains 대신 위 규칙으로 거래를 검색하는 필터 백엔드."""
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_terms(queryset, self.get_search_terms(request))
+
+
+# ---- SQLite FTS5 ----
+# 외부 콘텐츠 FTS5 테이블 + 트리거로 거래 테이블과 동기화. SQLite 는 컬럼 변경 마이그레이션 때 테이블을 다시 만들면서
+# 트리거가 사라지므로 migrate 후마다 확인해 다시 만들고 색인을 재구성한다.
+_FTS_TRIGGERS = {
+    f"{FTS_TABLE}_ai": (
+        "AFTER INSERT ON accounts_transaction BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {MEMO_FIELD}) VALUES (new.id, new.{MEMO_FIELD}); END"
+    ),
+    f"{FTS_TABLE}_ad": (
+        "AFTER DELETE ON accounts_transaction BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {MEMO_FIELD}) VALUES ('delete', old.id, old.{MEMO_FIELD}); END"
+    ),
+    f"{FTS_TABLE}_au": (
+        f"AFTER UPDATE OF {MEMO_FIELD} ON accounts_transaction BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {MEMO_FIELD}) VALUES ('delete', old.id, old.{MEMO_FIELD}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {MEMO_FIELD}) VALUES (new.id, new.{MEMO_FIELD}); END"
+    ),
+}
+
+
+def _sqlite_objects(cursor, kind):
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = %s", [kind])
+    return {row[0] for row in cursor.fetchall()}
+
+
+def create_fts(using="default"):
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{MEMO_FIELD}, content='accounts_transaction', content_rowid='id')"
+        )
+    repair_fts(using, force=True)
+
+
+def repair_fts(using="default", force=False):
+    """빠진 트리거를 다시 만들고 색인을 재구성한다. FTS 테이블이 없으면 (마이그레이션 전/되돌린 뒤) 아무것도 안 함."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        if FTS_TABLE not in _sqlite_objects(cursor, "table"):
+            return
+        missing = set(_FTS_TRIGGERS) - _sqlite_objects(cursor, "trigger")
+        for name in missing:
+            cursor.execute(f"CREATE TRIGGER {name} {_FTS_TRIGGERS[name]}")
+        if missing or force:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_fts(using="default"):
+    with connections[using].cursor() as cursor:
+        for name in _FTS_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def on_post_migrate(sender, using="default", **kwargs):
+    repair_fts(using)
@@ -1,9 +1,12 @@
+from decimal import Decimal
+
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 
 from accounts.models import Transaction, User
 
 from .models import Account
+from .tokens import RevocableRefreshToken
 
 
 class UserSignUpSerializer(serializers.ModelSerializer):
@@ -43,6 +46,8 @@ class TransactionSerializer(serializers.ModelSerializer):
             "transaction_type",  # 거래 방식(이체, ATM 등)
             "transaction_timestamp",  # 거래 일시 (조회 시 필수)
             "account",  # account (생성/수정 시 계좌 PK로 전달)
+            "reverses",  # 원장 모드에서 수정/삭제로 생긴 상쇄 거래면 상쇄한 거래 id (조회 전용)
+            "transfer",  # 계좌 이체의 출금/입금 행을 묶는 값 (조회 전용)
         ]
         read_only_fields = [
             "id",
@@ -50,6 +55,8 @@ class TransactionSerializer(serializers.ModelSerializer):
             "account_number",
             "amount_after_transaction",
             "transaction_timestamp",
+            "reverses",
+            "transfer",
         ]
 
         def validate_transaction_amount(self, value):
@@ -58,6 +65,46 @@ class TransactionSerializer(serializers.ModelSerializer):
             return value
 
 
+class OwnedAccountField(serializers.PrimaryKeyRelatedField):
+    # 일괄 등록 시 행마다 계좌를 조회하지 않도록, 미리 읽어 둔 본인 계좌(context["accounts"])에서 찾음
+    def to_internal_value(self, data):
+        try:
+            return self.context["accounts"][int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class BulkTransactionSerializer(TransactionSerializer):
+    account = OwnedAccountField(queryset=Account.objects.all())
+
+
+class TransferSerializer(serializers.Serializer):
+    # 보내는 계좌는 본인 계좌(context["accounts"])에서, 받는 계좌는 계좌번호로 찾음
+    # (일괄 이체는 미리 읽어 둔 context["recipients"] 에서)
+    transfer = serializers.UUIDField(read_only=True)
+    from_account = OwnedAccountField(queryset=Account.objects.all())
+    to_account_number = serializers.CharField(max_length=20)
+    transaction_amount = serializers.DecimalField(max_digits=18, decimal_places=2, min_value=Decimal("0.01"))
+    account_factor_history = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+    withdrawal = TransactionSerializer(read_only=True)  # 보내는 계좌의 출금 거래
+
+    def validate(self, attrs):
+        number = attrs["to_account_number"]
+        recipients = self.context.get("recipients")
+        if recipients is not None:
+            target = recipients.get(number)
+        else:
+            target = Account.objects.filter(account_number=number).first()
+        if target is None:
+            raise serializers.ValidationError({"to_account_number": "존재하지 않는 계좌번호입니다."})
+        if target.pk == attrs["from_account"].pk:
+            raise serializers.ValidationError({"to_account_number": "같은 계좌로는 이체할 수 없습니다."})
+        attrs["to_account"] = target
+        return attrs
+
+
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True)
 
@@ -89,7 +136,58 @@ class AccountSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user_email"]
 
 
+class AccountStatementQuerySerializer(serializers.Serializer):
+    def get_fields(self):
+        # "from" 은 파이썬 예약어라 클래스 속성으로 선언할 수 없어서 여기서 추가
+        fields = super().get_fields()
+        fields["from"] = serializers.DateField(required=False)
+        fields["to"] = serializers.DateField(required=False)
+        return fields
+
+
+class AccountStatementSerializer(serializers.Serializer):
+    account_number = serializers.CharField()
+    opening_balance = serializers.DecimalField(max_digits=18, decimal_places=2)  # 기간 시작 시점 잔액
+    closing_balance = serializers.DecimalField(max_digits=18, decimal_places=2)  # 기간 마지막 날 마감 잔액
+    total_deposits = serializers.DecimalField(max_digits=18, decimal_places=2)
+    total_withdrawals = serializers.DecimalField(max_digits=18, decimal_places=2)
+    transaction_count = serializers.IntegerField()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields["from"] = serializers.DateField()
+        fields["to"] = serializers.DateField()
+        return fields
+
+
+class TransactionSummaryQuerySerializer(serializers.Serializer):
+    account = serializers.IntegerField(required=False)
+
+    def get_fields(self):
+        # ?from=2025-01&to=2025-06 (월 단위)
+        fields = super().get_fields()
+        fields["from"] = serializers.DateField(required=False, input_formats=["%Y-%m"])
+        fields["to"] = serializers.DateField(required=False, input_formats=["%Y-%m"])
+        return fields
+
+
+class TransactionSummarySerializer(serializers.Serializer):
+    month = serializers.DateField(format="%Y-%m")
+    transaction_type = serializers.CharField()
+    deposit_and_withdrawal_type = serializers.CharField()
+    transaction_count = serializers.IntegerField()
+    total_amount = serializers.DecimalField(max_digits=20, decimal_places=2)
+
+
+class LoginSerializer(serializers.Serializer):
+    # async 로그인 입력 검증용 (인증 자체는 views.async_login 에서)
+    email = serializers.CharField()
+    password = serializers.CharField(trim_whitespace=False)
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RevocableRefreshToken
+
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
@@ -97,3 +195,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token["email"] = user.email
         token["nickname"] = user.nickname
         return token
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    # 블랙리스트 확인을 DB 조인 대신 revocation 인덱스로
+    token_class = RevocableRefreshToken
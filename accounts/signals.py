@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import usercache, versions
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # 프로필 수정/탈퇴/이메일 인증(is_active)/관리자 수정 등 유저가 바뀌면 인증 캐시를 비움
+    # 커밋 전에 다른 요청이 옛 값을 다시 캐시에 넣을 수 있으므로 커밋 후에도 한 번 더 지움
+    user_id = instance.pk
+    usercache.invalidate(user_id)
+    transaction.on_commit(lambda: usercache.invalidate(user_id))
+
+
+@receiver(post_save, sender=User)
+def bump_data_version(sender, instance, **kwargs):
+    # 계좌/거래 목록 응답에 user_email 이 들어가므로 유저 정보가 바뀌면 캐시된 목록도 무효
+    versions.bump(instance.pk)
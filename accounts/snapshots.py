@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import DailyBalance
+
+ZERO = Decimal("0")
+
+
+def record(account_id, day, direction, amount, count, balance):
+    """
+    day 의 스냅샷에 거래 변화를 반영한다. amount/count 는 부호 있는 값(취소/삭제는 음수).
+
+    day 이후의 모든 스냅샷 마감 잔액도 같은 변화량만큼 옮겨 주므로 과거 거래의 수정/삭제도 반영된다.
+    balance 는 이번 변화까지 반영된 계좌의 현재 잔액 (day 이후 스냅샷이 하나도 없을 때 기준값으로 사용).
+    posting 의 atomic 블록 안, 계좌 행 락을 잡은 상태에서 호출된다.
+    """
+    deposit = amount if direction == "DEPOSIT" else ZERO
+    withdrawal = ZERO if direction == "DEPOSIT" else amount
+    net = deposit - withdrawal
+
+    updated = DailyBalance.objects.filter(account_id=account_id, date=day).update(
+        closing_balance=F("closing_balance") + net,
+        deposit_total=F("deposit_total") + deposit,
+        withdrawal_total=F("withdrawal_total") + withdrawal,
+        transaction_count=F("transaction_count") + count,
+    )
+    if net:
+        DailyBalance.objects.filter(account_id=account_id, date__gt=day).update(
+            closing_balance=F("closing_balance") + net
+        )
+    if updated:
+        return
+
+    # 그날 첫 거래: 직전 스냅샷 마감 잔액에서 이어가거나, 없으면 다음 스냅샷의 개시 잔액(=그날 마감)을 쓴다
+    previous = (
+        DailyBalance.objects.filter(account_id=account_id, date__lt=day)
+        .order_by("-date")
+        .values_list("closing_balance", flat=True)
+        .first()
+    )
+    if previous is not None:
+        closing = previous + net
+    else:
+        following = DailyBalance.objects.filter(account_id=account_id, date__gt=day).order_by("date").first()
+        closing = _opening(following) if following else balance
+
+    DailyBalance.objects.create(
+        account_id=account_id,
+        date=day,
+        closing_balance=closing,
+        deposit_total=deposit,
+        withdrawal_total=withdrawal,
+        transaction_count=count,
+    )
+
+
+def record_transaction(txn, balance, sign=1):
+    """거래 한 건 추가(sign=1) 또는 제거(sign=-1)를 스냅샷에 반영."""
+    record(
+        txn.account_id,
+        timezone.localdate(txn.transaction_timestamp),
+        txn.deposit_and_withdrawal_type,
+        sign * txn.transaction_amount,
+        sign,
+        balance,
+    )
+
+
+def statement(account, start, end):
+    """
+    start~end (날짜 포함) 기간의 개시/마감 잔액과 입출금 합계.
+
+    기간 직전 스냅샷 한 건과 기간 안의 스냅샷 합계만 읽는다.
+    """
+    previous = DailyBalance.objects.filter(account=account, date__lt=start).order_by("-date").first()
+    if previous is not None:
+        opening = previous.closing_balance
+    else:
+        first = DailyBalance.objects.filter(account=account, date__gte=start).order_by("date").first()
+        opening = _opening(first) if first else account.balance
+
+    totals = DailyBalance.objects.filter(account=account, date__range=(start, end)).aggregate(
+        deposits=Sum("deposit_total"),
+        withdrawals=Sum("withdrawal_total"),
+        count=Sum("transaction_count"),
+    )
+    deposits = totals["deposits"] or ZERO
+    withdrawals = totals["withdrawals"] or ZERO
+
+    return {
+        "account_number": account.account_number,
+        "from": start,
+        "to": end,
+        "opening_balance": opening,
+        "closing_balance": opening + deposits - withdrawals,
+        "total_deposits": deposits,
+        "total_withdrawals": withdrawals,
+        "transaction_count": totals["count"] or 0,
+    }
+
+
+def _opening(snapshot):
+    return snapshot.closing_balance - snapshot.deposit_total + snapshot.withdrawal_total
@@ -1 +1,1917 @@
-# Create your tests here.
+import csv
+import json
+import os
+import random
+import re
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from itertools import combinations
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from django.contrib.auth.signals import user_login_failed
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.functions import Mod
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from config.warmup import warm_up
+
+from . import (
+    balances,
+    idempotency,
+    ingest,
+    ledger,
+    metrics,
+    outbox,
+    partitions,
+    posting,
+    replicas,
+    revocation,
+    rollups,
+    usercache,
+    versions,
+)
+from .authentication import CachedJWTAuthentication
+from .constants import TRANSACTION_METHOD, TRANSACTION_TYPE
+from .filters import TransactionFilter
+from .models import Account, DailyBalance, IdempotencyKey, MonthlyRollup, OutboxEmail, Transaction, User
+from .search import filter_terms
+from .serializers import CustomTokenObtainPairSerializer
+from .tokens import RevocableAccessToken, RevocableRefreshToken
+from .views import EXPORT_COLUMNS
+
+
+class AccountsMixin:
+    # 테스트용 유저/계좌 만들기 + 인증된 APIClient
+    def make_user(self, email="owner@test.local"):
+        return User.objects.create_user(email=email, password="pw", nickname="n", name="n", is_active=True)
+
+    def make_account(self, user, number="1000", balance="0.00"):
+        return Account.objects.create(
+            account_number=number, bank_code="004", account_type="CHECKING", balance=Decimal(balance), user=user
+        )
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def setUp(self):
+        super().setUp()
+        # 목록 캐시/데이터 버전/유저 캐시가 다른 테스트의 같은 pk 로 새지 않게
+        cache.clear()
+
+
+# =========================
+# 잔액 반영 (accounts.posting)
+# =========================
+class PostingTests(AccountsMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user, balance="100.00")
+        self.client = self.client_for(self.user)
+
+    def post(self, direction, amount, at=None):
+        # at: 거래 일시 (auto_now_add 라 그 시각에 요청한 것처럼 timezone.now 를 바꿔서)
+        with mock.patch("django.utils.timezone.now", return_value=at or timezone.now()):
+            response = self.client.post(
+                reverse("transaction-list"),
+                {
+                    "account": self.account.pk,
+                    "deposit_and_withdrawal_type": direction,
+                    "transaction_amount": amount,
+                    "transaction_type": "ATM",
+                    "account_factor_history": "test",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        return Transaction.objects.get(pk=response.data["id"])
+
+    def assertBalance(self, expected):
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal(expected))
+
+    def test_overdraw_is_rejected_without_changing_balance(self):
+        response = self.client.post(
+            reverse("transaction-list"),
+            {
+                "account": self.account.pk,
+                "deposit_and_withdrawal_type": "WITHDRAW",
+                "transaction_amount": "100.01",
+                "transaction_type": "ATM",
+                "account_factor_history": "test",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertBalance("100.00")
+        self.assertFalse(Transaction.objects.filter(account=self.account).exists())
+
+    def test_update_applies_only_the_difference(self):
+        txn = self.post("DEPOSIT", "50.00")
+        self.assertBalance("150.00")
+
+        url = reverse("transaction-detail", args=[txn.pk])
+        response = self.client.patch(url, {"transaction_amount": "20.00"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertBalance("120.00")
+        self.assertEqual(response.data["amount_after_transaction"], "120.00")
+
+        # 입금 20 → 출금 20: -40
+        response = self.client.patch(url, {"deposit_and_withdrawal_type": "WITHDRAW"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertBalance("80.00")
+        self.assertEqual(response.data["amount_after_transaction"], "80.00")
+
+    def test_update_that_would_overdraw_is_rejected(self):
+        txn = self.post("WITHDRAW", "60.00")
+
+        response = self.client.patch(
+            reverse("transaction-detail", args=[txn.pk]), {"transaction_amount": "150.00"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertBalance("40.00")
+        txn.refresh_from_db()
+        self.assertEqual(txn.transaction_amount, Decimal("60.00"))
+
+    def test_delete_reverses_the_effect(self):
+        deposit = self.post("DEPOSIT", "30.00")
+        withdrawal = self.post("WITHDRAW", "50.00")
+        self.assertBalance("80.00")
+
+        self.assertEqual(self.client.delete(reverse("transaction-detail", args=[withdrawal.pk])).status_code, 204)
+        self.assertBalance("130.00")
+        self.assertEqual(self.client.delete(reverse("transaction-detail", args=[deposit.pk])).status_code, 204)
+        self.assertBalance("100.00")
+        self.assertFalse(Transaction.objects.filter(account=self.account).exists())
+
+    def test_delete_that_would_overdraw_is_rejected(self):
+        deposit = self.post("DEPOSIT", "50.00")
+        self.post("WITHDRAW", "120.00")
+
+        response = self.client.delete(reverse("transaction-detail", args=[deposit.pk]))
+
+        self.assertEqual(response.status_code, 403)
+        self.assertBalance("30.00")
+        self.assertTrue(Transaction.objects.filter(pk=deposit.pk).exists())
+
+    def test_backdated_edit_recomputes_later_running_balances(self):
+        now = timezone.now()
+        first = self.post("DEPOSIT", "10.00", at=now - timedelta(days=3))
+        second = self.post("WITHDRAW", "30.00", at=now - timedelta(days=2))
+        third = self.post("DEPOSIT", "5.00", at=now - timedelta(days=1))
+
+        response = self.client.patch(
+            reverse("transaction-detail", args=[first.pk]), {"transaction_amount": "40.00"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertBalance("115.00")
+        running = dict(Transaction.objects.filter(account=self.account).values_list("pk", "amount_after_transaction"))
+        self.assertEqual(
+            running, {first.pk: Decimal("140.00"), second.pk: Decimal("110.00"), third.pk: Decimal("115.00")}
+        )
+
+        # 과거 거래 삭제도 이후 거래 후 잔액에서 빠짐
+        self.assertEqual(self.client.delete(reverse("transaction-detail", args=[first.pk])).status_code, 204)
+        self.assertBalance("75.00")
+        running = dict(Transaction.objects.filter(account=self.account).values_list("pk", "amount_after_transaction"))
+        self.assertEqual(running, {second.pk: Decimal("70.00"), third.pk: Decimal("75.00")})
+
+    def test_chunked_recompute_matches_row_by_row_replay(self):
+        now = timezone.now()
+        # 같은 일시 묶음(동률은 id 순)과 id 순서와 다른 일시 순서가 청크 경계에 걸치게
+        moments = [now - timedelta(days=day) for day in (2, 5, 2, 9, 5, 5, 1, 9, 2, 7, 3)]
+        for index, at in enumerate(moments):
+            with mock.patch("django.utils.timezone.now", return_value=at):
+                Transaction.objects.create(
+                    account=self.account,
+                    transaction_amount=Decimal(f"{index + 1}.25"),
+                    amount_after_transaction=Decimal("-1.00"),
+                    account_factor_history="test",
+                    deposit_and_withdrawal_type="WITHDRAW" if index % 3 == 0 else "DEPOSIT",
+                    transaction_type="ATM",
+                )
+        ordered = list(Transaction.objects.filter(account=self.account).order_by("transaction_timestamp", "id"))
+
+        def replay(rows, opening):
+            expected, running = {}, opening
+            for txn in rows:
+                running += posting.signed_amount(txn.deposit_and_withdrawal_type, txn.transaction_amount)
+                expected[txn.pk] = running
+            return expected
+
+        def stored():
+            return dict(Transaction.objects.filter(account=self.account).values_list("pk", "amount_after_transaction"))
+
+        for chunk_size in (1, 2, 3, 4, len(ordered)):
+            with self.subTest(chunk_size=chunk_size):
+                Transaction.objects.filter(account=self.account).update(amount_after_transaction=Decimal("-1.00"))
+                changed = balances.recompute(self.account.pk, None, Decimal("50.00"), chunk_size=chunk_size)
+                self.assertEqual(changed, len(ordered))
+                self.assertEqual(stored(), replay(ordered, Decimal("50.00")))
+
+                # 중간 행부터: 그 앞 행은 그대로, 뒤는 직전 행 잔액부터 이어서
+                middle = ordered[5]
+                expected = stored()
+                Transaction.objects.filter(pk__in=[txn.pk for txn in ordered[5:]]).update(
+                    amount_after_transaction=Decimal("-1.00")
+                )
+                position = (middle.transaction_timestamp, middle.pk)
+                balances.recompute(self.account.pk, position, expected[ordered[4].pk], chunk_size=chunk_size)
+                self.assertEqual(stored(), expected)
+
+    def statement(self, start, end):
+        response = self.client.get(
+            reverse("account-statement", args=[self.account.pk]), {"from": start.isoformat(), "to": end.isoformat()}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        fields = ("opening_balance", "closing_balance", "total_deposits", "total_withdrawals")
+        return [response.data[field] for field in fields] + [response.data["transaction_count"]]
+
+    def test_statement_follows_backdated_edit_and_delete(self):
+        now = timezone.now()
+        first = self.post("DEPOSIT", "10.00", at=now - timedelta(days=3))
+        self.post("WITHDRAW", "30.00", at=now - timedelta(days=2))
+        self.post("DEPOSIT", "5.00", at=now - timedelta(days=1))
+        today = timezone.localdate()
+        day3, day2 = timezone.localdate(now - timedelta(days=3)), timezone.localdate(now - timedelta(days=2))
+
+        self.assertEqual(self.statement(day3, day3), ["100.00", "110.00", "10.00", "0.00", 1])
+        self.assertEqual(self.statement(day2, today), ["110.00", "85.00", "5.00", "30.00", 2])
+
+        # 과거 거래 수정: 그날과 이후 기간의 개시/마감 잔액이 함께 옮겨감
+        url = reverse("transaction-detail", args=[first.pk])
+        self.assertEqual(self.client.patch(url, {"transaction_amount": "40.00"}, format="json").status_code, 200)
+        self.assertEqual(self.statement(day3, day3), ["100.00", "140.00", "40.00", "0.00", 1])
+        self.assertEqual(self.statement(day2, today), ["140.00", "115.00", "5.00", "30.00", 2])
+
+        # 입금 → 출금으로 바꿔도 같은 규칙
+        self.assertEqual(
+            self.client.patch(url, {"deposit_and_withdrawal_type": "WITHDRAW"}, format="json").status_code, 200
+        )
+        self.assertEqual(self.statement(day3, day3), ["100.00", "60.00", "0.00", "40.00", 1])
+        self.assertEqual(self.statement(day2, today), ["60.00", "35.00", "5.00", "30.00", 2])
+
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.statement(day3, day3), ["100.00", "100.00", "0.00", "0.00", 0])
+        self.assertEqual(self.statement(day3 - timedelta(days=1), today), ["100.00", "75.00", "5.00", "30.00", 2])
+        self.assertBalance("75.00")
+
+    def summary(self, **params):
+        response = self.client.get(reverse("transaction-summary"), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return {
+            (row["month"], row["transaction_type"], row["deposit_and_withdrawal_type"]): (
+                row["transaction_count"],
+                row["total_amount"],
+            )
+            for row in response.data["results"]
+        }
+
+    def from_transactions(self):
+        # 같은 집계를 거래 테이블에서 직접 계산 (MonthlyRollup 이 어긋나지 않았는지 비교용)
+        cells = {}
+        for txn in Transaction.objects.filter(account=self.account):
+            key = (
+                f"{timezone.localdate(txn.transaction_timestamp):%Y-%m}",
+                txn.transaction_type,
+                txn.deposit_and_withdrawal_type,
+            )
+            count, total = cells.get(key, (0, Decimal("0")))
+            cells[key] = (count + 1, total + txn.transaction_amount)
+        return {key: (count, f"{total:.2f}") for key, (count, total) in cells.items()}
+
+    def test_summary_follows_post_edit_and_delete(self):
+        now = timezone.now()
+        earlier = now - timedelta(days=40)
+        this_month, last_month = f"{timezone.localdate(now):%Y-%m}", f"{timezone.localdate(earlier):%Y-%m}"
+        old = self.post("DEPOSIT", "10.00", at=earlier)
+        self.post("DEPOSIT", "20.00")
+        recent = self.post("WITHDRAW", "5.00")
+
+        self.assertEqual(
+            self.summary(),
+            {
+                (this_month, "ATM", "DEPOSIT"): (1, "20.00"),
+                (this_month, "ATM", "WITHDRAW"): (1, "5.00"),
+                (last_month, "ATM", "DEPOSIT"): (1, "10.00"),
+            },
+        )
+        self.assertEqual(
+            self.summary(**{"from": this_month}),
+            {
+                (this_month, "ATM", "DEPOSIT"): (1, "20.00"),
+                (this_month, "ATM", "WITHDRAW"): (1, "5.00"),
+            },
+        )
+
+        # 금액/거래 방식을 바꾸면 원래 칸에서 빠지고 새 칸에 더해짐
+        url = reverse("transaction-detail", args=[old.pk])
+        response = self.client.patch(url, {"transaction_amount": "15.00", "transaction_type": "CARD"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.summary(**{"to": last_month}), {(last_month, "CARD", "DEPOSIT"): (1, "15.00")})
+        self.assertEqual(self.summary(), self.from_transactions())
+
+        # 삭제한 거래의 칸은 건수 0 이 되어 요약에서 빠짐
+        self.assertEqual(self.client.delete(reverse("transaction-detail", args=[recent.pk])).status_code, 204)
+        self.assertNotIn((this_month, "ATM", "WITHDRAW"), self.summary())
+        self.assertEqual(self.summary(), self.from_transactions())
+
+
+class LedgerAmendTests(AccountsMixin, APITestCase):
+    """원장 모드 수정 (accounts.posting.amend): 원래 행은 그대로 두고 상쇄 거래 + 새 거래를 덧붙임."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(ledger, "LEDGER_MODE", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = self.make_user()
+        self.account = self.make_account(self.user)
+        self.client = self.client_for(self.user)
+        response = self.client.post(
+            reverse("transaction-list"),
+            {
+                "account": self.account.pk,
+                "deposit_and_withdrawal_type": "DEPOSIT",
+                "transaction_amount": "50.00",
+                "transaction_type": "ATM",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        Transaction.objects.filter(pk=response.data["id"]).update(account_factor_history="원래 메모")
+        self.original = Transaction.objects.get(pk=response.data["id"])
+
+    def amend(self, **changes):
+        serializer = SimpleNamespace(instance=self.original, validated_data=changes)
+        return posting.amend(serializer)
+
+    def assertReversed(self):
+        reversal = Transaction.objects.get(reverses=self.original.pk)
+        self.assertEqual(reversal.deposit_and_withdrawal_type, "WITHDRAW")
+        self.assertEqual(reversal.transaction_amount, Decimal("50.00"))
+
+    def test_amount_change_keeps_the_memo(self):
+        response = self.client.patch(
+            reverse("transaction-detail", args=[self.original.pk]), {"transaction_amount": "70.00"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        replacement = Transaction.objects.get(pk=response.data["id"])
+        self.assertNotEqual(replacement.pk, self.original.pk)
+        self.assertEqual(
+            (replacement.transaction_amount, replacement.account_factor_history), (Decimal("70.00"), "원래 메모")
+        )
+        self.assertReversed()
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("70.00"))
+
+    def test_rollups_keep_original_reversal_and_replacement(self):
+        month = f"{timezone.localdate(self.original.transaction_timestamp):%Y-%m}"
+        replacement = self.amend(transaction_amount=Decimal("70.00"))
+
+        def summary():
+            response = self.client.get(reverse("transaction-summary"), {"account": self.account.pk})
+            return {
+                row["deposit_and_withdrawal_type"]: (row["transaction_count"], row["total_amount"])
+                for row in response.data["results"]
+                if row["month"] == month
+            }
+
+        # 원장 모드에서는 원래 거래도 남으므로 입금 2건(50 + 70), 상쇄 출금 1건(50)
+        self.assertEqual(summary(), {"DEPOSIT": (2, "120.00"), "WITHDRAW": (1, "50.00")})
+
+        # 취소도 상쇄 거래를 덧붙임
+        self.assertEqual(self.client.delete(reverse("transaction-detail", args=[replacement.pk])).status_code, 204)
+        self.assertEqual(summary(), {"DEPOSIT": (2, "120.00"), "WITHDRAW": (2, "120.00")})
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("0.00"))
+
+    def test_memo_only_change_is_recorded(self):
+        replacement = self.amend(account_factor_history="고친 메모")
+
+        self.assertNotEqual(replacement.pk, self.original.pk)
+        self.assertEqual(
+            (replacement.transaction_amount, replacement.account_factor_history), (Decimal("50.00"), "고친 메모")
+        )
+        self.assertReversed()
+        self.original.refresh_from_db()
+        self.assertEqual(self.original.account_factor_history, "원래 메모")
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("50.00"))
+
+    def test_unchanged_values_append_nothing(self):
+        self.assertEqual(
+            self.amend(transaction_amount=Decimal("50.00"), account_factor_history="원래 메모"), self.original
+        )
+        self.assertEqual(Transaction.objects.filter(account=self.account).count(), 1)
+
+
+@skipUnless(connection.vendor == "postgresql", "행 락 동시성은 PostgreSQL 에서만 확인")
+class ConcurrentPostingTests(AccountsMixin, TransactionTestCase):
+    WORKERS = 16
+
+    def test_parallel_withdrawals_never_overdraw(self):
+        user = self.make_user()
+        account = self.make_account(user, balance="100.00")
+        barrier = threading.Barrier(self.WORKERS)
+        statuses = []
+
+        def withdraw():
+            client = self.client_for(user)
+            try:
+                barrier.wait()
+                response = client.post(
+                    reverse("transaction-list"),
+                    {
+                        "account": account.pk,
+                        "deposit_and_withdrawal_type": "WITHDRAW",
+                        "transaction_amount": "10.00",
+                        "transaction_type": "ATM",
+                        "account_factor_history": "race",
+                    },
+                    format="json",
+                )
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=withdraw) for _ in range(self.WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 잔액 100 에서 10 씩: 정확히 10건만 성공하고 나머지는 잔액 부족
+        self.assertEqual(sorted(statuses), [201] * 10 + [403] * (self.WORKERS - 10))
+        account.refresh_from_db()
+        self.assertEqual(account.balance, Decimal("0.00"))
+        after = sorted(Transaction.objects.filter(account=account).values_list("amount_after_transaction", flat=True))
+        self.assertEqual(after, [Decimal(n) for n in range(0, 100, 10)])
+
+
+# =========================
+# 대량 등록 (accounts.ingest)
+# =========================
+class BulkIngestTests(AccountsMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user, balance="100.00")
+        self.client = self.client_for(self.user)
+
+    def record(self, amount, direction="DEPOSIT", **extra):
+        return {
+            "account": self.account.pk,
+            "deposit_and_withdrawal_type": direction,
+            "transaction_amount": amount,
+            "transaction_type": "ATM",
+            **extra,
+        }
+
+    def upload(self, body):
+        response = self.client.post(reverse("transaction-bulk"), body.encode(), content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+    def ndjson(self, *records):
+        return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+    def assertBalance(self, expected):
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal(expected))
+
+    def test_ndjson_rows_are_posted_in_order(self):
+        rows = self.upload(self.ndjson(self.record("10.00"), self.record("30.00", "WITHDRAW")))
+
+        self.assertEqual([row["status"] for row in rows[:-1]], ["created", "created"])
+        self.assertEqual([row["amount_after_transaction"] for row in rows[:-1]], ["110.00", "80.00"])
+        self.assertEqual(rows[-1], {"summary": {"created": 2, "invalid": 0, "rejected": 0}})
+        self.assertBalance("80.00")
+
+    def test_json_array_is_accepted(self):
+        rows = self.upload(json.dumps([self.record("10.00"), self.record("5.00")]))
+
+        self.assertEqual(rows[-1]["summary"]["created"], 2)
+        self.assertBalance("115.00")
+
+    def test_records_split_across_read_chunks(self):
+        # 읽기 단위를 아주 작게 해 레코드와 멀티바이트 문자가 청크 경계에 걸치게 함
+        records = [self.record("1.00", note="한글 메모 " * 3) for _ in range(5)]
+        for body in (self.ndjson(*records), json.dumps(records, ensure_ascii=False)):
+            with self.subTest(body=body[:1]), mock.patch.object(ingest, "READ_SIZE", 7):
+                self.assertEqual(list(ingest.iter_records(BytesIO(body.encode()))), records)
+
+        with mock.patch.object(ingest, "READ_SIZE", 7):
+            rows = self.upload(self.ndjson(*records))
+        self.assertEqual(rows[-1]["summary"]["created"], 5)
+        self.assertBalance("105.00")
+
+    def test_malformed_line_stops_after_posting_earlier_rows(self):
+        body = self.ndjson(self.record("10.00")) + "{not json\n" + self.ndjson(self.record("20.00"))
+        rows = self.upload(body)
+
+        self.assertEqual(rows[0]["status"], "created")
+        self.assertEqual(rows[1]["status"], "error")
+        self.assertIn("2번째 줄", rows[1]["detail"])
+        self.assertEqual(rows[-1]["summary"], {"created": 1, "invalid": 0, "rejected": 0})
+        self.assertBalance("110.00")
+
+    def test_malformed_arrays_are_reported(self):
+        record = json.dumps(self.record("10.00"))
+        for body in (f"[{record}, {record}", f"[{record} {record}]", f"[{record}, {{oops]"):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                list(ingest.iter_records(BytesIO(body.encode())))
+
+        rows = self.upload(f"[{record}, {record}")
+        self.assertEqual([row.get("status") for row in rows[:-1]], ["created", "created", "error"])
+        self.assertBalance("120.00")
+
+    def test_partial_failure_is_reported_per_row(self):
+        rows = self.upload(
+            self.ndjson(
+                self.record("10.00"),
+                {"account": self.account.pk, "transaction_amount": "5.00"},
+                self.record("500.00", "WITHDRAW"),
+                self.record("10.00", "WITHDRAW"),
+            )
+        )
+
+        self.assertEqual(
+            [(row["index"], row["status"]) for row in rows[:-1]],
+            [
+                (0, "created"),
+                (1, "invalid"),
+                (2, "rejected"),
+                (3, "created"),
+            ],
+        )
+        self.assertIn("deposit_and_withdrawal_type", rows[1]["errors"])
+        self.assertEqual(rows[-1]["summary"], {"created": 2, "invalid": 1, "rejected": 1})
+        self.assertBalance("100.00")
+
+
+# =========================
+# 내보내기 (TransactionViewSet.export)
+# =========================
+class ExportTests(AccountsMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user, balance="100.00")
+        self.client = self.client_for(self.user)
+        for direction, amount in (("DEPOSIT", "10.00"), ("WITHDRAW", "30.00"), ("DEPOSIT", "5.00")):
+            payload = {
+                "account": self.account.pk,
+                "deposit_and_withdrawal_type": direction,
+                "transaction_amount": amount,
+                "transaction_type": "ATM",
+            }
+            self.assertEqual(self.client.post(reverse("transaction-list"), payload, format="json").status_code, 201)
+        # 다른 유저의 거래는 내보내기에 섞이지 않아야 함
+        other = self.make_user("other@test.local")
+        payload = {**payload, "account": self.make_account(other, "2000").pk}
+        self.assertEqual(
+            self.client_for(other).post(reverse("transaction-list"), payload, format="json").status_code, 201
+        )
+
+    def export(self, **params):
+        response = self.client.get(reverse("transaction-export"), params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv(self):
+        response, body = self.export(format="csv", ordering="transaction_timestamp")
+        rows = list(csv.DictReader(StringIO(body)))
+
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="transactions.csv"')
+        self.assertEqual(list(rows[0]), list(EXPORT_COLUMNS))
+        self.assertEqual([row["transaction_amount"] for row in rows], ["10.00", "30.00", "5.00"])
+        self.assertEqual([row["amount_after_transaction"] for row in rows], ["110.00", "80.00", "85.00"])
+        self.assertEqual({row["user_email"] for row in rows}, {self.user.email})
+
+    def test_ndjson_matches_the_list_representation(self):
+        response, body = self.export(format="ndjson", ordering="transaction_timestamp")
+        rows = [json.loads(line) for line in body.splitlines()]
+        listed = self.client.get(reverse("transaction-list"), {"ordering": "transaction_timestamp"}).data["results"]
+
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="transactions.ndjson"')
+        for exported, item in zip(rows, listed, strict=True):
+            for field in ("id", "transaction_amount", "amount_after_transaction", "transaction_timestamp"):
+                self.assertEqual(exported[field], item[field])
+
+    def test_filters_and_search_are_applied(self):
+        _, body = self.export(format="ndjson", deposit_and_withdrawal_type="DEPOSIT", min_amount="6")
+        self.assertEqual([json.loads(line)["transaction_amount"] for line in body.splitlines()], ["10.00"])
+
+        _, body = self.export(format="csv", transaction_type="CARD")
+        self.assertEqual(len(body.splitlines()), 1)
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"])
+    def test_streamed_rows_are_read_from_the_request_replica(self):
+        # 행은 응답을 흘려보낼 때(요청 스코프 밖) 읽히므로, 그때의 DB 별칭을 기록
+        seen = []
+
+        def iterator(queryset, *args, **kwargs):
+            def rows():
+                seen.append(queryset.db)
+                yield from ()
+
+            return rows()
+
+        with mock.patch.object(QuerySet, "iterator", iterator):
+            self.export(format="csv")
+        self.assertEqual(seen, ["replica_1"])
+
+
+# =========================
+# 커서 페이지네이션 (accounts.pagination.KeysetPagination)
+# =========================
+class KeysetPaginationTests(AccountsMixin, APITestCase):
+    AMOUNTS = ["10.50", "3.25", "10.50", "7.00", "3.25", "10.50", "1.00"]
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user, balance="100.00")
+        self.client = self.client_for(self.user)
+        # 모두 같은 시각 → 기본 정렬(-transaction_timestamp)에서는 id 로만 순서가 갈림
+        at = timezone.now()
+        for amount in self.AMOUNTS:
+            with mock.patch("django.utils.timezone.now", return_value=at):
+                payload = {
+                    "account": self.account.pk,
+                    "deposit_and_withdrawal_type": "DEPOSIT",
+                    "transaction_amount": amount,
+                    "transaction_type": "ATM",
+                }
+                self.assertEqual(self.client.post(reverse("transaction-list"), payload, format="json").status_code, 201)
+
+    def walk(self, url, link="next"):
+        # url 에서 시작해 link 를 끝까지 따라가며 페이지별 id 목록을 모음
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            pages.append([row["id"] for row in response.json()["results"]])
+            url = response.json()[link]
+        return pages
+
+    def test_next_and_previous_links_cover_every_row_once(self):
+        expected = list(Transaction.objects.order_by("-transaction_timestamp", "-id").values_list("id", flat=True))
+
+        pages = self.walk(reverse("transaction-list") + "?page_size=3")
+        self.assertEqual(pages, [expected[:3], expected[3:6], expected[6:]])
+
+        last = self.client.get(reverse("transaction-list") + "?page_size=3").json()["next"]
+        last = self.client.get(last).json()["next"]
+        self.assertIsNone(self.client.get(last).json()["next"])
+        self.assertEqual(self.walk(last, link="previous"), [expected[6:], expected[3:6], expected[:3]])
+
+    def test_first_page_has_no_previous_link(self):
+        response = self.client.get(reverse("transaction-list"), {"page_size": 3})
+        self.assertIsNone(response.json()["previous"])
+        self.assertIsNotNone(response.json()["next"])
+
+    def test_amount_ordering_breaks_ties_by_id(self):
+        ids = self.walk(reverse("transaction-list") + "?ordering=transaction_amount&page_size=2")
+        rows = Transaction.objects.filter(pk__in=sum(ids, [])).in_bulk()
+
+        flat = sum(ids, [])
+        self.assertEqual(len(flat), len(self.AMOUNTS))
+        keys = [(rows[pk].transaction_amount, pk) for pk in flat]
+        self.assertEqual(keys, sorted(keys))
+
+        flat = sum(self.walk(reverse("transaction-list") + "?ordering=-transaction_amount&page_size=2"), [])
+        keys = [(-rows[pk].transaction_amount, -pk) for pk in flat]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_cursor_from_another_ordering_is_rejected(self):
+        url = self.client.get(reverse("transaction-list"), {"ordering": "transaction_amount", "page_size": 2}).data[
+            "next"
+        ]
+        cursor = re.search(r"cursor=([^&]+)", url)[1]
+
+        response = self.client.get(reverse("transaction-list"), {"cursor": cursor})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(reverse("transaction-list"), {"cursor": "garbage"}).status_code, 404)
+
+
+# =========================
+# 거래 목록 실행 계획 (복합 인덱스)
+# =========================
+# TransactionFilter 파라미터별 대표 값
+FILTER_PARAMS = {
+    "transaction_type": {"transaction_type": "ATM"},
+    "deposit_and_withdrawal_type": {"deposit_and_withdrawal_type": "DEPOSIT"},
+    "min_amount": {"min_amount": "1000"},
+    "max_amount": {"max_amount": "5000"},
+    "transaction_timestamp": {"transaction_timestamp_after": None, "transaction_timestamp_before": None},
+}
+# ?search= 대표 값 (거래 방식 이름 / 메모 단어 / 둘 다)
+SEARCH_TERMS = [["카드"], ["plan"], ["plan", "ATM"]]
+ORDERINGS = [
+    ("-transaction_timestamp", "-id"),
+    ("transaction_timestamp", "id"),
+    ("transaction_amount", "id"),
+    ("-transaction_amount", "-id"),
+]
+
+# 거래 테이블을 처음부터 끝까지 훑는 실행 계획
+FULL_SCAN_PATTERNS = {
+    # 월 파티션(accounts_transaction_p202610)과 DEFAULT 파티션도 거래 테이블
+    "postgresql": re.compile(r"Seq Scan on accounts_transaction(?:_p\d{6}|_default)?\b"),
+    "sqlite": re.compile(r"\bSCAN accounts_transaction\b"),
+}
+
+
+@skipUnless(connection.vendor in FULL_SCAN_PATTERNS, "EXPLAIN 형식을 아는 DB 에서만 확인")
+class TransactionQueryPlanTests(TestCase):
+    """TransactionFilter 파라미터 조합 x 정렬, 검색어 x 정렬의 목록 쿼리가 거래 테이블을 전체 스캔하지 않는지."""
+
+    # 플래너가 작은 테이블이라 전체 스캔을 고르지 않을 만큼
+    SEED = 50000
+    USERS = 200
+
+    @classmethod
+    def setUpTestData(cls):
+        methods = [code for code, _ in TRANSACTION_METHOD]
+        directions = [code for code, _ in TRANSACTION_TYPE]
+        rng = random.Random(0)
+
+        users = User.objects.bulk_create(
+            User(email=f"plan-{i}@plan.local", nickname="plan", name="plan", password="!") for i in range(cls.USERS)
+        )
+        accounts = Account.objects.bulk_create(
+            Account(
+                account_number=f"P{i:011d}",
+                bank_code="004",
+                account_type="CHECKING",
+                balance=0,
+                user=users[i % cls.USERS],
+            )
+            for i in range(cls.USERS * 2)
+        )
+        Transaction.objects.bulk_create(
+            (
+                Transaction(
+                    transaction_amount=Decimal(rng.randint(1, 1000) * 100),
+                    amount_after_transaction=Decimal("0"),
+                    account_factor_history="plan",
+                    deposit_and_withdrawal_type=rng.choice(directions),
+                    transaction_type=rng.choice(methods),
+                    account=accounts[i % len(accounts)],
+                )
+                for i in range(cls.SEED)
+            ),
+            batch_size=5000,
+        )
+        # auto_now_add 로 모두 같은 시각이 되므로 id 를 기준으로 퍼뜨림
+        seeded = Transaction.objects.annotate(day=Mod("id", 365))
+        for day, moment in enumerate(cls.moments()):
+            seeded.filter(day=day).update(transaction_timestamp=moment)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.user = users[0]
+
+    @staticmethod
+    def moments():
+        """
+        거래 일시 365개. 파티션 테이블이면 최근 1년 + 미리 만든 달의 모든 월 파티션과 DEFAULT 파티션에 고르게.
+
+        빈 파티션은 플래너가 전체 스캔을 고르므로 (비용 0) 붙어 있는 파티션마다 행이 있어야 검사가 의미 있다.
+        """
+        now = timezone.now()
+        if not partitions.is_partitioned():
+            return [now - timedelta(days=day, minutes=day) for day in range(365)]
+        partitions.ensure_partitions(since=now - timedelta(days=365))
+        # DEFAULT 파티션에는 어느 월 파티션에도 속하지 않는 아주 오래된 거래
+        starts = [partitions.bounds(month)[0] for month in partitions.live_months()]
+        starts.append(partitions.bounds(date(2000, 1, 1))[0])
+        return [starts[day % len(starts)] + timedelta(days=day // len(starts), minutes=day) for day in range(365)]
+
+    def assertUsesIndexes(self, queryset):
+        # 목록 API 와 같은 형태: 페이지 크기 + 1 만큼 LIMIT
+        plan = queryset[:51].explain()
+        self.assertIsNone(FULL_SCAN_PATTERNS[connection.vendor].search(plan), f"거래 테이블 전체 스캔\n{plan}")
+
+    def test_partition_full_scan_fails_the_check(self):
+        plans = {
+            "postgresql": [
+                "->  Seq Scan on accounts_transaction_p202610 accounts_transaction_1  (cost=0.00..61.62 rows=15)",
+                "->  Seq Scan on accounts_transaction_default accounts_transaction_17  (cost=0.00..1.01 rows=1)",
+                "Seq Scan on accounts_transaction  (cost=0.00..918.00 rows=50000 width=8)",
+            ],
+            "sqlite": ["SCAN accounts_transaction"],
+        }[connection.vendor]
+        for plan in plans:
+            queryset = mock.MagicMock()
+            queryset.__getitem__.return_value.explain.return_value = plan
+            with self.subTest(plan=plan), self.assertRaises(self.failureException):
+                self.assertUsesIndexes(queryset)
+
+        # 파티션 인덱스를 쓰는 계획은 통과
+        queryset = mock.MagicMock()
+        queryset.__getitem__.return_value.explain.return_value = (
+            "->  Index Scan using accounts_transaction_p202610_account_id_idx on accounts_transaction_p202610"
+        )
+        self.assertUsesIndexes(queryset)
+
+    def test_filter_combinations_use_indexes(self):
+        now = timezone.localdate()
+        base = Transaction.objects.filter(account__user=self.user)
+        for size in range(len(FILTER_PARAMS) + 1):
+            for names in combinations(FILTER_PARAMS, size):
+                data = {}
+                for name in names:
+                    data.update(FILTER_PARAMS[name])
+                if "transaction_timestamp_after" in data:
+                    data["transaction_timestamp_after"] = (now - timedelta(days=30)).isoformat()
+                    data["transaction_timestamp_before"] = now.isoformat()
+
+                filterset = TransactionFilter(data, queryset=base)
+                self.assertTrue(filterset.is_valid(), filterset.errors)
+                for ordering in ORDERINGS:
+                    with self.subTest(filters=names, ordering=ordering):
+                        self.assertUsesIndexes(filterset.qs.order_by(*ordering))
+
+    def test_search_uses_indexes(self):
+        base = Transaction.objects.filter(account__user=self.user)
+        for terms in SEARCH_TERMS:
+            for ordering in ORDERINGS:
+                with self.subTest(search=terms, ordering=ordering):
+                    self.assertUsesIndexes(filter_terms(base, terms).order_by(*ordering))
+
+
+# =========================
+# 엔드포인트별 쿼리 수 (N+1 회귀 방지)
+# =========================
+# URL 이름별 최대 쿼리 수. 결과 행 수와 무관하게 이 값을 넘으면 N+1 회귀로 본다 (인증 조회 제외 - force_authenticate)
+ENDPOINT_QUERY_BUDGETS = {
+    "transaction-list": 1,
+    "transaction-detail": 1,
+    "account-list-create": 1,
+    "account-detail": 1,
+}
+
+
+class QueryBudgetTests(AccountsMixin, APITestCase):
+    # 계좌당 거래 수 (계좌 2개). 가장 큰 값도 한 페이지(page_size=200)에 다 들어가게
+    SIZES = [3, 100]
+
+    @contextmanager
+    def assertMaxQueries(self, limit, label):
+        """assertNumQueries 와 같지만 limit 개 이하면 통과."""
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        queries = "\n".join(f"  {index}. {query['sql']}" for index, query in enumerate(context.captured_queries, 1))
+        self.assertLessEqual(len(context), limit, f"{label}: 쿼리 {len(context)}개 실행 (허용 {limit}개)\n{queries}")
+
+    def test_endpoints_stay_within_budget_regardless_of_size(self):
+        user = self.make_user()
+        accounts = [self.make_account(user, number=f"Q{i}") for i in range(2)]
+        client = self.client_for(user)
+
+        existing = 0
+        for size in self.SIZES:
+            Transaction.objects.bulk_create(
+                Transaction(
+                    transaction_amount=Decimal("100"),
+                    amount_after_transaction=Decimal("100"),
+                    deposit_and_withdrawal_type="DEPOSIT",
+                    transaction_type="ATM",
+                    account=account,
+                )
+                for account in accounts
+                for _ in range(size - existing)
+            )
+            existing = size
+            # 뷰를 거치지 않고 넣었으므로 목록 응답 캐시가 이전 크기의 결과를 돌려주지 않게 버전을 바꿈
+            versions.bump(user.pk)
+            sample = Transaction.objects.filter(account__user=user).first()
+
+            for name, kwargs in [
+                ("transaction-list", {}),
+                ("transaction-detail", {"pk": sample.pk}),
+                ("account-list-create", {}),
+                ("account-detail", {"pk": accounts[0].pk}),
+            ]:
+                label = f"{name} (계좌당 거래 {size}건)"
+                with self.subTest(label), self.assertMaxQueries(ENDPOINT_QUERY_BUDGETS[name], label):
+                    response = client.get(reverse(name, kwargs=kwargs), {"page_size": 200})
+                self.assertEqual(response.status_code, 200)
+            # 목록 응답에 거래가 모두 들어 있어야 결과 크기와 무관하다는 확인이 됨
+            response = client.get(reverse("transaction-list"), {"page_size": 200})
+            self.assertEqual(len(response.json()["results"]), 2 * size)
+
+
+# =========================
+# 메일 발송 대기열 (accounts.outbox)
+# =========================
+class UnreachableBackend(EmailBackend):
+    # SMTP 서버에 접속하지 못하는 경우
+    def open(self):
+        raise ConnectionRefusedError("smtp down")
+
+
+class OutboxTests(TestCase):
+    def enqueue(self, count=2):
+        return [outbox.enqueue("제목", "본문", "noreply@test.local", [f"user{i}@test.local"]) for i in range(count)]
+
+    def test_batch_is_sent_over_one_connection(self):
+        self.enqueue()
+
+        self.assertEqual(outbox.process_batch(), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(OutboxEmail.objects.filter(status="SENT", attempts=1, locked_at=None).count(), 2)
+
+    def test_connection_failure_requeues_the_whole_batch_with_backoff(self):
+        self.enqueue()
+        started = timezone.now()
+
+        self.assertEqual(outbox.process_batch(connection=UnreachableBackend()), (0, 2))
+
+        for message in OutboxEmail.objects.all():
+            self.assertEqual((message.status, message.attempts, message.locked_at), ("PENDING", 1, None))
+            self.assertGreaterEqual(message.available_at, started + timedelta(seconds=outbox.BACKOFF_BASE_SECONDS))
+            self.assertIn("smtp down", message.last_error)
+        # 백오프 중에는 다시 점유되지 않음
+        self.assertEqual(outbox.process_batch(), (0, 0))
+
+    def test_connection_failures_end_in_failed(self):
+        (message,) = self.enqueue(1)
+        for _ in range(outbox.MAX_ATTEMPTS):
+            OutboxEmail.objects.filter(pk=message.pk).update(available_at=timezone.now())
+            self.assertEqual(outbox.process_batch(connection=UnreachableBackend()), (0, 1))
+
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ("FAILED", outbox.MAX_ATTEMPTS))
+        self.assertEqual(outbox.process_batch(), (0, 0))
+
+
+# =========================
+# 인증 유저 캐시 (accounts.authentication, accounts.usercache)
+# =========================
+@override_settings(SHARED_CACHE=True)
+class CachedAuthenticationTests(AccountsMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        usercache._local.clear()
+        self.addCleanup(usercache._local.clear)
+        # 토큰 폐기 확인의 필터 재생성 스레드 없이
+        index = revocation._Index()
+        for patcher in (mock.patch.object(revocation, "_index", index), mock.patch.object(index, "start")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.user = self.make_user()
+        self.token = RevocableAccessToken.for_user(self.user)
+
+    def authenticate(self):
+        return CachedJWTAuthentication().get_user(self.token)
+
+    def test_cached_user_is_served_without_the_database(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate(), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate(), self.user)
+
+        # 다른 워커(로컬 LRU 가 빈)도 공유 캐시에서 찾음
+        usercache._local.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate().email, self.user.email)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_shared_tier_is_skipped_without_a_shared_cache(self):
+        self.authenticate()
+
+        self.assertIsNone(cache.get(usercache._key(self.user.pk)))
+        usercache._local.clear()
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+    def test_cached_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        usercache.store(self.user)
+
+        with self.assertRaises(AuthenticationFailed) as raised, self.assertNumQueries(0):
+            self.authenticate()
+        self.assertEqual(raised.exception.detail["code"], "user_inactive")
+
+    def test_cached_user_with_a_new_password_is_rejected(self):
+        self.token[jwt_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(self.user.password)
+        with mock.patch("accounts.authentication.api_settings.CHECK_REVOKE_TOKEN", True):
+            self.authenticate()
+            self.user.set_password("changed")
+            usercache.store(self.user)
+
+            with self.assertRaises(AuthenticationFailed) as raised:
+                self.authenticate()
+        self.assertEqual(raised.exception.detail["code"], "password_changed")
+
+    def test_saving_the_user_invalidates_the_cache(self):
+        self.authenticate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(pk=self.user.pk)
+            user.is_active = False
+            user.save()
+
+        self.assertIsNone(usercache.get(self.user.pk))
+        self.assertIsNone(cache.get(usercache._key(self.user.pk)))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleting_the_user_invalidates_the_cache(self):
+        self.authenticate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(pk=self.user.pk).delete()
+
+        self.assertIsNone(usercache.get(self.user.pk))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_request_after_deactivation_is_rejected(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.assertEqual(client.get(reverse("account-list-create")).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(client.get(reverse("account-list-create")).status_code, 401)
+
+
+# =========================
+# 비동기 로그인 (views.async_login)
+# =========================
+class AsyncLoginTests(AccountsMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.failures = []
+
+        def record(sender, credentials, request, **kwargs):
+            self.failures.append(credentials)
+
+        user_login_failed.connect(record)
+        self.addCleanup(user_login_failed.disconnect, record)
+
+    def login(self, name, password="pw", email="owner@test.local"):
+        return self.client.post(reverse(name), {"email": email, "password": password}, content_type="application/json")
+
+    def claims(self, token):
+        payload = dict(UntypedToken(token).payload)
+        # 토큰마다 다른 값은 빼고 비교
+        lifetime = payload.pop("exp") - payload.pop("iat")
+        payload.pop("jti")
+        return {**payload, "lifetime": lifetime}
+
+    def test_success_matches_the_sync_view(self):
+        sync, response = self.login("token_obtain_pair"), self.login("async-login")
+
+        self.assertEqual((sync.status_code, response.status_code), (200, 200))
+        data = response.json()
+        self.assertEqual(set(data), set(sync.json()))
+        for name in ("access", "refresh"):
+            self.assertEqual(self.claims(data[name]), self.claims(sync.json()[name]))
+            self.assertEqual(response.cookies[f"{name}_token"].value, data[name])
+        self.assertEqual(self.claims(data["access"])["user_id"], str(self.user.pk))
+        self.assertEqual(self.failures, [])
+
+    def test_wrong_password_is_rejected_like_the_sync_view(self):
+        for name in ("token_obtain_pair", "async-login"):
+            with self.subTest(name):
+                response = self.login(name, password="wrong")
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(
+                    response.json()["detail"],
+                    str(CustomTokenObtainPairSerializer.default_error_messages["no_active_account"]),
+                )
+                self.assertNotIn("access_token", response.cookies)
+
+        # 두 경로 모두 실패 신호를 보내고 비밀번호는 가림
+        self.assertEqual(len(self.failures), 2)
+        self.assertEqual(self.failures[0], self.failures[1])
+        self.assertNotEqual(self.failures[1]["password"], "wrong")
+
+    def test_inactive_user_is_rejected(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        for name in ("token_obtain_pair", "async-login"):
+            with self.subTest(name):
+                self.assertEqual(self.login(name).status_code, 401)
+        self.assertEqual(len(self.failures), 2)
+
+    def test_unknown_email_and_invalid_body(self):
+        self.assertEqual(self.login("async-login", email="nobody@test.local").status_code, 401)
+        self.assertEqual(self.failures, [{"email": "nobody@test.local", "password": "********************"}])
+
+        response = self.client.post(reverse("async-login"), "{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post(reverse("async-login"), {}, content_type="application/json").status_code, 400)
+
+
+# =========================
+# 비동기 조회 API (accounts.asyncviews)
+# =========================
+class AsyncReadViewTests(AccountsMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user, balance="100.00")
+        self.make_account(self.user, "1001")
+        self.client = self.client_for(self.user)
+        for direction, amount, method in (
+            ("DEPOSIT", "10.00", "ATM"),
+            ("WITHDRAW", "30.00", "CARD"),
+            ("DEPOSIT", "5.00", "ATM"),
+        ):
+            payload = {
+                "account": self.account.pk,
+                "deposit_and_withdrawal_type": direction,
+                "transaction_amount": amount,
+                "transaction_type": method,
+            }
+            self.assertEqual(self.client.post(reverse("transaction-list"), payload, format="json").status_code, 201)
+        other = self.make_user("other@test.local")
+        self.others = Transaction.objects.create(
+            account=self.make_account(other, "2000"),
+            transaction_amount=Decimal("1.00"),
+            amount_after_transaction=Decimal("1.00"),
+            deposit_and_withdrawal_type="DEPOSIT",
+            transaction_type="ATM",
+        )
+
+    def both(self, sync_url, async_url, params=None):
+        sync, response = self.client.get(sync_url, params), self.client.get(async_url, params)
+        self.assertEqual(response.status_code, sync.status_code)
+        return sync.json(), response.json()
+
+    def test_transaction_list(self):
+        for params in (
+            {},
+            {"page_size": 2},
+            {"ordering": "transaction_amount"},
+            {"transaction_type": "ATM"},
+            {"search": "CARD"},
+        ):
+            with self.subTest(params):
+                sync, data = self.both(reverse("transaction-list"), reverse("async-transaction-list"), params)
+                self.assertEqual(data["results"], sync["results"])
+                self.assertEqual(data["next"] is None, sync["next"] is None)
+
+    def test_async_cursor_continues_on_the_sync_view(self):
+        _, data = self.both(reverse("transaction-list"), reverse("async-transaction-list"), {"page_size": 2})
+        query = data["next"].split("?", 1)[1]
+
+        sync, rest = self.both(
+            reverse("transaction-list") + "?" + query, reverse("async-transaction-list") + "?" + query
+        )
+        self.assertEqual(rest["results"], sync["results"])
+        self.assertEqual(len(rest["results"]), 1)
+
+    def test_transaction_detail(self):
+        txn = Transaction.objects.filter(account=self.account).first()
+        sync, data = self.both(
+            reverse("transaction-detail", args=[txn.pk]), reverse("async-transaction-detail", args=[txn.pk])
+        )
+        self.assertEqual(data, sync)
+
+        # 남의 거래 / 없는 거래는 둘 다 404
+        for pk in (self.others.pk, 0):
+            self.both(reverse("transaction-detail", args=[pk]), reverse("async-transaction-detail", args=[pk]))
+
+    def test_account_list_and_profile(self):
+        sync, data = self.both(reverse("account-list-create"), reverse("async-account-list"))
+        self.assertEqual(data, sync)
+        self.assertEqual(len(data["results"]), 2)
+
+        sync, data = self.both(reverse("user-detail"), reverse("async-user-detail"))
+        self.assertEqual(data, sync)
+
+    def test_anonymous_and_unsafe_requests_are_rejected(self):
+        self.assertEqual(APIClient().get(reverse("async-transaction-list")).status_code, 401)
+        self.assertEqual(self.client.post(reverse("async-transaction-list"), {}).status_code, 405)
+
+
+# =========================
+# 토큰 폐기 확인 (accounts.revocation)
+# =========================
+class RevocationTests(AccountsMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        # 재생성 스레드 없이 이 테스트 전용 인덱스로 (필터 재생성은 테스트에서 직접 호출)
+        self.index = revocation._Index()
+        for patcher in (mock.patch.object(revocation, "_index", self.index), mock.patch.object(self.index, "start")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def revoke(self):
+        token = RevocableRefreshToken.for_user(self.user)
+        token.blacklist()
+        return token["jti"]
+
+    def test_verification_never_builds_the_filter(self):
+        revoked, live = self.revoke(), RevocableRefreshToken.for_user(self.user)["jti"]
+        cache.clear()
+
+        with mock.patch.object(revocation, "build", side_effect=AssertionError("인증 경로에서 필터 재생성")):
+            # 첫 필터가 만들어지기 전에는 DB 확인
+            self.assertTrue(revocation.is_revoked(revoked))
+            self.assertFalse(revocation.is_revoked(live))
+
+    @override_settings(SHARED_CACHE=True)
+    def test_rebuilt_filter_answers_without_the_database(self):
+        revoked = self.revoke()
+        self.index.rebuild()
+        cache.clear()
+
+        with self.assertNumQueries(0):
+            self.assertFalse(revocation.is_revoked("not-revoked"))
+        self.assertTrue(revocation.is_revoked(revoked))
+
+    def test_revocation_in_another_process_is_seen_without_a_shared_cache(self):
+        self.index.rebuild()
+        # 다른 프로세스에서 폐기: DB 에는 있지만 이 프로세스의 필터와 (공유되지 않는) 캐시에는 없음
+        token = RevocableRefreshToken.for_user(self.user)
+        with mock.patch.object(revocation, "mark"):
+            token.blacklist()
+        cache.clear()
+
+        self.assertTrue(revocation.is_revoked(token["jti"]))
+        with override_settings(SHARED_CACHE=True):
+            # 공유 캐시라면 폐기한 프로세스의 mark() 가 캐시에 남기므로 필터의 "없음" 을 믿음
+            self.assertFalse(revocation.is_revoked(token["jti"]))
+
+    def test_tokens_revoked_during_a_rebuild_are_kept(self):
+        def build_while_revoking():
+            # DB 를 읽은 뒤 다른 요청이 토큰을 폐기한 경우
+            bloom = revocation.BloomFilter(10)
+            revoked.append(self.revoke())
+            return bloom
+
+        revoked = []
+        with mock.patch.object(revocation, "build", side_effect=build_while_revoking):
+            self.index.rebuild()
+        cache.clear()
+
+        self.assertIn(revoked[0], self.index.bloom())
+        self.assertTrue(revocation.is_revoked(revoked[0]))
+
+
+# =========================
+# 목록 응답 캐시 / ETag (accounts.responsecache)
+# =========================
+@override_settings(SHARED_CACHE=True)
+class ResponseCacheTests(AccountsMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user, balance="100.00")
+        self.client = self.client_for(self.user)
+        self.txn = self.deposit()
+
+    def deposit(self, amount="10.00"):
+        payload = {
+            "account": self.account.pk,
+            "deposit_and_withdrawal_type": "DEPOSIT",
+            "transaction_amount": amount,
+            "transaction_type": "ATM",
+        }
+        response = self.client.post(reverse("transaction-list"), payload, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def etag(self, name="transaction-list", client=None):
+        response = (client or self.client).get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def assertBumps(self, write, names=("transaction-list", "account-list-create"), client=None):
+        before = {name: self.etag(name, client) for name in names}
+        write()
+        for name in names:
+            response = (client or self.client).get(reverse(name), HTTP_IF_NONE_MATCH=before[name])
+            self.assertEqual(response.status_code, 200, name)
+            self.assertNotEqual(response["ETag"], before[name], name)
+
+    def test_matching_etag_is_answered_with_304_without_queries(self):
+        etag = self.etag()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("transaction-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual((response["ETag"], response["Cache-Control"]), (etag, "private, no-cache"))
+        self.assertEqual(self.client.get(reverse("transaction-list"), HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_cached_response_keeps_body_and_headers(self):
+        first = self.client.get(reverse("transaction-list"))
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse("transaction-list"))
+        self.assertEqual(cached.content, first.content)
+        for header in ("Content-Type", "Vary", "Allow", "ETag", "Cache-Control"):
+            self.assertEqual(cached[header], first[header], header)
+
+    def test_etag_differs_per_query_and_media_type(self):
+        etags = {
+            self.etag(),
+            self.client.get(reverse("transaction-list"), {"page_size": 1})["ETag"],
+            self.client.get(reverse("transaction-list"), HTTP_ACCEPT="text/html")["ETag"],
+        }
+        self.assertEqual(len(etags), 3)
+
+    def test_writes_through_the_views_bump_the_version(self):
+        url = reverse("transaction-detail", args=[self.txn["id"]])
+        self.assertBumps(self.deposit)
+        self.assertBumps(lambda: self.client.patch(url, {"transaction_amount": "20.00"}, format="json"))
+        self.assertBumps(
+            lambda: self.client.put(
+                url,
+                {
+                    "account": self.account.pk,
+                    "deposit_and_withdrawal_type": "DEPOSIT",
+                    "transaction_amount": "25.00",
+                    "transaction_type": "ATM",
+                },
+                format="json",
+            )
+        )
+        self.assertEqual(Transaction.objects.get(pk=self.txn["id"]).transaction_amount, Decimal("25.00"))
+        self.assertBumps(lambda: self.client.delete(url))
+        self.assertFalse(Transaction.objects.filter(pk=self.txn["id"]).exists())
+
+    def test_bulk_ingest_bumps_the_version(self):
+        record = json.dumps({**self.txn, "account": self.account.pk})
+
+        def ingest_rows():
+            response = self.client.post(
+                reverse("transaction-bulk"), record.encode(), content_type="application/x-ndjson"
+            )
+            b"".join(response.streaming_content)
+
+        self.assertBumps(ingest_rows)
+
+    def test_transfer_bumps_sender_and_recipient(self):
+        recipient = self.make_user("recipient@test.local")
+        self.make_account(recipient, "2000")
+        recipient_client = self.client_for(recipient)
+        item = {"from_account": self.account.pk, "to_account_number": "2000", "transaction_amount": "5.00"}
+
+        before = self.etag(client=recipient_client)
+        self.assertBumps(lambda: self.client.post(reverse("transfer-list"), item, format="json"))
+        self.assertNotEqual(self.etag(client=recipient_client), before)
+
+    def test_account_create_and_delete_bump_the_version(self):
+        payload = {"account_number": "1001", "bank_code": "004", "account_type": "CHECKING", "balance": "0.00"}
+        self.assertBumps(lambda: self.client.post(reverse("account-list-create"), payload, format="json"))
+        other = Account.objects.get(account_number="1001")
+        self.assertBumps(lambda: self.client.delete(reverse("account-detail", args=[other.pk])))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_nothing_is_cached_without_a_shared_cache(self):
+        first = self.client.get(reverse("transaction-list"))
+        self.assertNotIn("ETag", first)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse("transaction-list")).content, first.content)
+        self.assertGreater(len(queries), 0)
+
+
+# =========================
+# 관리 명령 후 캐시 무효화 (accounts.versions)
+# =========================
+@override_settings(SHARED_CACHE=True)
+class MaintenanceCommandVersionTests(AccountsMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user, balance="10.00")
+        self.deposit = Transaction.objects.create(
+            account=self.account,
+            transaction_amount=Decimal("10.00"),
+            amount_after_transaction=Decimal("10.00"),
+            account_factor_history="test",
+            deposit_and_withdrawal_type="DEPOSIT",
+            transaction_type="ATM",
+        )
+
+    def run_command(self, name):
+        before = versions.current(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(name, stdout=StringIO())
+        return before, versions.current(self.user.pk)
+
+    def test_running_balance_rebuild_bumps_only_when_rows_change(self):
+        before, after = self.run_command("rebuild_running_balances")
+        self.assertEqual(before, after)
+
+        Transaction.objects.filter(pk=self.deposit.pk).update(amount_after_transaction=Decimal("99.00"))
+        before, after = self.run_command("rebuild_running_balances")
+        self.assertNotEqual(before, after)
+
+    def test_daily_balance_rebuild_bumps_owners(self):
+        before, after = self.run_command("rebuild_daily_balances")
+        self.assertNotEqual(before, after)
+
+    def test_checkpoint_bumps_when_the_balance_column_is_corrected(self):
+        before, after = self.run_command("checkpoint_ledger")
+        self.assertEqual(before, after)
+
+        Account.objects.filter(pk=self.account.pk).update(balance=Decimal("99.00"))
+        before, after = self.run_command("checkpoint_ledger")
+        self.assertNotEqual(before, after)
+
+
+# =========================
+# 시드 데이터 (seed 명령)
+# =========================
+class SeedCommandTests(TransactionTestCase):
+    # rebuild_rollups 가 다른 스레드(커넥션)에서 읽으므로 커밋되는 TransactionTestCase
+    def test_small_seed_is_consistent(self):
+        call_command(
+            "seed",
+            users=4,
+            accounts_per_user=2,
+            transactions_per_account=12,
+            days=70,
+            prefix="t",
+            chunk_size=3,
+            stdout=StringIO(),
+        )
+
+        accounts = list(Account.objects.filter(account_number__startswith="T"))
+        self.assertEqual(User.objects.filter(email__startswith="t-").count(), 4)
+        self.assertGreaterEqual(len(accounts), 4)
+        self.assertTrue(Transaction.objects.filter(account__in=accounts).count() > len(accounts))
+
+        for account in accounts:
+            with self.subTest(account=account.account_number):
+                txns = list(account.transaction_set.order_by("transaction_timestamp", "id"))
+                balance, cells, days = Decimal("0"), {}, {}
+                for txn in txns:
+                    delta = posting.signed_amount(txn.deposit_and_withdrawal_type, txn.transaction_amount)
+                    balance += delta
+                    self.assertGreaterEqual(balance, 0)
+                    self.assertEqual(txn.amount_after_transaction, balance)
+
+                    key = (
+                        rollups.month_of(txn.transaction_timestamp),
+                        txn.transaction_type,
+                        txn.deposit_and_withdrawal_type,
+                    )
+                    count, total = cells.get(key, (0, Decimal("0")))
+                    cells[key] = (count + 1, total + txn.transaction_amount)
+                    count, _ = days.get(timezone.localdate(txn.transaction_timestamp), (0, None))
+                    days[timezone.localdate(txn.transaction_timestamp)] = (count + 1, balance)
+                self.assertEqual(account.balance, balance)
+
+                stored = {
+                    (row.month, row.transaction_type, row.deposit_and_withdrawal_type): (
+                        row.transaction_count,
+                        row.total_amount,
+                    )
+                    for row in account.monthly_rollups.all()
+                }
+                self.assertEqual(stored, cells)
+                snapshots = {
+                    row.date: (row.transaction_count, row.closing_balance) for row in account.daily_balances.all()
+                }
+                self.assertEqual(snapshots, days)
+
+
+# =========================
+# 아카이브 이후 집계 재계산 / 파티션 관리
+# =========================
+@mock.patch("accounts.archive.archived_months", return_value=[date(2000, 1, 1)])
+class ArchivedRebuildTests(AccountsMixin, TransactionTestCase):
+    # rebuild_rollups 가 다른 스레드(커넥션)에서 읽으므로 커밋되는 TransactionTestCase
+    def setUp(self):
+        super().setUp()
+        self.account = self.make_account(self.make_user(), balance="130.00")
+        # 2000-01 은 아카이브되어 DB 에 거래가 없고 집계만 남아 있음
+        DailyBalance.objects.create(
+            account=self.account,
+            date=date(2000, 1, 15),
+            closing_balance=Decimal("0.00"),
+            deposit_total=Decimal("100.00"),
+            transaction_count=1,
+        )
+        MonthlyRollup.objects.create(
+            account=self.account,
+            month=date(2000, 1, 1),
+            transaction_type="ATM",
+            deposit_and_withdrawal_type="DEPOSIT",
+            transaction_count=1,
+            total_amount=Decimal("100.00"),
+        )
+        Transaction.objects.create(
+            account=self.account,
+            transaction_amount=Decimal("30.00"),
+            amount_after_transaction=Decimal("130.00"),
+            account_factor_history="test",
+            deposit_and_withdrawal_type="DEPOSIT",
+            transaction_type="ATM",
+        )
+        self.today = timezone.localdate()
+        # 라이브 달의 틀어진 집계는 다시 만들어져야 함
+        DailyBalance.objects.create(account=self.account, date=self.today, closing_balance=Decimal("999.00"))
+
+    def test_daily_balance_rebuild_keeps_archived_days(self, _):
+        call_command("rebuild_daily_balances", stdout=StringIO())
+
+        snapshots = {
+            row.date: (row.deposit_total, row.transaction_count, row.closing_balance)
+            for row in self.account.daily_balances.all()
+        }
+        self.assertEqual(
+            snapshots,
+            {
+                # 입출금 합계는 그대로, 마감 잔액만 라이브 거래에 맞춰 다시 계산
+                date(2000, 1, 15): (Decimal("100.00"), 1, Decimal("100.00")),
+                self.today: (Decimal("30.00"), 1, Decimal("130.00")),
+            },
+        )
+
+    def test_rollup_rebuild_keeps_archived_months(self, _):
+        MonthlyRollup.objects.create(
+            account=self.account,
+            month=rollups.month_of(timezone.now()),
+            transaction_type="ATM",
+            deposit_and_withdrawal_type="DEPOSIT",
+            transaction_count=7,
+            total_amount=Decimal("700.00"),
+        )
+        call_command("rebuild_rollups", stdout=StringIO())
+
+        stored = {row.month: (row.transaction_count, row.total_amount) for row in self.account.monthly_rollups.all()}
+        self.assertEqual(
+            stored,
+            {
+                date(2000, 1, 1): (1, Decimal("100.00")),
+                rollups.month_of(timezone.now()): (1, Decimal("30.00")),
+            },
+        )
+
+
+class EnsurePartitionsCommandTests(TestCase):
+    def test_creates_upcoming_partitions_once(self):
+        out = StringIO()
+        call_command("ensure_partitions", months_ahead=partitions.MONTHS_AHEAD + 2, once=True, stdout=out)
+
+        if not partitions.is_partitioned():
+            self.assertEqual(out.getvalue(), "")
+            return
+        last = partitions.add_months(partitions.month_start(timezone.localdate()), partitions.MONTHS_AHEAD + 2)
+        self.assertIn(last, partitions.live_months())
+        self.assertIn(f"{last:%Y-%m} 파티션 생성", out.getvalue())
+
+        # 이미 있으면 아무것도 만들지 않음
+        out = StringIO()
+        call_command("ensure_partitions", months_ahead=partitions.MONTHS_AHEAD + 2, once=True, stdout=out)
+        self.assertEqual(out.getvalue(), "")
+
+
+# =========================
+# Prometheus 지표 (accounts.metrics)
+# =========================
+class MetricsTests(AccountsMixin, APITestCase):
+    def scrape(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def request_count(self, body):
+        # 지표 디렉터리는 다른 테스트 실행의 파일과 공유되므로 절대값 대신 증가분을 본다
+        match = re.search(
+            r'http_request_duration_seconds_count\{method="GET",status="2xx",view="account-list-create"\} (\S+)', body
+        )
+        return float(match.group(1)) if match else 0.0
+
+    def test_requests_and_gauges_are_exposed(self):
+        before = self.request_count(self.scrape())
+        client = self.client_for(self.make_user())
+        for _ in range(2):
+            self.assertEqual(client.get(reverse("account-list-create")).status_code, 200)
+
+        body = self.scrape()
+        self.assertEqual(self.request_count(body), before + 2)
+        self.assertIn(f'login_hasher_running{{pid="{os.getpid()}"}}', body)
+
+    def test_requests_do_not_start_the_gauge_thread(self):
+        # gunicorn 마스터의 워밍업 요청이 fork 전에 스레드를 띄우지 않도록 (post_worker_init 에서만 띄움)
+        with mock.patch.object(metrics.gauges, "start") as start:
+            self.assertEqual(self.client.get(reverse("healthz")).status_code, 200)
+            warm_up()
+        start.assert_not_called()
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token_is_required_when_configured(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+
+
+# =========================
+# 멱등 키 (accounts.idempotency)
+# =========================
+class IdempotencyTests(AccountsMixin, APITestCase):
+    KEY = "deposit-1"
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user)
+        self.client = self.client_for(self.user)
+
+    def deposit(self, amount="10.00", key=KEY):
+        return self.client.post(
+            reverse("transaction-list"),
+            {
+                "account": self.account.pk,
+                "deposit_and_withdrawal_type": "DEPOSIT",
+                "transaction_amount": amount,
+                "transaction_type": "ATM",
+            },
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def assertPostedOnce(self):
+        self.assertEqual(Transaction.objects.filter(account=self.account).count(), 1)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("10.00"))
+
+    @contextmanager
+    def claimed(self, age):
+        # 다른 워커가 age 초 전에 같은 요청을 점유하고 아직 응답을 저장하지 않은 상태
+        fingerprint = b"f" * 32
+        IdempotencyKey.objects.create(
+            user=self.user,
+            key=idempotency._digest(self.KEY),
+            fingerprint=fingerprint,
+            created_at=timezone.now() - timedelta(seconds=age),
+        )
+        with mock.patch.object(idempotency, "fingerprint", return_value=fingerprint):
+            yield
+
+    def test_replay_returns_the_stored_response(self):
+        first = self.deposit()
+        self.assertEqual(first.status_code, 201, first.content)
+
+        replay = self.deposit()
+
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(replay.json(), first.json())
+        self.assertPostedOnce()
+
+    def test_same_key_with_a_different_body_is_rejected(self):
+        self.assertEqual(self.deposit().status_code, 201)
+
+        response = self.deposit(amount="20.00")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertPostedOnce()
+
+    def test_in_flight_duplicate_gets_409(self):
+        with self.claimed(age=1):
+            response = self.deposit()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(Transaction.objects.filter(account=self.account).exists())
+
+    def test_stale_claim_is_taken_over(self):
+        with self.claimed(age=idempotency.CLAIM_TIMEOUT + 1):
+            response = self.deposit()
+            self.assertEqual(response.status_code, 201, response.content)
+            self.assertEqual(self.deposit()["Idempotent-Replayed"], "true")
+
+        self.assertPostedOnce()
+        self.assertEqual(IdempotencyKey.objects.get(user=self.user).status_code, 201)
+
+
+# =========================
+# 읽기 복제본 라우팅 (accounts.replicas)
+# =========================
+class ReplicaRouterTests(TestCase):
+    def test_reads_go_to_the_request_alias_only_inside_the_scope(self):
+        router = replicas.ReplicaRouter()
+        self.assertEqual(router.db_for_read(Account), "default")
+
+        with replicas.request_scope():
+            replicas._read_alias.set("replica_1")
+            self.assertEqual(router.db_for_read(Account), "replica_1")
+            self.assertEqual(router.db_for_write(Account), "default")
+
+        # 다음 요청으로 새지 않음
+        self.assertEqual(router.db_for_read(Account), "default")
+        self.assertEqual(replicas.read_alias(), "default")
+
+    @override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"])
+    def test_each_user_always_reads_from_the_same_replica(self):
+        self.assertEqual([replicas.replica_for(user_id) for user_id in (1, 2, 3, 4)], ["replica_2", "replica_1"] * 2)
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReadYourWritesTests(AccountsMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user()
+        self.account = self.make_account(self.user, balance="100.00")
+        self.client = self.client_for(self.user)
+        # 테스트 DB 에는 복제본이 없으므로 라우터가 고른 별칭만 기록하고 실제 쿼리는 default 로
+        self.chosen = []
+        read_alias = replicas.read_alias
+
+        def db_for_read(router, model, **hints):
+            self.chosen.append(read_alias())
+            return "default"
+
+        patcher = mock.patch.object(replicas.ReplicaRouter, "db_for_read", db_for_read)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def reads(self, method, url, data=None):
+        self.chosen.clear()
+        response = getattr(self.client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 400, response.content)
+        return set(self.chosen)
+
+    def deposit(self):
+        payload = {
+            "account": self.account.pk,
+            "deposit_and_withdrawal_type": "DEPOSIT",
+            "transaction_amount": "10.00",
+            "transaction_type": "ATM",
+        }
+        return self.client.post(reverse("transaction-list"), payload, format="json")
+
+    def test_reads_use_the_replica_until_the_user_writes(self):
+        self.assertEqual(self.reads("get", reverse("account-list-create")), {"replica_1"})
+        self.assertEqual(self.reads("get", reverse("transaction-list")), {"replica_1"})
+
+        response = self.deposit()
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(replicas.PIN_COOKIE, response.cookies)
+        self.assertEqual(self.reads("get", reverse("transaction-list") + "?page_size=1"), {"default"})
+        self.assertEqual(self.reads("get", reverse("account-detail", args=[self.account.pk])), {"default"})
+
+    def test_pin_is_kept_by_the_cookie_or_the_shared_pin(self):
+        self.deposit()
+
+        # 다른 컨테이너: 캐시의 고정은 없어도 쿠키로
+        cache.delete(replicas._pin_key(self.user.pk))
+        self.assertEqual(self.reads("get", reverse("transaction-list")), {"default"})
+
+        # 쿠키 없이 온 요청: 캐시의 고정으로
+        self.deposit()
+        self.client.cookies.pop(replicas.PIN_COOKIE)
+        self.assertEqual(self.reads("get", reverse("account-list-create")), {"default"})
+
+        # 고정이 끝나면 다시 복제본
+        cache.delete(replicas._pin_key(self.user.pk))
+        self.assertEqual(self.reads("get", reverse("account-list-create") + "?page_size=1"), {"replica_1"})
+
+    def test_account_delete_pins_the_user(self):
+        other = self.make_account(self.user, "1001")
+
+        self.client.delete(reverse("account-detail", args=[other.pk]))
+
+        self.assertTrue(cache.get(replicas._pin_key(self.user.pk)))
+        self.assertEqual(self.reads("get", reverse("account-list-create")), {"default"})
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_nothing_is_routed_without_replicas(self):
+        self.assertEqual(self.reads("get", reverse("transaction-list")), {"default"})
+
+
+# =========================
+# 계좌 이체 (TransferViewSet, accounts.posting.transfer_many)
+# =========================
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class TransferTests(AccountsMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.sender = self.make_user("sender@test.local")
+        self.source = self.make_account(self.sender, "1000", balance="100.00")
+        self.recipient = self.make_user("recipient@test.local")
+        self.target = self.make_account(self.recipient, "2000")
+        self.bystander = self.make_user("bystander@test.local")
+        self.other = self.make_account(self.bystander, "3000")
+        self.client = self.client_for(self.sender)
+
+    def item(self, number, amount):
+        return {"from_account": self.source.pk, "to_account_number": number, "transaction_amount": amount}
+
+    def pinned(self, user):
+        return bool(cache.get(replicas._pin_key(user.pk)))
+
+    def balances(self):
+        return [account.balance for account in Account.objects.order_by("account_number")]
+
+    def test_transfer_pins_sender_and_recipient(self):
+        response = self.client.post(reverse("transfer-list"), self.item("2000", "30.00"), format="json")
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(self.balances(), [Decimal("70.00"), Decimal("30.00"), Decimal("0.00")])
+        self.assertEqual(Transaction.objects.filter(transfer=response.data["transfer"]).count(), 2)
+        self.assertEqual((self.pinned(self.sender), self.pinned(self.recipient)), (True, True))
+        self.assertFalse(self.pinned(self.bystander))
+        self.assertIn(replicas.PIN_COOKIE, response.cookies)
+
+    def test_rejected_transfer_does_not_pin_the_recipient(self):
+        response = self.client.post(reverse("transfer-list"), self.item("2000", "500.00"), format="json")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.balances(), [Decimal("100.00"), Decimal("0.00"), Decimal("0.00")])
+        self.assertFalse(self.pinned(self.recipient))
+
+    def test_bulk_pins_recipients_of_posted_transfers_only(self):
+        items = [self.item("2000", "60.00"), self.item("3000", "60.00")]
+        response = self.client.post(reverse("transfer-bulk"), items, format="json")
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([row["status"] for row in response.data["results"]], ["created", "rejected"])
+        self.assertEqual(self.balances(), [Decimal("40.00"), Decimal("60.00"), Decimal("0.00")])
+        self.assertEqual((self.pinned(self.sender), self.pinned(self.recipient)), (True, True))
+        self.assertFalse(self.pinned(self.bystander))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_nothing_is_pinned_without_replicas(self):
+        response = self.client.post(reverse("transfer-list"), self.item("2000", "30.00"), format="json")
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual((self.pinned(self.sender), self.pinned(self.recipient)), (False, False))
+        self.assertNotIn(replicas.PIN_COOKIE, response.cookies)
+
+
+@skipUnless(connection.vendor == "postgresql", "행 락 동시성은 PostgreSQL 에서만 확인")
+class ConcurrentTransferTests(AccountsMixin, TransactionTestCase):
+    ROUNDS = 10
+
+    def test_opposite_transfers_do_not_deadlock(self):
+        # 서로에게 동시에 이체: 관련 계좌를 pk 순서로 잠그지 않으면 락 순서가 엇갈려 교착 (500)
+        users = [self.make_user(f"peer-{i}@test.local") for i in range(2)]
+        accounts = [self.make_account(user, f"{i + 1}000", balance="100.00") for i, user in enumerate(users)]
+        barrier = threading.Barrier(2)
+        statuses = []
+
+        def send(sender, source, target):
+            client = self.client_for(sender)
+            items = [
+                {"from_account": source.pk, "to_account_number": target.account_number, "transaction_amount": "1.00"}
+            ] * 5
+            try:
+                for _ in range(self.ROUNDS):
+                    barrier.wait()
+                    single = client.post(reverse("transfer-list"), items[0], format="json")
+                    bulk = client.post(reverse("transfer-bulk"), items, format="json")
+                    statuses.extend([single.status_code, bulk.status_code])
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=send, args=(users[0], accounts[0], accounts[1])),
+            threading.Thread(target=send, args=(users[1], accounts[1], accounts[0])),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuses), [200] * self.ROUNDS * 2 + [201] * self.ROUNDS * 2)
+        # 양쪽이 같은 금액을 주고받았으므로 그대로
+        self.assertEqual(
+            [account.balance for account in Account.objects.order_by("pk")], [Decimal("100.00"), Decimal("100.00")]
+        )
+        self.assertEqual(Transaction.objects.filter(transaction_type="TRANSFER").count(), self.ROUNDS * 2 * 6 * 2)
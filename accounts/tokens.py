@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from . import revocation
+
+
+class RevocableAccessToken(AccessToken):
+    def check_blacklist(self):
+        if revocation.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def verify(self):
+        self.check_blacklist()
+        super().verify()
+
+    def blacklist(self):
+        """
+        access 토큰은 OutstandingToken 에 등록되지 않으므로 여기서 같이 만든다.
+        만료되면 purge_tokens 가 함께 지운다.
+        """
+        jti = self.payload[api_settings.JTI_CLAIM]
+        expires_at = datetime_from_epoch(self.payload["exp"])
+        user = (
+            get_user_model()
+            .objects.filter(**{api_settings.USER_ID_FIELD: self.payload.get(api_settings.USER_ID_CLAIM)})
+            .first()
+        )
+        token, _created = OutstandingToken.objects.get_or_create(
+            jti=jti,
+            defaults={"user": user, "created_at": self.current_time, "token": str(self), "expires_at": expires_at},
+        )
+        result = BlacklistedToken.objects.get_or_create(token=token)
+        revocation.mark(jti, expires_at)
+        return result
+
+
+class RevocableRefreshToken(RefreshToken):
+    """블랙리스트 확인을 DB 대신 revocation 인덱스로 하는 refresh 토큰."""
+
+    access_token_class = RevocableAccessToken
+
+    def check_blacklist(self):
+        if revocation.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        revocation.mark(self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload["exp"]))
+        return result
@@ -1,13 +1,28 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import AccountListCreateView, AccountRetrieveDestroyView, TransactionViewSet
+from .views import (
+    AccountListCreateView,
+    AccountRetrieveDestroyView,
+    AccountStatementView,
+    AsyncAccountListView,
+    AsyncTransactionDetailView,
+    AsyncTransactionListView,
+    TransactionViewSet,
+    TransferViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"transactions", TransactionViewSet, basename="transaction")
+router.register(r"transfers", TransferViewSet, basename="transfer")
 
 urlpatterns = [
     path("accounts/", AccountListCreateView.as_view(), name="account-list-create"),
     path("accounts/<int:pk>/", AccountRetrieveDestroyView.as_view(), name="account-detail"),
+    path("accounts/<int:pk>/statement/", AccountStatementView.as_view(), name="account-statement"),
+    # ASGI 로 띄웠을 때 쓰는 async 조회 API (응답은 위와 동일)
+    path("async/accounts/", AsyncAccountListView.as_view(), name="async-account-list"),
+    path("async/transactions/", AsyncTransactionListView.as_view(), name="async-transaction-list"),
+    path("async/transactions/<int:pk>/", AsyncTransactionDetailView.as_view(), name="async-transaction-detail"),
     path("", include(router.urls)),
 ]
@@ -0,0 +1,83 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+# 프로세스 로컬 LRU 는 다른 프로세스의 무효화를 바로 알 수 없으므로 TTL 을 짧게 둔다 (0 이면 사용 안 함)
+LOCAL_TTL = getattr(settings, "AUTH_USER_CACHE_LOCAL_TTL", 5)
+LOCAL_MAX_ENTRIES = getattr(settings, "AUTH_USER_CACHE_LOCAL_MAX_ENTRIES", 1024)
+# 공유 캐시 층은 settings.SHARED_CACHE 일 때만 쓴다 (아니면 다른 워커의 무효화가 SHARED_TTL 동안 전달되지 않으므로
+# 프로세스 로컬 LRU 만 씀)
+SHARED_TTL = getattr(settings, "AUTH_USER_CACHE_TTL", 300)
+
+
+class _LocalLRU:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local = _LocalLRU(LOCAL_MAX_ENTRIES)
+
+
+def _key(user_id):
+    return f"auth-user:{user_id}"
+
+
+def get(user_id):
+    """로컬 LRU → 공유 캐시 순으로 유저를 찾는다. 없으면 None."""
+    key = _key(user_id)
+    user = _local.get(key) if LOCAL_TTL else None
+    if user is None:
+        user = cache.get(key) if settings.SHARED_CACHE else None
+        if user is None:
+            return None
+        if LOCAL_TTL:
+            _local.set(key, user, LOCAL_TTL)
+    # 요청마다 user 객체를 수정할 수 있으므로 캐시에 든 객체를 그대로 넘기지 않음
+    return copy.copy(user)
+
+
+def store(user):
+    key = _key(user.pk)
+    if settings.SHARED_CACHE:
+        cache.set(key, user, SHARED_TTL)
+    if LOCAL_TTL:
+        _local.set(key, copy.copy(user), LOCAL_TTL)
+
+
+def invalidate(user_id):
+    key = _key(user_id)
+    _local.delete(key)
+    cache.delete(key)
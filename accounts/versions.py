@@ -0,0 +1,44 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+# 버전 값이 캐시에서 사라지면 새 값으로 다시 시작하므로 TTL 은 적당히 길게만
+VERSION_TTL = getattr(settings, "DATA_VERSION_TTL", 7 * 24 * 3600)
+
+
+def _key(user_id):
+    return f"data-version:{user_id}"
+
+
+def _new_version():
+    return uuid.uuid4().hex[:16]
+
+
+def current(user_id):
+    """
+    user 의 데이터(계좌/거래) 버전. 쓰기가 있을 때마다 바뀐다.
+
+    증가하는 숫자 대신 임의 값을 쓰므로 캐시에서 지워졌다 다시 만들어져도 예전 버전(ETag)과 겹치지 않는다.
+    캐시가 워커끼리 공유되지 않으면(settings.SHARED_CACHE=False) 다른 워커의 bump 가 보이지 않으므로 매번 새 값.
+    """
+    if not settings.SHARED_CACHE:
+        return _new_version()
+    version = cache.get(_key(user_id))
+    if version is None:
+        # 동시에 여러 요청이 만들어도 하나만 남음
+        cache.add(_key(user_id), _new_version(), VERSION_TTL)
+        version = cache.get(_key(user_id))
+    # 캐시를 쓸 수 없는 환경(DummyCache 등)이면 매번 다른 값 → 304/캐시 적중 없음
+    return version or _new_version()
+
+
+def bump(user_id):
+    cache.set(_key(user_id), _new_version(), VERSION_TTL)
+
+
+def bump_many(user_ids):
+    # 관리 명령처럼 여러 유저의 데이터를 한 번에 고친 뒤 (캐시 왕복을 줄이려고 set_many)
+    versions = {_key(user_id): _new_version() for user_id in user_ids}
+    if versions:
+        cache.set_many(versions, VERSION_TTL)
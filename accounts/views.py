@@ -1,33 +1,86 @@
+import io
+import json
+from datetime import datetime
 from decimal import Decimal
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.contrib.auth.signals import user_login_failed
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import transaction  # DB 트랜잭션 보장을 위해
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters as drf_filters
-from rest_framework import generics, status, viewsets
-from rest_framework.exceptions import PermissionDenied
+from rest_framework import generics, mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, AuthenticationFailed, PermissionDenied, ValidationError
 from rest_framework.generics import ListCreateAPIView, RetrieveDestroyAPIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from accounts.models import Account, User
 from accounts.serializers import (
     AccountSerializer,
+    AccountStatementQuerySerializer,
+    AccountStatementSerializer,
     CustomTokenObtainPairSerializer,
+    LoginSerializer,
+    RevocableTokenRefreshSerializer,
+    TransactionSummaryQuerySerializer,
+    TransactionSummarySerializer,
     UserSerializer,
     UserSignUpSerializer,
 )
 
+from . import dbpool, ingest, ledger, metrics, outbox, posting, replicas, rollups, snapshots, versions
+from .archive import ArchivedMonthsMixin
+from .asyncviews import AsyncReadView
 from .filters import TransactionFilter
+from .hashing import HasherBusy, hasher_pool
+from .idempotency import IdempotentCreateMixin
 from .models import Transaction
-from .serializers import TransactionSerializer
+from .renderers import CSVRenderer, NDJSONRenderer
+from .replicas import ReplicaReadMixin
+from .responsecache import VersionedListCacheMixin
+from .search import TransactionSearchFilter
+from .serializers import TransactionSerializer, TransferSerializer
+from .tokens import RevocableAccessToken, RevocableRefreshToken
+
+
+# =========================
+# 헬스 체크 (로드밸런서 / 기동 시간 측정용, 인증·DB 접근 없음)
+# =========================
+def healthz(request):
+    return JsonResponse({"status": "ok"})
+
+
+# =========================
+# Prometheus 지표 (모든 워커 프로세스 합산, accounts.metrics)
+# =========================
+def prometheus_metrics(request):
+    if settings.METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return HttpResponse(status=401)
+    return HttpResponse(metrics.exposition(), content_type=metrics.CONTENT_TYPE)
+
+
+# =========================
+# 운영 지표 (관리자 전용, 응답한 워커 프로세스 기준)
+# =========================
+class RuntimeStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"database": dbpool.stats(), "login_hasher": hasher_pool.stats()})
 
 
 # =========================
@@ -39,13 +92,95 @@ class CustomTokenObtainPairView(TokenObtainPairView):
 
     def post(self, request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
-        token = response.data["access"]
-        refresh_token = response.data.get("refresh")
-        response.set_cookie(key="access_token", value=token, httponly=True, secure=False, samesite="Lax")
-        response.set_cookie(key="refresh_token", value=refresh_token, httponly=True, secure=False, samesite="Lax")
+        _set_token_cookies(response, response.data["access"], response.data.get("refresh"))
         return response
 
 
+def _set_token_cookies(response, access, refresh):
+    response.set_cookie(key="access_token", value=access, httponly=True, secure=False, samesite="Lax")
+    response.set_cookie(key="refresh_token", value=refresh, httponly=True, secure=False, samesite="Lax")
+
+
+# =========================
+# 비동기 로그인 / 토큰 갱신 (ASGI)
+# =========================
+def _error_response(exc):
+    # DRF 예외 핸들러와 같은 모양의 에러 응답
+    data = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+    response = JsonResponse(data, status=exc.status_code, safe=False, json_dumps_params={"ensure_ascii": False})
+    if isinstance(exc, HasherBusy):
+        response["Retry-After"] = "1"
+    return response
+
+
+def _json_body(request):
+    try:
+        return json.loads(request.body or b"{}")
+    except ValueError:
+        raise ValidationError({"detail": "JSON 형식이 아닙니다."})
+
+
+@csrf_exempt
+@require_POST
+async def async_login(request):
+    """
+    CustomTokenObtainPairView 와 같은 응답을 주는 async 로그인.
+
+    비밀번호 해시 검사는 이벤트 루프도, 다른 요청을 처리하는 스레드도 아닌
+    hasher_pool(동시 실행/대기열 수 제한)에서 돌린다. 대기열이 가득 차면 503.
+    """
+    try:
+        serializer = LoginSerializer(data=_json_body(request))
+        serializer.is_valid(raise_exception=True)
+        email, password = serializer.validated_data["email"], serializer.validated_data["password"]
+
+        user = await User.objects.filter(email=email).afirst()
+        if user is None:
+            # 없는 이메일도 해시 한 번만큼 시간을 써서 응답 시간으로 가입 여부를 알 수 없게 함 (ModelBackend 와 동일)
+            await hasher_pool.run(make_password, password)
+            valid = must_update = False
+        else:
+            valid, must_update = await hasher_pool.run(verify_password, password, user.password)
+        if not valid or not user.is_active:
+            # sync 로그인(django.contrib.auth.authenticate)과 같은 실패 신호 (비밀번호는 가림)
+            await user_login_failed.asend(
+                sender="django.contrib.auth",
+                credentials={"email": email, "password": "********************"},
+                request=request,
+            )
+            raise AuthenticationFailed(
+                CustomTokenObtainPairSerializer.default_error_messages["no_active_account"], "no_active_account"
+            )
+        if must_update:
+            # 해시 알고리즘/반복 횟수가 바뀐 경우 새 해시로 저장 (check_password 의 setter 와 같은 동작)
+            user.password = await hasher_pool.run(make_password, password)
+            await user.asave(update_fields=["password"])
+
+        refresh = await sync_to_async(CustomTokenObtainPairSerializer.get_token)(user)
+    except APIException as exc:
+        return _error_response(exc)
+
+    data = {"refresh": str(refresh), "access": str(refresh.access_token)}
+    response = JsonResponse(data)
+    _set_token_cookies(response, data["access"], data["refresh"])
+    return response
+
+
+@csrf_exempt
+@require_POST
+async def async_token_refresh(request):
+    """TokenRefreshView 의 async 버전. 검증(블랙리스트/유저 조회)은 짧은 DB 작업이라 sync 스레드에서 그대로 실행."""
+    try:
+        serializer = RevocableTokenRefreshSerializer(data=_json_body(request))
+        try:
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+        except TokenError as exc:
+            raise InvalidToken(exc.args[0])
+    except APIException as exc:
+        return _error_response(exc)
+    return JsonResponse(serializer.validated_data)
+
+
 # =========================
 # JWT 로그아웃
 # =========================
@@ -54,9 +189,19 @@ class LogoutView(APIView):
         refresh_token = request.COOKIES.get("refresh_token")
         if refresh_token is None:
             return Response({"detail": "refresh token 없음"}, status=status.HTTP_400_BAD_REQUEST)
-        token = RefreshToken(refresh_token)
+        token = RevocableRefreshToken(refresh_token)
         token.blacklist()
 
+        # access 토큰도 만료 전까지 다시 쓸 수 없게 폐기 (이미 만료/폐기된 토큰이면 무시)
+        access_token = request.auth if isinstance(request.auth, RevocableAccessToken) else None
+        if access_token is None and request.COOKIES.get("access_token"):
+            try:
+                access_token = RevocableAccessToken(request.COOKIES["access_token"])
+            except TokenError:
+                pass
+        if access_token is not None:
+            access_token.blacklist()
+
         response = Response({"detail": "로그아웃 완료"}, status=status.HTTP_200_OK)
         response.delete_cookie("refresh_token")
         response.delete_cookie("access_token")
@@ -110,106 +255,236 @@ class UserDeleteAPIView(generics.DestroyAPIView):
         return Response({"message": "Deleted successfully"}, status=status.HTTP_200_OK)
 
 
-class TransactionViewSet(viewsets.ModelViewSet):
+# 거래내역 내보내기 컬럼 (응답 필드명: 조회 경로)
+EXPORT_COLUMNS = {
+    "id": "id",
+    "user_email": "account__user__email",
+    "account_number": "account__account_number",
+    "deposit_and_withdrawal_type": "deposit_and_withdrawal_type",
+    "transaction_amount": "transaction_amount",
+    "amount_after_transaction": "amount_after_transaction",
+    "transaction_type": "transaction_type",
+    "transaction_timestamp": "transaction_timestamp",
+    "account": "account_id",
+    "reverses": "reverses",
+    "transfer": "transfer",
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+class TransactionViewSet(
+    ReplicaReadMixin, VersionedListCacheMixin, ArchivedMonthsMixin, IdempotentCreateMixin, viewsets.ModelViewSet
+):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
 
     # DjangoFilterBackend를 통해 FilterSet을 사용
-    filter_backends = [DjangoFilterBackend, drf_filters.OrderingFilter, drf_filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, drf_filters.OrderingFilter, TransactionSearchFilter]
     filterset_class = TransactionFilter
 
-    # 검색/정렬 가능 필드
-    search_fields = ["transaction_type", "deposit_and_withdrawal_type"]
+    # 검색(?search=)은 메모 단어 + 거래 방식/입출금 타입 (TransactionSearchFilter, 인덱스 사용)
+    # 정렬 가능 필드
     ordering_fields = ["transaction_amount", "transaction_timestamp"]
     ordering = ["-transaction_timestamp"]
 
     def get_queryset(self):
         # 로그인 사용자와 연결된 계좌의 거래만 보여줌
+        # 시리얼라이저가 account.account_number / account.user.email 을 읽으므로 한 번에 JOIN 해서 가져옴
         user = self.request.user
-        return Transaction.objects.filter(account__user=user).order_by("-transaction_timestamp")
+        return (
+            Transaction.objects.filter(account__user=user)
+            .select_related("account__user")
+            .order_by("-transaction_timestamp")
+        )
 
     def perform_create(self, serializer):
-        # 생성 시: 계좌 소유자 확인 및 잔액 반영
+        # 생성 시: 계좌 소유자 확인 후 잔액 반영은 posting 엔진에 맡김
         account = serializer.validated_data["account"]
-        amount = serializer.validated_data["transaction_amount"]
-        deposit_or_withdrawal = serializer.validated_data["deposit_and_withdrawal_type"]
 
-        if account.user != self.request.user:
+        if account.user_id != self.request.user.pk:
             raise PermissionDenied("본인 계좌에 대해서만 거래내역을 생성할 수 있습니다.")
 
-        # 입금/출금에 따른 잔액 처리
-        if deposit_or_withdrawal == "DEPOSIT":
-            account.balance += amount
-        else:  # 출금
-            if account.balance < amount:
-                raise PermissionDenied("잔액이 부족합니다.")
-            account.balance -= amount
-
-        account.save()
-        # 실제로 저장될 때 거래 후 잔액을 넣어줌
-        serializer.save(amount_after_transaction=account.balance)
+        posting.post(serializer)
 
     def perform_update(self, serializer):
         instance = serializer.instance
         account = instance.account
 
         # 소유자 확인
-        if account.user != self.request.user:
+        if account.user_id != self.request.user.pk:
             raise PermissionDenied("본인 계좌의 거래만 수정할 수 있습니다.")
 
+        # 이체의 한쪽만 바꾸면 두 계좌 잔액이 어긋남
+        if instance.transfer is not None:
+            raise PermissionDenied("이체 거래는 수정할 수 없습니다.")
+
         # 계좌 변경 금지
         if "account" in serializer.validated_data and serializer.validated_data["account"] != account:
             raise PermissionDenied("거래의 계좌 변경은 허용되지 않습니다.")
 
-        old_amount = instance.transaction_amount
-        old_type = instance.deposit_and_withdrawal_type
+        # 원장 모드면 원래 거래는 그대로 두고 상쇄 거래 + 바뀐 값의 새 거래를 덧붙임 (응답은 새 거래)
+        posting.repost(serializer)
 
-        new_amount = serializer.validated_data.get("transaction_amount", old_amount)
-        new_type = serializer.validated_data.get("deposit_and_withdrawal_type", old_type)
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
 
-        # 효과 계산 함수
-        def effect(t, amt):
-            return amt if t == "DEPOSIT" else -amt
+        # 소유자 확인
+        if instance.account.user_id != request.user.pk:
+            raise PermissionDenied("본인 계좌의 거래만 삭제할 수 있습니다.")
+        if instance.transfer is not None:
+            raise PermissionDenied("이체 거래는 삭제할 수 없습니다.")
 
-        # 잔액에 적용될 변화량(delta)
-        delta = effect(new_type, new_amount) - effect(old_type, old_amount)
-        if not isinstance(delta, Decimal):
-            delta = Decimal(delta)
+        # 원장 모드면 행을 지우지 않고 상쇄 거래를 덧붙임
+        posting.reverse(instance)
 
-        with transaction.atomic():
-            # 잔액이 음수가 되면 차단
-            if delta < Decimal("0") and (account.balance + delta) < Decimal("0"):
-                raise PermissionDenied("수정 결과 잔액이 부족합니다.")
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-            account.balance += delta
-            account.save()
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if ledger.LEDGER_MODE and self.action == "retrieve" and response.status_code == 200:
+            # 원장 모드의 거래 행은 한 번 쓰면 바뀌지 않으므로 상세 응답은 재검증 없이 캐시해도 됨
+            response["Cache-Control"] = f"private, max-age={ledger.ENTRY_CACHE_SECONDS}, immutable"
+        return response
 
-            # amount_after_transaction 최신화
-            serializer.save(amount_after_transaction=account.balance)
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        # 대량 등록: NDJSON 또는 JSON 배열 본문을 스트리밍으로 읽어 청크 단위로 반영하고,
+        # 행별 결과를 NDJSON 으로 바로바로 흘려보냄 (본문/결과 크기와 무관하게 메모리 일정)
+        accounts = {account.pk: account for account in Account.objects.filter(user=request.user)}
+        results = self._bump_version_after(ingest.ingest(request.stream or io.BytesIO(), accounts), request.user.pk)
 
-    def destroy(self, request, *args, **kwargs):
-        instance = self.get_object()
-        account = instance.account
+        return StreamingHttpResponse(NDJSONRenderer().stream(None, results), content_type=NDJSONRenderer.media_type)
 
-        # 소유자 확인
-        if account.user != request.user:
-            raise PermissionDenied("본인 계좌의 거래만 삭제할 수 있습니다.")
+    @staticmethod
+    def _bump_version_after(results, user_id):
+        # 거래가 응답을 스트리밍하는 동안 반영되므로, 스트림이 끝나면(중간에 끊겨도) 데이터 버전을 한 번 더 바꿈
+        try:
+            yield from results
+        finally:
+            versions.bump(user_id)
+
+    @action(detail=False, methods=["get"], url_path="export", renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        # 전체 거래내역 내려받기: ?format=csv|ndjson (목록과 같은 필터/검색/정렬 파라미터 사용)
+        # 시리얼라이저 객체를 만들지 않고 서버 사이드 커서로 청크씩 읽어 바로 흘려보내므로 메모리가 일정함
+        # 기간 필터가 아카이브된 달에 걸치면 아카이브 행도 같은 정렬 순서로 끼워 넣음
+        # 스트리밍은 dispatch 의 request_scope() 가 끝난 뒤에 일어나므로 읽기 DB 를 지금 묶어 둠 (복제본 읽기 유지)
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*EXPORT_COLUMNS.values())
+        queryset = queryset.using(replicas.read_alias())
+        values = self.merge_archived_values(
+            queryset, list(EXPORT_COLUMNS.values()), queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        rows = (dict(zip(EXPORT_COLUMNS, self._export_values(row))) for row in values)
 
-        with transaction.atomic():
-            # 거래 영향 롤백
-            if instance.deposit_and_withdrawal_type == "DEPOSIT":
-                # 입금 거래였으므로 삭제 시 잔액에서 빼야 함
-                if account.balance < instance.transaction_amount:
-                    raise PermissionDenied("해당 거래를 삭제하면 잔액이 음수가 되어 삭제 불가.")
-                account.balance -= instance.transaction_amount
-            else:
-                # 출금 거래였으므로 삭제 시 잔액에 다시 더해야 함
-                account.balance += instance.transaction_amount
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(list(EXPORT_COLUMNS), rows),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = f'attachment; filename="transactions.{renderer.format}"'
+        return response
 
-            account.save()
-            instance.delete()
+    @action(detail=False, methods=["get"], url_path="summary")
+    def summary(self, request):
+        # 월 x 거래 방식 x 입출금 타입 별 합계: ?account=<pk>&from=YYYY-MM&to=YYYY-MM
+        # 거래 테이블이 아니라 쓰기 시점에 갱신되는 월별 집계(MonthlyRollup)에서 바로 읽음
+        query = TransactionSummaryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        rows = rollups.summary(request.user, params.get("account"), params.get("from"), params.get("to"))
+        return Response({"results": TransactionSummarySerializer(rows, many=True).data})
+
+    @staticmethod
+    def _export_values(values):
+        # TransactionSerializer 응답과 같은 표기(금액은 문자열, 일시는 현지 시각 ISO 8601)
+        exported = []
+        for value in values:
+            if isinstance(value, datetime):
+                value = timezone.localtime(value).isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            exported.append(value)
+        return exported
 
-        return Response(status=status.HTTP_204_NO_CONTENT)
+
+# =========================
+# 계좌 이체 (출금 + 입금을 한 DB 트랜잭션으로)
+# =========================
+class TransferViewSet(ReplicaReadMixin, IdempotentCreateMixin, mixins.CreateModelMixin, viewsets.GenericViewSet):
+    serializer_class = TransferSerializer
+    permission_classes = [IsAuthenticated]
+
+    # 일괄 이체 한 요청의 최대 건수 (모두 한 트랜잭션에서 관련 계좌를 잠그고 처리)
+    max_batch_size = 500
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["accounts"] = {account.pk: account for account in Account.objects.filter(user=self.request.user)}
+        return context
+
+    def perform_create(self, serializer):
+        (outcome,) = posting.transfer_many([serializer.validated_data])
+        if isinstance(outcome, posting.InsufficientBalance):
+            raise outcome
+        serializer.instance = self._result(serializer.validated_data, outcome)
+        self._after_transfer([serializer.validated_data])
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        # 이체 목록(JSON 배열)을 한 트랜잭션에서 반영하고 행별 결과를 돌려줌 (형식은 거래 일괄 등록과 같음)
+        return self.run_idempotent(request, self._bulk)
+
+    def _bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({"detail": "이체 목록(JSON 배열)을 보내야 합니다."})
+        if len(items) > self.max_batch_size:
+            raise ValidationError({"detail": f"한 번에 최대 {self.max_batch_size}건까지 이체할 수 있습니다."})
+
+        context = self.get_serializer_context()
+        numbers = {item.get("to_account_number") for item in items if isinstance(item, dict)}
+        recipients = Account.objects.filter(
+            account_number__in=[number for number in numbers if isinstance(number, str)]
+        )
+        context["recipients"] = {account.account_number: account for account in recipients}
+
+        results, valid = [None] * len(items), []
+        for index, item in enumerate(items):
+            serializer = TransferSerializer(data=item, context=context)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {"index": index, "status": "invalid", "errors": serializer.errors}
+
+        posted = []
+        for (index, data), outcome in zip(valid, posting.transfer_many([data for _, data in valid])):
+            if isinstance(outcome, posting.InsufficientBalance):
+                results[index] = {"index": index, "status": "rejected", "detail": outcome.detail}
+            else:
+                transfer = TransferSerializer(self._result(data, outcome), context=context).data
+                results[index] = {"index": index, "status": "created", **transfer}
+                posted.append(data)
+        self._after_transfer(posted)
+        return Response({"results": results})
+
+    @staticmethod
+    def _result(data, legs):
+        withdrawal, _ = legs
+        return {**data, "transfer": withdrawal.transfer, "withdrawal": withdrawal}
+
+    def _after_transfer(self, transfers):
+        # 보내는 유저와 받는 계좌 소유자의 계좌/거래 목록 캐시 무효화 (VersionedListCacheMixin 처럼 커밋 뒤에 한 번 더)
+        # 복제본이 있으면 그 유저들의 조회를 primary 로 고정 (받는 사람도 복제 지연으로 입금이 안 보이지 않게)
+        user_ids = {self.request.user.pk} | {data["to_account"].user_id for data in transfers}
+        for user_id in user_ids:
+            versions.bump(user_id)
+            transaction.on_commit(lambda user_id=user_id: versions.bump(user_id))
+            if settings.DATABASE_REPLICAS:
+                pinned_until = replicas.pin(user_id)
+                if user_id == self.request.user.pk:
+                    # 보내는 유저는 쿠키도 (ReplicaReadMixin.finalize_response)
+                    self.pinned_until = pinned_until
 
 
 # =========================
@@ -221,19 +496,22 @@ class UserSignUpView(generics.CreateAPIView):
     permission_classes = [AllowAny]
 
     def perform_create(self, serializer):
-        # 처음엔 비활성화 상태로 저장
-        user = serializer.save(is_active=False)
-        token = default_token_generator.make_token(user)
-        uid64 = urlsafe_base64_encode(force_bytes(user.pk))
-
-        activation_link = f"http://localhost:8000/accounts/{uid64}/{token}/"
-
-        send_mail(
-            subject="[ViralMarketingProject] 회원가입 인증 메일",
-            message=f"아래 링크를 클릭해 계정을 활성화하세요:\n{activation_link}",
-            from_email="noreply@myproject.com",
-            recipient_list=[user.email],
-        )
+        # 메일은 요청 안에서 바로 보내지 않고 유저와 같은 트랜잭션으로 발송 대기열(outbox)에 넣음
+        # 실제 발송은 send_outbox 워커가 담당 → 느린 SMTP 가 gunicorn 워커를 붙잡지 않음
+        with transaction.atomic():
+            # 처음엔 비활성화 상태로 저장
+            user = serializer.save(is_active=False)
+            token = default_token_generator.make_token(user)
+            uid64 = urlsafe_base64_encode(force_bytes(user.pk))
+
+            activation_link = f"http://localhost:8000/accounts/{uid64}/{token}/"
+
+            outbox.enqueue(
+                subject="[ViralMarketingProject] 회원가입 인증 메일",
+                message=f"아래 링크를 클릭해 계정을 활성화하세요:\n{activation_link}",
+                from_email="noreply@myproject.com",
+                recipient_list=[user.email],
+            )
 
 
 # =========================
@@ -258,14 +536,15 @@ class UserActivateView(APIView):
 
 
 # 계좌 목록/생성
-class AccountListCreateView(ListCreateAPIView):
+class AccountListCreateView(ReplicaReadMixin, VersionedListCacheMixin, IdempotentCreateMixin, ListCreateAPIView):
     serializer_class = AccountSerializer  # 요청 검증, 응답에 쓸 시리얼라이저 지정
     permission_classes = [IsAuthenticated]  # 로그인 된 사용자만 접근 가능하게
     http_method_names = ["get", "post"]  # 허용할 메서드 : get, post만
 
     # 본인의 계좌만 조회되도록
     def get_queryset(self):
-        return Account.objects.filter(user=self.request.user).order_by("-id")
+        # user_email 때문에 계좌마다 유저를 다시 읽지 않도록 JOIN
+        return Account.objects.filter(user=self.request.user).select_related("user").order_by("-id")
 
     # 생성 시 로그인 사용자를 소유자로 지정
     def perform_create(self, serializer):
@@ -273,11 +552,60 @@ class AccountListCreateView(ListCreateAPIView):
 
 
 # 계좌 조회/삭제
-class AccountRetrieveDestroyView(RetrieveDestroyAPIView):
+class AccountRetrieveDestroyView(ReplicaReadMixin, VersionedListCacheMixin, RetrieveDestroyAPIView):
     serializer_class = AccountSerializer
     permission_classes = [IsAuthenticated]
     http_method_names = ["get", "delete"]  # 허용할 메서드 : get, delete만
 
     # 조회/삭제 대상도 내 계좌만 가능하게
+    def get_queryset(self):
+        return Account.objects.filter(user=self.request.user).select_related("user")
+
+
+# 계좌 거래 명세 (기간별 개시/마감 잔액, 입출금 합계)
+class AccountStatementView(generics.GenericAPIView):
+    serializer_class = AccountStatementSerializer
+    permission_classes = [IsAuthenticated]
+
     def get_queryset(self):
         return Account.objects.filter(user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        account = self.get_object()
+
+        query = AccountStatementQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        # 기본값: 이번 달 1일 ~ 오늘
+        end = query.validated_data.get("to", timezone.localdate())
+        start = query.validated_data.get("from", end.replace(day=1))
+        if start > end:
+            raise ValidationError({"from": "조회 시작일(from)은 종료일(to)보다 늦을 수 없습니다."})
+
+        return Response(self.get_serializer(snapshots.statement(account, start, end)).data)
+
+
+# =========================
+# 비동기 조회 API (ASGI, async ORM)
+# 동작/응답은 같은 이름의 sync 뷰와 동일
+# =========================
+class AsyncTransactionListView(AsyncReadView):
+    view_class = TransactionViewSet
+    action = "list"
+
+
+class AsyncTransactionDetailView(AsyncReadView):
+    view_class = TransactionViewSet
+    action = "retrieve"
+
+
+class AsyncAccountListView(AsyncReadView):
+    view_class = AccountListCreateView
+    action = "list"
+
+
+class AsyncUserDetailView(AsyncReadView):
+    view_class = UserDetailAPIView
+
+    async def get_object(self, view):
+        # 본인 정보는 인증 단계에서 이미 읽어 둔 request.user
+        return view.request.user
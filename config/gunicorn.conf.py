@@ -0,0 +1,71 @@
+# gunicorn 설정 (scripts/run.sh 에서 `gunicorn -c config/gunicorn.conf.py` 로 사용)
+# 환경 변수로 조정: SERVER_MODE(wsgi/asgi), WEB_CONCURRENCY(워커 수 고정), WEB_MAX_WORKERS, PORT
+import math
+import os
+
+
+def _cpu_count():
+    """컨테이너에 실제로 할당된 CPU 수 (cgroup 쿼터 → CPU affinity 순으로 확인)."""
+    try:
+        # cgroup v2
+        quota, period = open("/sys/fs/cgroup/cpu.max").read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1
+        quota = int(open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read())
+        period = int(open("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read())
+        if quota > 0:
+            return max(1, math.ceil(quota / period))
+    except (OSError, ValueError):
+        pass
+    return len(os.sched_getaffinity(0))
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+if os.getenv("SERVER_MODE", "wsgi") == "asgi":
+    # 이벤트 루프가 동시 요청을 처리하므로 코어당 워커 하나 (uvicorn-worker 패키지)
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    workers = int(os.getenv("WEB_CONCURRENCY", 0)) or _cpu_count()
+else:
+    wsgi_app = "config.wsgi:application"
+    workers = int(os.getenv("WEB_CONCURRENCY", 0)) or min(_cpu_count() * 2 + 1, int(os.getenv("WEB_MAX_WORKERS", 12)))
+
+# 마스터에서 앱을 한 번만 로드하고 워커는 fork 로 복사 (워커마다 import 하지 않음)
+preload_app = True
+
+
+def on_starting(server):
+    # 지난 실행의 워커별 지표 파일 정리 (/metrics 가 죽은 워커 값을 계속 더하므로 기동 때만 비움)
+    from accounts import metrics
+
+    metrics.clear()
+
+
+def when_ready(server):
+    # preload 후, 워커를 만들기 전에 마스터에서 워밍업 → 모든 워커가 데워진 상태로 시작
+    from config.warmup import warm_up
+
+    warm_up()
+    server.log.info("warm-up 완료 (workers=%s)", server.num_workers)
+
+
+def post_worker_init(worker):
+    # DB 커넥션은 fork 후 워커마다 따로 열어야 함. 이 훅이 끝나야 워커가 요청을 받기 시작한다
+    from accounts import metrics
+    from config.warmup import warm_up_connections
+
+    warm_up_connections()
+    # 요청을 받기 전부터 게이지를 내보내도록
+    metrics.gauges.start()
+
+
+def child_exit(server, worker):
+    # 죽은 워커의 게이지가 /metrics 에 남지 않게 (마스터에서 호출)
+    from accounts import metrics
+
+    metrics.mark_process_dead(worker.pid)
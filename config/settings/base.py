@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import copy
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -46,6 +48,8 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = "accounts.User"
 
 MIDDLEWARE = [
+    # 다른 미들웨어 시간까지 재도록 맨 앞에 (accounts.metrics)
+    "accounts.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -84,6 +88,62 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+# 로컬에서 복제본 라우팅 확인용: SQLITE_REPLICA=db_replica.sqlite3
+# (db.sqlite3 를 복사해 두면 그 시점에 멈춘 "지연된 복제본" 처럼 동작)
+if os.getenv("SQLITE_REPLICA"):
+    DATABASES["replica_1"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / os.getenv("SQLITE_REPLICA"),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# 읽기 복제본 호스트: DB_REPLICA_HOSTS=replica1,replica2 (호스트 외 접속 정보는 primary 와 동일)
+DB_REPLICA_HOSTS = [host.strip() for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+
+
+def replica_aliases(databases):
+    # databases["default"] 를 복사해 DB_REPLICA_HOSTS 마다 replica_N 별칭을 붙이고 복제본 별칭 목록을 돌려준다
+    # DATABASES 를 다시 정의하는 설정 파일(dev/prod)은 정의한 뒤 DATABASE_REPLICAS = replica_aliases(DATABASES)
+    for index, host in enumerate(DB_REPLICA_HOSTS, 1):
+        databases[f"replica_{index}"] = {
+            **copy.deepcopy(databases["default"]),
+            "HOST": host,
+            "TEST": {"MIRROR": "default"},
+        }
+    return [alias for alias in databases if alias != "default"]
+
+
+# 읽기 전용 복제본 별칭 목록. ReplicaReadMixin 을 쓴 뷰의 조회만 복제본으로 간다 (accounts.replicas)
+# sqlite 는 호스트가 없으므로 SQLITE_REPLICA 만 본다
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["accounts.replicas.ReplicaRouter"]
+# 쓰기 요청 후 이 시간(초) 동안은 그 유저의 조회를 primary 에서 (복제 지연으로 잔액이 되돌아가 보이지 않게)
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "10"))
+
+# /metrics (Prometheus) - 워커 프로세스별 지표 파일을 두는 디렉터리. 모든 워커가 같은 경로를 봐야 한다
+# prometheus_client 멀티프로세스 모드는 import 시점에 PROMETHEUS_MULTIPROC_DIR 를 보므로 여기서 환경 변수로 넘긴다
+METRICS_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.getenv("METRICS_DIR", "/tmp/django_metrics"))
+# 설정하면 /metrics 는 "Authorization: Bearer <값>" 헤더가 있어야 응답
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# 거래 테이블 월 파티션 (PostgreSQL): 이번 달 이후 몇 달 치 파티션을 미리 만들어 둘지
+TRANSACTION_PARTITION_MONTHS_AHEAD = int(os.getenv("TRANSACTION_PARTITION_MONTHS_AHEAD", "3"))
+# archive_transactions 로 떼어 낸 달의 압축 파일 위치. 모든 웹 서버가 같은 경로(공유 볼륨)를 봐야 한다
+TRANSACTION_ARCHIVE_DIR = os.getenv("TRANSACTION_ARCHIVE_DIR", str(BASE_DIR / "archive"))
+# 원장 모드: 거래 수정/삭제를 상쇄 거래로 덧붙이고 (기존 행은 바꾸지 않음), 잔액은 체크포인트 + 이후 거래로 구함
+TRANSACTION_LEDGER_MODE = os.getenv("TRANSACTION_LEDGER_MODE", "0") == "1"
+# 마지막 체크포인트 이후 거래가 이만큼 쌓이면 다음 거래 때 새 체크포인트를 남김
+LEDGER_CHECKPOINT_INTERVAL = int(os.getenv("LEDGER_CHECKPOINT_INTERVAL", "500"))
+
+# CACHES 가 모든 워커/컨테이너가 같이 보는 캐시(Redis)인지. 운영 설정만 True
+# 기본 캐시(LocMem)는 프로세스마다 따로라 무효화가 다른 워커에 전달되지 않으므로, False 면 캐시 무효화에
+# 기대는 기능은 공유 캐시를 건너뛰거나 DB 를 본다 (accounts.usercache, accounts.revocation, accounts.versions)
+SHARED_CACHE = False
+
+# Idempotency-Key: 저장한 응답을 돌려주는 기간(초). 지난 키는 purge_idempotency_keys 가 지움
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", str(24 * 3600)))
+# 처리 중인 키가 이 시간(초)보다 오래되면 (처리하던 워커가 죽은 것으로 보고) 다음 재시도가 이어받음
+IDEMPOTENCY_CLAIM_TIMEOUT = int(os.getenv("IDEMPOTENCY_CLAIM_TIMEOUT", "60"))
 
 
 # Password validation
@@ -134,8 +194,12 @@ APPEND_SLASH = False
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
+    # 유저 조회를 캐시하는 JWT 인증 (accounts.usercache)
+    "DEFAULT_AUTHENTICATION_CLASSES": ("accounts.authentication.CachedJWTAuthentication",),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # 목록 API 는 (정렬 키, id) 기반 커서 페이지네이션 (OFFSET / COUNT(*) 없음)
+    "DEFAULT_PAGINATION_CLASS": "accounts.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
 }
 
 SIMPLE_JWT = {
@@ -146,4 +210,7 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # 블랙리스트 확인은 공유 캐시 + 블룸 필터 (accounts.revocation), 로그아웃한 access 토큰도 거부
+    "AUTH_TOKEN_CLASSES": ("accounts.tokens.RevocableAccessToken",),
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.RevocableTokenRefreshSerializer",
 }
@@ -1,6 +1,7 @@
 import os
 
 from config.settings.base import *  # noqa
+from config.settings.base import replica_aliases
 
 DEBUG = True
 ALLOWED_HOSTS = ["127.0.0.1", "localhost", "0.0.0.0"]
@@ -16,3 +17,6 @@ DATABASES = {
         "PORT": os.getenv("DB_PORT", "5432"),
     }
 }
+
+# 읽기 복제본 별칭 (DB_REPLICA_HOSTS, base.replica_aliases)
+DATABASE_REPLICAS = replica_aliases(DATABASES)
@@ -1,6 +1,9 @@
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 from config.settings.base import *  # noqa  # noqa
+from config.settings.base import replica_aliases
 
 DEBUG = False
 ALLOWED_HOSTS = ["*"]
@@ -16,6 +19,44 @@ DATABASES = {
     }
 }
 
+
+# DB 커넥션 재사용 (요청마다 새로 접속하지 않음)
+# - DB_POOL=1(기본)이면 프로세스별 커넥션 풀(psycopg[pool]). sync 워커는 한 번에 요청 하나만 처리하므로 작게 둔다
+# - 아니면 요청 사이에도 커넥션을 유지(CONN_MAX_AGE)하고 재사용 전에 살아 있는지 확인(CONN_HEALTH_CHECKS)
+if os.getenv("DB_POOL", "1") == "1":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+            # 빈 커넥션을 기다리는 최대 시간(초). 넘으면 PoolTimeout
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+        }
+    }
+    # 풀에서 꺼낼 때마다 커넥션 확인 (왕복 1회 추가, DB 재시작이 잦은 환경용)
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = os.getenv("DB_POOL_CHECK") == "1"
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# 읽기 복제본 별칭 (DB_REPLICA_HOSTS, base.replica_aliases)
+DATABASE_REPLICAS = replica_aliases(DATABASES)
+
+# 모든 워커/컨테이너가 같이 보는 캐시 (인증 유저 캐시, 토큰 폐기 표시, 데이터 버전/목록 캐시)
+# 무효화가 다른 컨테이너에도 전달되어야 하므로 컨테이너마다 따로인 캐시(LocMem, 파일)로는 띄우지 않는다
+if not os.getenv("REDIS_URL"):
+    raise ImproperlyConfigured(
+        "운영 설정에는 공유 캐시가 필요합니다: REDIS_URL 을 지정하세요 (예: redis://redis:6379/0)."
+    )
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }
+}
+SHARED_CACHE = True
+
 # # 이메일 발송에 사용할 백엔드
 # EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 #
@@ -5,27 +5,40 @@ from django.urls import include, path
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from accounts.views import (
+    AsyncUserDetailView,
     CustomTokenObtainPairView,
     LogoutView,
+    RuntimeStatsView,
     UserActivateView,
     UserDeleteAPIView,
     UserDetailAPIView,
     UserSignUpView,
     UserUpdateAPIView,
+    async_login,
+    async_token_refresh,
+    healthz,
+    prometheus_metrics,
 )
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("healthz/", healthz, name="healthz"),
+    path("metrics", prometheus_metrics, name="metrics"),
+    path("internal/stats/", RuntimeStatsView.as_view(), name="runtime-stats"),
     path("signup/", UserSignUpView.as_view(), name="signup"),
     path("activate/<str:uid64>/<str:token>/", UserActivateView.as_view(), name="activate"),
     path("login/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    # ASGI 로 띄웠을 때 쓰는 async 로그인 / 토큰 갱신 (응답은 위와 동일)
+    path("async/login/", async_login, name="async-login"),
+    path("async/token/refresh/", async_token_refresh, name="async-token-refresh"),
     path("accounts/<str:uid64>/<str:token>/", UserActivateView.as_view()),
     path("api/", include("accounts.urls")),
     # 테스트때문에 넣은거
     path("api-auth/", include("rest_framework.urls")),
     path("logout/", LogoutView.as_view(), name="logout"),
     path("profile/", UserDetailAPIView.as_view(), name="user-detail"),
+    path("async/profile/", AsyncUserDetailView.as_view(), name="async-user-detail"),
     path("profile/update/", UserUpdateAPIView.as_view(), name="user-update"),
     path("profile/delete/", UserDeleteAPIView.as_view(), name="user-delete"),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
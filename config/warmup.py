@@ -0,0 +1,78 @@
+import logging
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up():
+    """
+    첫 요청이 떠안던 지연 로딩을 미리 해 둔다. DB 에는 접속하지 않으므로 fork 전(마스터)에 호출해도 된다.
+
+    - URL resolver 와 모든 뷰 모듈 import
+    - DRF / simplejwt 설정의 클래스 경로 import (인증, 렌더러, 페이지네이션 등)
+    - 뷰에서 쓰는 시리얼라이저의 필드 구성 (모델 _meta 캐시 포함)
+    - 번역 카탈로그 로드
+    - /healthz/ 요청 한 번으로 미들웨어 체인까지 실행
+    """
+    from rest_framework.settings import api_settings
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+    resolver = get_resolver()
+    resolver.reverse_dict  # URL 패턴 전체를 읽어 들임
+
+    for name in (
+        "DEFAULT_AUTHENTICATION_CLASSES",
+        "DEFAULT_PERMISSION_CLASSES",
+        "DEFAULT_RENDERER_CLASSES",
+        "DEFAULT_PARSER_CLASSES",
+        "DEFAULT_FILTER_BACKENDS",
+        "DEFAULT_PAGINATION_CLASS",
+        "DEFAULT_CONTENT_NEGOTIATION_CLASS",
+    ):
+        getattr(api_settings, name)
+    for name in ("AUTH_TOKEN_CLASSES", "TOKEN_REFRESH_SERIALIZER", "TOKEN_USER_CLASS"):
+        getattr(jwt_settings, name)
+
+    with translation.override(settings.LANGUAGE_CODE):
+        for serializer_class in _serializer_classes(resolver.url_patterns):
+            try:
+                serializer_class(context={}).fields
+            except Exception:
+                logger.warning("워밍업 중 %s 필드 구성 실패", serializer_class.__name__, exc_info=True)
+
+    response = Client(HTTP_HOST="localhost").get("/healthz/")
+    if response.status_code != 200:
+        logger.warning("워밍업 /healthz/ 응답 %s", response.status_code)
+
+
+def warm_up_connections():
+    """
+    DB 커넥션을 미리 연다. 워커마다 (fork 후) 호출해야 한다.
+
+    CONN_MAX_AGE 가 0 이면 첫 요청 시작 시 닫혀 버리므로 지속 커넥션/풀을 쓸 때만 연다.
+    """
+    for connection in connections.all():
+        if connection.settings_dict.get("CONN_MAX_AGE") or connection.settings_dict.get("OPTIONS", {}).get("pool"):
+            connection.ensure_connection()
+
+
+def _serializer_classes(patterns):
+    seen = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            classes = _serializer_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view = getattr(pattern.callback, "cls", None) or getattr(pattern.callback, "view_class", None)
+            view = getattr(view, "view_class", None) or view  # AsyncReadView 는 원본 DRF 뷰를 감쌈
+            classes = [getattr(view, "serializer_class", None)]
+        else:
+            continue
+        for serializer_class in classes:
+            if serializer_class is not None and serializer_class not in seen:
+                seen.add(serializer_class)
+                yield serializer_class
@@ -0,0 +1,34 @@
+#!/bin/sh
+# 서버 시작 명령 실행부터 /healthz/ 가 처음 200 을 돌려줄 때까지의 시간(time-to-first-200)을 잰다.
+#
+#   scripts/measure_boot.sh                      # scripts/run.sh 로 측정
+#   scripts/measure_boot.sh gunicorn -c config/gunicorn.conf.py
+#
+# HEALTHZ_URL 로 확인할 주소를, KEEP_RUNNING=1 로 측정 후 서버를 계속 띄워 둘지 정한다.
+HEALTHZ_URL=${HEALTHZ_URL:-http://127.0.0.1:${PORT:-8000}/healthz/}
+
+if [ $# -eq 0 ]; then
+    set -- sh "$(dirname "$0")/run.sh"
+fi
+
+start=$(date +%s%N)
+"$@" &
+pid=$!
+
+until curl -fsS -o /dev/null "$HEALTHZ_URL" 2>/dev/null; do
+    if ! kill -0 "$pid" 2>/dev/null; then
+        echo "서버가 응답 전에 종료되었습니다." >&2
+        exit 1
+    fi
+    sleep 0.05
+done
+end=$(date +%s%N)
+
+echo "time-to-first-200: $(( (end - start) / 1000000 ))ms"
+
+if [ "${KEEP_RUNNING:-0}" = "1" ]; then
+    wait "$pid"
+else
+    kill "$pid"
+    wait "$pid" 2>/dev/null || true
+fi
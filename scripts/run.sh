@@ -3,11 +3,16 @@ set -e
 
 export DJANGO_SETTINGS_MODULE=config.settings.prod
 
-echo "=== Running Django migrations ==="
-/root/.local/bin/poetry run python manage.py makemigrations --noinput || true
-/root/.local/bin/poetry run python manage.py migrate --noinput
-
-/root/.local/bin/poetry run python manage.py collectstatic --noinput
+# 적용 안 된 마이그레이션이 있을 때만 migrate, 정적 파일이 바뀌었을 때만 collectstatic
+# (마이그레이션 파일은 개발 중에 만들어 커밋하므로 컨테이너에서 makemigrations 는 하지 않음)
+# BOOT_FORCE=1 이면 무조건 둘 다 실행
+echo "=== Preparing (migrate / collectstatic) ==="
+if [ "${BOOT_FORCE:-0}" = "1" ]; then
+    /root/.local/bin/poetry run python manage.py prepare_boot --force
+else
+    /root/.local/bin/poetry run python manage.py prepare_boot
+fi
 
+# WSGI/ASGI(SERVER_MODE=asgi) 선택, CPU 기반 워커 수, 프리로드/워밍업은 config/gunicorn.conf.py 에서
 echo "=== Starting Gunicorn server ==="
-/root/.local/bin/poetry run gunicorn --bind 0.0.0.0:8000 config.wsgi:application --workers 2
\ No newline at end of file
+exec /root/.local/bin/poetry run gunicorn -c config/gunicorn.conf.py